@@ -15,13 +15,105 @@ class Settings(BaseSettings):
     # LLM Configuration
     llm_provider: str = os.getenv("LLM_PROVIDER", "local")  # "local" or "gemini"
     llm_api_url: str = os.getenv("LLM_API_URL", "http://localhost:1234/v1/chat/completions")
+    # Comma-separated pool of OpenAI-compatible endpoints (overrides LLM_API_URL when set)
+    llm_api_urls_str: str = os.getenv("LLM_API_URLS", "")
     llm_model: str = os.getenv("LLM_MODEL", "openai/gpt-oss-20b")
     llm_temperature: float = float(os.getenv("LLM_TEMPERATURE", "0.7"))
     llm_max_tokens: int = int(os.getenv("LLM_MAX_TOKENS", "-1"))
+    llm_request_timeout: float = float(os.getenv("LLM_REQUEST_TIMEOUT", "120"))
+    # Connection pool shared by all LLM clients in the process
+    llm_max_connections: int = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+    llm_max_keepalive_connections: int = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    # Maximum concurrent LLM requests per local endpoint / for Gemini (bulk generation runs this many in parallel)
+    llm_max_in_flight_local: int = int(os.getenv("LLM_MAX_IN_FLIGHT_LOCAL", "4"))
+    llm_max_in_flight_gemini: int = int(os.getenv("LLM_MAX_IN_FLIGHT_GEMINI", "4"))
+    
+    # Summary prompt size: estimated token budget for the articles section (0 = unlimited)
+    summary_prompt_token_budget: int = int(os.getenv("SUMMARY_PROMPT_TOKEN_BUDGET", "6000"))
+    summary_description_chars: int = int(os.getenv("SUMMARY_DESCRIPTION_CHARS", "240"))
+    # Article count from which summaries are built per category first, then combined (0 = never)
+    summary_map_reduce_threshold: int = int(os.getenv("SUMMARY_MAP_REDUCE_THRESHOLD", "80"))
+    # Delta summaries: when a few articles are added, update the existing summary from only the new
+    # ones. Regenerate fully once new articles exceed this fraction of the total (0 = always full),
+    # or after this many consecutive delta updates
+    summary_delta_threshold: float = float(os.getenv("SUMMARY_DELTA_THRESHOLD", "0.3"))
+    summary_delta_max_updates: int = int(os.getenv("SUMMARY_DELTA_MAX_UPDATES", "5"))
+    # Estimated tokens of each country's summary included in comparative prompts
+    comparative_country_token_budget: int = int(os.getenv("COMPARATIVE_COUNTRY_TOKEN_BUDGET", "900"))
+    
+    # Hedged requests: if the primary provider hasn't answered within the delay (p95 of recent
+    # latencies once known), the prompt also goes to the other provider and the first answer wins
+    llm_hedge_enabled: bool = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+    llm_hedge_delay_seconds: float = float(os.getenv("LLM_HEDGE_DELAY_SECONDS", "30"))
+    llm_hedge_min_delay_seconds: float = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "5"))
+    
+    # LLM Response Cache (identical prompts reuse the stored response)
+    llm_cache_enabled: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    llm_cache_ttl_seconds: int = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))  # 0 = never expire
+    llm_cache_max_entries: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+    
+    # Record every LLM call (tokens, latency, cost, entry point) in the llm_calls table
+    llm_ledger_enabled: bool = os.getenv("LLM_LEDGER_ENABLED", "true").lower() == "true"
     
     # Gemini Configuration
     gemini_api_key: str = os.getenv("GEMINI_API_KEY", "")
     gemini_model: str = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite")
+    # Gemini prices in USD per million tokens, for the LLM call ledger's cost accounting
+    gemini_price_input_per_mtok: float = float(os.getenv("GEMINI_PRICE_INPUT_PER_MTOK", "0.10"))
+    gemini_price_output_per_mtok: float = float(os.getenv("GEMINI_PRICE_OUTPUT_PER_MTOK", "0.40"))
+    # Gemini quota (requests and tokens per minute; 0 TPM = no token budget)
+    gemini_rpm: int = int(os.getenv("GEMINI_RPM", "10"))
+    gemini_tpm: int = int(os.getenv("GEMINI_TPM", "250000"))
+    # Retries for rate-limited/transient LLM errors (jittered exponential backoff)
+    llm_max_retries: int = int(os.getenv("LLM_MAX_RETRIES", "4"))
+    llm_backoff_base_seconds: float = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "2"))
+    llm_backoff_max_seconds: float = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "60"))
+    
+    # Seconds between background health probes of the LLM and database
+    health_check_interval_seconds: float = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "30"))
+    
+    # Local endpoint ejection: consecutive failures before ejecting, and the base ejection time
+    llm_endpoint_max_failures: int = int(os.getenv("LLM_ENDPOINT_MAX_FAILURES", "3"))
+    llm_endpoint_ejection_seconds: float = float(os.getenv("LLM_ENDPOINT_EJECTION_SECONDS", "30"))
+    
+    # Background job queue: worker threads, polling for jobs queued by other processes,
+    # retries (exponential backoff from the base delay) and how long finished jobs are kept
+    job_workers: int = int(os.getenv("JOB_WORKERS", "4"))
+    job_poll_interval_seconds: float = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "2"))
+    job_max_attempts: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    job_retry_base_seconds: float = float(os.getenv("JOB_RETRY_BASE_SECONDS", "30"))
+    job_retention_days: int = int(os.getenv("JOB_RETENTION_DAYS", "14"))
+    # Each process marks the jobs it runs alive every heartbeat; running jobs without one for
+    # the stale time are taken to be orphaned by a dead process and recovered
+    job_heartbeat_seconds: float = float(os.getenv("JOB_HEARTBEAT_SECONDS", "30"))
+    job_stale_seconds: float = float(os.getenv("JOB_STALE_SECONDS", "300"))
+    # Concurrent news scrape jobs (each drives many search and article requests)
+    job_scrape_concurrency: int = int(os.getenv("JOB_SCRAPE_CONCURRENCY", "1"))
+    # Priority classes (interactive > scheduled > backfill): share of the workers scheduled and
+    # backfill jobs may occupy, and the slots interactive jobs get on top of a kind's cap
+    job_scheduled_share: float = float(os.getenv("JOB_SCHEDULED_SHARE", "0.75"))
+    job_backfill_share: float = float(os.getenv("JOB_BACKFILL_SHARE", "0.5"))
+    job_interactive_reserved_slots: int = int(os.getenv("JOB_INTERACTIVE_RESERVED_SLOTS", "1"))
+    
+    # Continuous ingestion (APScheduler): scrape -> summarize -> sentiment for every country once per
+    # interval, in evenly staggered slots, plus periodic World Bank/IMF refreshes (0 hours = off)
+    ingestion_enabled: bool = os.getenv("INGESTION_ENABLED", "false").lower() == "true"
+    ingestion_interval_hours: float = float(os.getenv("INGESTION_INTERVAL_HOURS", "24"))
+    # Countries to ingest; empty = every country that already has articles
+    ingestion_countries_str: str = os.getenv("INGESTION_COUNTRIES", "")
+    # Random delay added to each run, and how late a missed run may still start
+    ingestion_jitter_seconds: int = int(os.getenv("INGESTION_JITTER_SECONDS", "300"))
+    ingestion_misfire_grace_seconds: int = int(os.getenv("INGESTION_MISFIRE_GRACE_SECONDS", "3600"))
+    ingestion_worldbank_interval_hours: float = float(os.getenv("INGESTION_WORLDBANK_INTERVAL_HOURS", "168"))
+    ingestion_imf_interval_hours: float = float(os.getenv("INGESTION_IMF_INTERVAL_HOURS", "168"))
+    
+    # Static site export: API the snapshots are fetched from, and where the site is written
+    static_api_url: str = os.getenv("STATIC_API_URL", "http://localhost:8000")
+    static_output_dir: str = os.getenv("STATIC_OUTPUT_DIR", "docs")
+    # Run the incremental pipeline (summary -> sentiment -> aggregates -> export) after
+    # each scheduled scrape; export stages are skipped unless enabled
+    pipeline_after_scrape: bool = os.getenv("PIPELINE_AFTER_SCRAPE", "false").lower() == "true"
+    pipeline_export_enabled: bool = os.getenv("PIPELINE_EXPORT_ENABLED", "false").lower() == "true"
     
     # Database Configuration
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///./data/signals.db")
@@ -35,6 +127,26 @@ class Settings(BaseSettings):
     api_host: str = os.getenv("API_HOST", "0.0.0.0")
     api_port: int = int(os.getenv("API_PORT", "8000"))
     
+    # Sentiment Model Configuration
+    # Load the sentiment model in a background thread at startup instead of on first request
+    sentiment_warmup: bool = os.getenv("SENTIMENT_WARMUP", "false").lower() == "true"
+    # Local copy of the model weights in safetensors format (memory-mapped on load); empty disables it
+    sentiment_model_cache_dir: str = os.getenv("SENTIMENT_MODEL_CACHE_DIR", "./data/models")
+    # Tokens shared between consecutive scoring windows of a long text
+    sentiment_chunk_overlap: int = int(os.getenv("SENTIMENT_CHUNK_OVERLAP", "64"))
+    # Maximum windows per model forward pass
+    sentiment_batch_size: int = int(os.getenv("SENTIMENT_BATCH_SIZE", "16"))
+    # Score each article as it is scraped (used for article-based country scores)
+    article_sentiment_enabled: bool = os.getenv("ARTICLE_SENTIMENT_ENABLED", "true").lower() == "true"
+    # Half-life in days for recency-weighted article sentiment
+    sentiment_recency_half_life_days: float = float(os.getenv("SENTIMENT_RECENCY_HALF_LIFE_DAYS", "14"))
+    # Months in the rolling mean/std of the sentiment series
+    sentiment_rolling_window: int = int(os.getenv("SENTIMENT_ROLLING_WINDOW", "3"))
+    # Shared months required before two countries' sentiment is correlated
+    sentiment_correlation_min_months: int = int(os.getenv("SENTIMENT_CORRELATION_MIN_MONTHS", "4"))
+    # Minimum average correlation for countries to be clustered together
+    sentiment_cluster_min_correlation: float = float(os.getenv("SENTIMENT_CLUSTER_MIN_CORRELATION", "0.5"))
+    
     # Search Topics - Economic News
     search_topics_str: str = "GDP,Inflation,Monetary Policy,Fiscal Policy,Economy,Central Bank,Interest Rates,Trade Policy,Economic Growth,Unemployment,Currency Exchange Rates"
     
@@ -44,6 +156,17 @@ class Settings(BaseSettings):
         "extra": "allow"
     }
     
+    @property
+    def llm_api_urls(self) -> List[str]:
+        """Local LLM endpoints, from LLM_API_URLS or the single LLM_API_URL."""
+        urls = [url.strip() for url in self.llm_api_urls_str.split(",") if url.strip()]
+        return urls or [self.llm_api_url]
+    
+    @property
+    def ingestion_countries(self) -> List[str]:
+        """Countries for continuous ingestion, from comma-separated INGESTION_COUNTRIES."""
+        return [country.strip() for country in self.ingestion_countries_str.split(",") if country.strip()]
+    
     @property
     def search_topics(self) -> List[str]:
         """Parse search topics from comma-separated string."""
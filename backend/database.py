@@ -1,7 +1,7 @@
 """
 Database initialization and session management.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, Session
 from backend.config import settings
 from backend.models import Base
@@ -14,7 +14,8 @@ os.makedirs("data", exist_ok=True)
 # Create database engine
 engine = create_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
+    # timeout: concurrent writers (e.g. parallel summary generation) wait for the lock instead of failing
+    connect_args={"check_same_thread": False, "timeout": 30} if "sqlite" in settings.database_url else {}
 )
 
 # Create session factory
@@ -24,9 +25,34 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 def init_db():
     """Initialize database tables."""
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
     print("✓ Database initialized successfully")
 
 
+def _add_missing_columns():
+    """
+    Add nullable columns that were added to models after their table was created.
+    create_all() only creates missing tables, so existing databases would
+    otherwise never get new columns.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            
+            existing_columns = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or not column.nullable:
+                    continue
+                
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                print(f"✓ Added column {table.name}.{column.name}")
+
+
 def get_db() -> Session:
     """
     Dependency function to get database session.
@@ -1,20 +1,42 @@
 """
 FastAPI backend for the Signals Insights application.
 """
-from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
+import asyncio
 
-from backend.database import init_db, get_db
+from backend.database import init_db, get_db, SessionLocal
 from backend.services.news_scraper import NewsScraper
 from backend.services.summarizer import Summarizer
-from backend.services.sentiment_analyzer import analyze_sentiment, get_sentiment_color, get_sentiment_label
-from backend.models import Article, DailySummary, EconomicIndicator, IndicatorMetadata
+from backend.services.sentiment_analyzer import (
+    analyze_sentiment, get_sentiment_color, get_sentiment_label,
+    start_background_warmup
+)
+from backend.services.sentiment_aggregator import aggregate_article_sentiments
+from backend.services.sentiment_trends import (
+    refresh_country_series, rebuild_all_series, get_country_series, get_latest_series, get_momentum_ranking
+)
+from backend.services.sentiment_correlation import get_most_correlated, get_clusters
+from backend.services.llm_cache import LLMResponseCache
+from backend.services.llm_quota import get_gemini_scheduler
+from backend.services.health_monitor import get_health_monitor
+from backend.services.ingestion_scheduler import get_ingestion_scheduler
+from backend.services.pipeline import pipeline_status
+from backend.services.llm_endpoints import get_endpoint_pool
+from backend.services.llm_ledger import call_context, ledger_report, ledger_totals, recent_calls, REPORT_GROUPS
+from backend.services.job_queue import (
+    get_job_queue, enqueue, job_to_dict, cancel_job, retry_job, registered_kinds,
+    track_inline, INTERACTIVE, PRIORITIES
+)
+import backend.services.job_handlers  # noqa: F401  (registers the job kinds)
+from backend.config import settings
+from backend.models import Article, DailySummary, EconomicIndicator, IndicatorMetadata, CountryMomentum, Job
 
 
 # Initialize FastAPI app
@@ -48,6 +70,7 @@ class ArticleResponse(BaseModel):
     category: str
     country: str
     published_date: date
+    sentiment_score: Optional[float] = None
     
     class Config:
         from_attributes = True
@@ -61,6 +84,7 @@ class SummaryResponse(BaseModel):
     article_count: int
     generated_at: datetime
     sentiment_score: Optional[float] = None
+    llm_provider: Optional[str] = None
     
     class Config:
         from_attributes = True
@@ -74,9 +98,10 @@ class DateResponse(BaseModel):
 class ScrapeResponse(BaseModel):
     success: bool
     message: str
-    articles_added: int
     date: date
     country: str
+    # Background scrape job; its result has articles_added and the follow-up summary job id
+    job_id: int
 
 
 class ScrapeRequest(BaseModel):
@@ -84,16 +109,56 @@ class ScrapeRequest(BaseModel):
     country: str = "Global"
 
 
+class JobRequest(BaseModel):
+    kind: str
+    payload: Dict = {}
+    priority: str = INTERACTIVE
+
+
 class ComparativeSummaryRequest(BaseModel):
     countries: List[str]
     target_date: date
+    # "summaries": compare existing per-country summaries; "articles": send all raw articles
+    mode: str = "summaries"
+    # Country name -> ISO3 code, adds indicator stats to each country's briefing
+    country_codes: Optional[Dict[str, str]] = None
 
 
 # API Routes
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup."""
+    """Initialize database on startup and optionally warm up the sentiment model."""
     init_db()
+    
+    # Backfill the precomputed sentiment series for databases that predate it
+    db = SessionLocal()
+    try:
+        if db.query(CountryMomentum).first() is None:
+            rebuild_all_series(db)
+    finally:
+        db.close()
+    
+    if settings.sentiment_warmup:
+        # Load in the background so startup is not blocked by model load
+        start_background_warmup()
+    
+    # Probe LLM/DB health in the background; /api/health serves the cached result
+    get_health_monitor(summarizer.llm_client).start()
+    
+    # Run queued scrape/summary jobs, including those interrupted by the last shutdown
+    get_job_queue().start()
+    
+    if settings.ingestion_enabled:
+        # Queue staggered per-country scrapes and indicator refreshes around the clock
+        get_ingestion_scheduler().start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers."""
+    get_ingestion_scheduler().stop()
+    get_health_monitor().stop()
+    get_job_queue().stop()
 
 
 @app.get("/")
@@ -104,14 +169,138 @@ async def root():
 
 @app.get("/api/health")
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint, answered from the background prober's cached state."""
+    return get_health_monitor(summarizer.llm_client).snapshot()
+
+
+@app.get("/api/llm-quota")
+async def get_llm_quota():
+    """Gemini request/token budget usage, 429s and retries."""
+    return {
+        "provider": settings.llm_provider,
+        "gemini": get_gemini_scheduler().status()
+    }
+
+
+@app.get("/api/llm-endpoints")
+async def get_llm_endpoints():
+    """Load and health of each local LLM endpoint."""
+    return {"endpoints": get_endpoint_pool().status()}
+
+
+@app.get("/api/llm-cache/stats")
+async def get_llm_cache_stats():
+    """LLM response cache size, hit count and generation time saved."""
+    return LLMResponseCache().stats()
+
+
+@app.delete("/api/llm-cache")
+async def clear_llm_cache():
+    """Remove all cached LLM responses."""
+    return {"deleted": LLMResponseCache().clear()}
+
+
+@app.get("/api/llm-ledger/report")
+async def get_llm_ledger_report(days: int = 7, group_by: str = "country", db: Session = Depends(get_db)):
+    """LLM calls, tokens, cost and latency/queue-wait/TTFT percentiles per country, day, provider or entry point."""
+    if group_by not in REPORT_GROUPS:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of: {', '.join(REPORT_GROUPS)}")
     return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "llm_available": summarizer.llm_client.test_connection()
+        "totals": ledger_totals(db, days),
+        "group_by": group_by,
+        "groups": ledger_report(db, days, group_by)
     }
 
 
+@app.get("/api/llm-ledger/recent")
+async def get_llm_ledger_recent(limit: int = 50, db: Session = Depends(get_db)):
+    """Most recent LLM calls, newest first."""
+    return [
+        {
+            "created_at": call.created_at,
+            "provider": call.provider,
+            "model": call.model,
+            "entry_point": call.entry_point,
+            "kind": call.kind,
+            "country": call.country,
+            "target_date": call.target_date,
+            "outcome": call.outcome,
+            "error": call.error,
+            "prompt_tokens": call.prompt_tokens,
+            "completion_tokens": call.completion_tokens,
+            "tokens_estimated": call.tokens_estimated,
+            "queue_wait_ms": call.queue_wait_ms,
+            "ttft_ms": call.ttft_ms,
+            "latency_ms": call.latency_ms,
+            "cost_usd": call.cost_usd
+        }
+        for call in recent_calls(db, min(limit, 500))
+    ]
+
+
+@app.get("/api/jobs")
+async def list_jobs(status: Optional[str] = None, kind: Optional[str] = None, limit: int = 50, db: Session = Depends(get_db)):
+    """Background jobs, newest first, optionally filtered by status and kind."""
+    query = db.query(Job)
+    if status:
+        query = query.filter(Job.status == status)
+    if kind:
+        query = query.filter(Job.kind == kind)
+    return [job_to_dict(job) for job in query.order_by(Job.id.desc()).limit(min(limit, 500)).all()]
+
+
+@app.get("/api/jobs/stats")
+async def get_job_stats(db: Session = Depends(get_db)):
+    """Job counts by status, running jobs per kind and per-kind concurrency limits."""
+    return get_job_queue().status(db)
+
+
+@app.get("/api/ingestion/schedule")
+async def get_ingestion_schedule():
+    """Continuous ingestion status and the next run of each scheduled job."""
+    return get_ingestion_scheduler().status()
+
+
+@app.get("/api/pipeline/status")
+async def get_pipeline_status(db: Session = Depends(get_db)):
+    """Dirty, clean and failed (country, month) partitions per pipeline stage."""
+    return pipeline_status(db)
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: int, db: Session = Depends(get_db)):
+    job = db.get(Job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_dict(job)
+
+
+@app.post("/api/jobs")
+async def submit_job(request: JobRequest):
+    """Queue a job of a registered kind (scrape, summarize, worldbank, imf)."""
+    if request.kind not in registered_kinds():
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(registered_kinds())}")
+    if request.priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of: {', '.join(PRIORITIES)}")
+    return job_to_dict(enqueue(request.kind, request.payload, priority=request.priority))
+
+
+@app.post("/api/jobs/{job_id}/cancel")
+async def cancel_queued_job(job_id: int, db: Session = Depends(get_db)):
+    """Cancel a job that hasn't started yet."""
+    if not cancel_job(db, job_id):
+        raise HTTPException(status_code=409, detail="Only queued jobs can be cancelled")
+    return job_to_dict(db.get(Job, job_id, populate_existing=True))
+
+
+@app.post("/api/jobs/{job_id}/retry")
+async def retry_failed_job(job_id: int, db: Session = Depends(get_db)):
+    """Queue a failed or cancelled job again."""
+    if not retry_job(db, job_id):
+        raise HTTPException(status_code=409, detail="Only failed or cancelled jobs can be retried")
+    return job_to_dict(db.get(Job, job_id, populate_existing=True))
+
+
 @app.get("/api/config")
 async def get_config():
     """Get current application configuration."""
@@ -122,6 +311,7 @@ async def get_config():
         "news_country": settings.news_country,
         "news_max_results": settings.news_max_results,
         "llm_api_url": settings.llm_api_url,
+        "llm_api_urls": settings.llm_api_urls,
         "llm_model": settings.llm_model,
         "api_host": settings.api_host,
         "api_port": settings.api_port
@@ -188,33 +378,26 @@ import json
 # ... (existing imports)
 
 @app.post("/api/scrape", response_model=ScrapeResponse)
-def scrape_news(
-    request: ScrapeRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
-):
+def scrape_news(request: ScrapeRequest):
     """
-    Trigger news scraping for a specific date and country.
-    Automatically generates summary after scraping completes.
+    Queue news scraping for a specific date and country.
+    The scrape runs in an interactive background job, which queues the summary once articles
+    were added; poll /api/jobs/{job_id} for articles_added and the summary job.
     """
     target_date = request.target_date or date.today()
     
-    try:
-        articles_added = scraper.scrape_news(db, target_date, request.country)
-        
-        # Generate summary in background after scraping
-        if articles_added > 0:
-            background_tasks.add_task(summarizer.generate_daily_summary, db, target_date, request.country)
-        
-        return ScrapeResponse(
-            success=True,
-            message=f"Successfully scraped news for {target_date} in {request.country}",
-            articles_added=articles_added,
-            date=target_date,
-            country=request.country
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Scraping failed: {str(e)}")
+    job = enqueue(
+        "scrape", {"country": request.country, "target_date": target_date.isoformat(), "summarize": True},
+        priority=INTERACTIVE
+    )
+    
+    return ScrapeResponse(
+        success=True,
+        message=f"Scraping news for {target_date} in {request.country} queued in background",
+        date=target_date,
+        country=request.country,
+        job_id=job.id
+    )
 
 
 @app.get("/api/scrape/stream")
@@ -228,8 +411,10 @@ def scrape_news_stream(
     """
     def event_generator():
         try:
-            for update in scraper.scrape_news_generator(db, target_date, country):
-                yield f"data: {json.dumps(update)}\n\n"
+            payload = {"country": country, "target_date": (target_date or date.today()).isoformat()}
+            with track_inline("scrape", payload):
+                for update in scraper.scrape_news_generator(db, target_date, country):
+                    yield f"data: {json.dumps(update)}\n\n"
         except Exception as e:
             yield f"data: {json.dumps({'status': 'error', 'message': str(e)})}\n\n"
 
@@ -239,7 +424,10 @@ def scrape_news_stream(
 @app.post("/api/summarize/{date}", response_model=SummaryResponse)
 async def generate_summary(date: date, country: str = "Global", db: Session = Depends(get_db)):
     """Generate or update daily summary for a specific date and country."""
-    summary = summarizer.generate_daily_summary(db, date, country)
+    # Off the event loop, so concurrent requests for the same summary can coalesce
+    with call_context(entry_point="api:/api/summarize"), \
+            track_inline("summarize", {"country": country, "target_date": date.isoformat()}):
+        summary = await asyncio.to_thread(summarizer.generate_daily_summary, db, date, country)
     
     if not summary:
         raise HTTPException(
@@ -253,17 +441,61 @@ async def generate_summary(date: date, country: str = "Global", db: Session = De
             sentiment = analyze_sentiment(summary.summary_text)
             summary.sentiment_score = sentiment
             db.commit()
+            refresh_country_series(db, country)
         except Exception as e:
             print(f"Error computing sentiment: {e}")
     
     return summary
 
 
+@app.get("/api/summarize/{date}/stream")
+async def stream_summary(date: date, country: str = "Global"):
+    """
+    Generate a summary and stream it over server-sent events as the LLM produces it.
+    Events: info, token ({"text": ...}), reset (discard the text so far), error, and complete (with the saved summary).
+    """
+    async def event_generator():
+        # Own session: the request-scoped one is released before the stream ends
+        db = SessionLocal()
+        try:
+            with call_context(entry_point="api:/api/summarize/stream"), \
+                    track_inline("summarize", {"country": country, "target_date": date.isoformat()}):
+                async for update in summarizer.astream_daily_summary(db, date, country):
+                    if update["status"] == "complete":
+                        summary = db.get(DailySummary, update["summary_id"])
+                        try:
+                            summary.sentiment_score = await asyncio.to_thread(analyze_sentiment, summary.summary_text)
+                            db.commit()
+                            refresh_country_series(db, country)
+                        except Exception as e:
+                            print(f"Error computing sentiment: {e}")
+                        update = {**update, "summary": SummaryResponse.from_orm(summary).dict()}
+                    
+                    yield f"data: {json.dumps(update, default=str)}\n\n"
+        except Exception as e:
+            yield f"data: {json.dumps({'status': 'error', 'message': str(e)})}\n\n"
+        finally:
+            db.close()
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.post("/api/summarize-comparative")
 async def generate_comparative_summary(request: ComparativeSummaryRequest, db: Session = Depends(get_db)):
     """Generate a comparative summary for multiple countries."""
     try:
-        summary_text = summarizer.generate_comparative_summary(db, request.target_date, request.countries)
+        if request.mode not in ("summaries", "articles"):
+            raise HTTPException(status_code=400, detail="mode must be 'summaries' or 'articles'")
+        
+        with call_context(entry_point="api:/api/summarize-comparative"):
+            summary_text = await asyncio.to_thread(
+                summarizer.generate_comparative_summary, db, request.target_date, request.countries,
+                request.mode, request.country_codes
+            )
         if not summary_text:
             raise HTTPException(status_code=404, detail="No articles found for the selected countries and date.")
             
@@ -278,28 +510,22 @@ async def generate_comparative_summary(request: ComparativeSummaryRequest, db: S
 
 @app.post("/api/scrape-and-summarize")
 def scrape_and_summarize(
-    background_tasks: BackgroundTasks,
     target_date: Optional[date] = None,
-    country: str = "Global",
-    db: Session = Depends(get_db)
+    country: str = "Global"
 ):
     """
     Convenience endpoint to scrape news and generate summary in one call.
-    Summary generation happens in the background.
+    Both run in a background job; poll /api/jobs/{job_id} for progress.
     """
     if target_date is None:
         target_date = date.today()
     
-    # Scrape news first
-    articles_added = scraper.scrape_news(db, target_date, country)
-    
-    # Generate summary in background
-    background_tasks.add_task(summarizer.generate_daily_summary, db, target_date, country)
+    job = enqueue("scrape", {"country": country, "target_date": target_date.isoformat(), "summarize": True}, priority=INTERACTIVE)
     
     return {
         "success": True,
-        "message": f"Scraping complete. Summary generation started in background.",
-        "articles_added": articles_added,
+        "message": "Scraping and summary generation queued in background.",
+        "job_id": job.id,
         "date": target_date,
         "country": country
     }
@@ -382,13 +608,33 @@ async def get_country_overview(country: str = "Global", db: Session = Depends(ge
 
 
 @app.get("/api/country-sentiments")
-async def get_country_sentiments(db: Session = Depends(get_db)):
+async def get_country_sentiments(source: str = "summary", weighting: str = "recency", db: Session = Depends(get_db)):
     """
     Get all countries with their latest sentiment scores for map coloring.
     Returns a map of country names to sentiment data.
+    
+    - source=summary (default): score of each country's latest AI summary.
+    - source=articles: weighted aggregate of per-article scores for each country's
+      latest month (weighting: uniform, recency, source or category). Updates as
+      soon as new articles are scraped, without waiting for a summary.
     """
     from sqlalchemy import func
     
+    if source == "articles":
+        try:
+            aggregates = aggregate_article_sentiments(db, weighting=weighting)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        return {
+            country: {
+                **data,
+                "color": get_sentiment_color(data["score"]),
+                "label": get_sentiment_label(data["score"])
+            }
+            for country, data in aggregates.items()
+        }
+    
     # Get latest summary for each country (subquery for max date per country)
     subquery = db.query(
         DailySummary.country,
@@ -403,12 +649,14 @@ async def get_country_sentiments(db: Session = Depends(get_db)):
     ).all()
     
     result = {}
+    rescored = []
     for summary in summaries:
         # Compute sentiment if not already done
         if summary.sentiment_score is None and summary.summary_text:
             try:
                 summary.sentiment_score = analyze_sentiment(summary.summary_text)
                 db.commit()
+                rescored.append(summary.country)
             except Exception as e:
                 print(f"Error computing sentiment for {summary.country}: {e}")
                 continue
@@ -421,66 +669,129 @@ async def get_country_sentiments(db: Session = Depends(get_db)):
                 "date": summary.date.isoformat()
             }
     
+    for country in rescored:
+        refresh_country_series(db, country)
+    
     return result
 
 
+@app.get("/api/sentiment-momentum")
+async def get_sentiment_momentum(
+    direction: str = "rising",
+    by: str = "delta",
+    limit: int = 10,
+    db: Session = Depends(get_db)
+):
+    """
+    Get countries with the largest rising or falling sentiment.
+    Served from the precomputed momentum table (one row per country).
+    """
+    try:
+        ranking = get_momentum_ranking(db, direction=direction, by=by, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return [
+        {
+            "country": m.country,
+            "date": m.latest_date.isoformat(),
+            "score": m.score,
+            "previous_score": m.previous_score,
+            "delta": m.delta,
+            "rolling_mean": m.rolling_mean,
+            "trend": m.trend,
+            "months": m.months,
+            "label": get_sentiment_label(m.score),
+            "color": get_sentiment_color(m.score)
+        }
+        for m in ranking
+    ]
+
+
+@app.get("/api/sentiment-correlations/{country}")
+async def get_sentiment_correlations(country: str, limit: int = 10, db: Session = Depends(get_db)):
+    """Get the countries whose sentiment moves most closely with the given country."""
+    correlated = get_most_correlated(db, country, limit=limit)
+    if correlated is None:
+        raise HTTPException(status_code=404, detail=f"No sentiment history for {country}")
+    
+    return {"country": country, "correlated": correlated}
+
+
+@app.get("/api/sentiment-clusters")
+async def get_sentiment_clusters(min_size: int = 2, db: Session = Depends(get_db)):
+    """Get clusters of countries whose sentiment moves together."""
+    return get_clusters(db, min_size=min_size)
+
+
+@app.get("/api/sentiment-series/{country}")
+async def get_sentiment_series(country: str, db: Session = Depends(get_db)):
+    """Get the monthly sentiment series for a country with rolling statistics."""
+    return [
+        {
+            "date": point.date.isoformat(),
+            "score": point.score,
+            "article_count": point.article_count,
+            "rolling_mean": point.rolling_mean,
+            "rolling_std": point.rolling_std,
+            "delta": point.delta
+        }
+        for point in get_country_series(db, country)
+    ]
+
+
 @app.get("/api/export/sentiments")
 async def export_sentiments(format: str = "csv", country: str = None, db: Session = Depends(get_db)):
     """
-    Export sentiment data.
-    - If country is provided: Exports ALL historical data for that country.
-    - If no country (Global): Exports LATEST summary for ALL countries.
+    Export sentiment data from the precomputed monthly series.
+    - If country is provided: Exports ALL historical months for that country (newest first).
+    - If no country (Global): Exports the LATEST month for ALL countries.
+    Rows include the rolling mean/std and month-over-month delta.
     """
     from io import StringIO
     import csv as csv_module
     from fastapi.responses import Response as FastAPIResponse
-    from backend.services.sentiment_analyzer import get_sentiment_label
     
     if country and country.lower() != "global":
         # Export historical data for specific country
-        summaries = db.query(DailySummary).filter(
-            DailySummary.country == country
-        ).order_by(DailySummary.date.desc()).all()
+        series = list(reversed(get_country_series(db, country)))
         filename = f"{country.lower().replace(' ', '_')}_history.csv"
     else:
         # Export latest data for all countries (Global view)
-        subquery = db.query(
-            DailySummary.country,
-            func.max(DailySummary.date).label('max_date')
-        ).group_by(DailySummary.country).subquery()
-        
-        summaries = db.query(DailySummary).join(
-            subquery,
-            (DailySummary.country == subquery.c.country) &
-            (DailySummary.date == subquery.c.max_date)
-        ).all()
+        series = get_latest_series(db)
         filename = "global_economic_summary.csv"
     
     if format == "json":
         data = []
-        for s in summaries:
+        for s in series:
             data.append({
                 "country": s.country,
                 "date": s.date.isoformat(),
-                "sentiment_score": s.sentiment_score,
-                "sentiment_label": get_sentiment_label(s.sentiment_score) if s.sentiment_score else "Unknown",
-                "article_count": s.article_count
+                "sentiment_score": s.score,
+                "sentiment_label": get_sentiment_label(s.score),
+                "article_count": s.article_count,
+                "rolling_mean": s.rolling_mean,
+                "rolling_std": s.rolling_std,
+                "delta": s.delta
             })
         return data
     
     # CSV format
     output = StringIO()
     writer = csv_module.writer(output)
-    writer.writerow(["Country", "Date", "Sentiment Score", "Sentiment Label", "Article Count"])
+    writer.writerow(["Country", "Date", "Sentiment Score", "Sentiment Label", "Article Count",
+                     "Rolling Mean", "Rolling Std", "Delta"])
     
-    for s in summaries:
-        label = get_sentiment_label(s.sentiment_score) if s.sentiment_score else "Unknown"
+    for s in series:
         writer.writerow([
             s.country,
             s.date.isoformat(),
-            s.sentiment_score or "",
-            label,
-            s.article_count
+            s.score,
+            get_sentiment_label(s.score),
+            s.article_count,
+            "" if s.rolling_mean is None else s.rolling_mean,
+            "" if s.rolling_std is None else s.rolling_std,
+            "" if s.delta is None else s.delta
         ])
     
     csv_content = output.getvalue()
@@ -492,22 +803,21 @@ async def export_sentiments(format: str = "csv", country: str = None, db: Sessio
 
 
 # ===== World Bank & IMF Data Endpoints =====
-from backend.services.worldbank_scraper import scrape_world_bank_data, WB_INDICATORS
-from backend.services.imf_scraper import scrape_imf_data
+from backend.services.worldbank_scraper import WB_INDICATORS
 from backend.models import EconomicIndicator
 from sqlalchemy import func
 
 @app.post("/api/scrape/worldbank")
-async def trigger_worldbank_scrape(background_tasks: BackgroundTasks):
+async def trigger_worldbank_scrape():
     """Trigger background scraping of World Bank data."""
-    background_tasks.add_task(scrape_world_bank_data)
-    return {"message": "World Bank data scraping started in background."}
+    job = enqueue("worldbank", priority=INTERACTIVE)
+    return {"message": "World Bank data scraping queued in background.", "job_id": job.id}
 
 @app.post("/api/scrape/imf")
-async def trigger_imf_scrape(background_tasks: BackgroundTasks):
+async def trigger_imf_scrape():
     """Trigger background scraping of IMF data."""
-    background_tasks.add_task(scrape_imf_data)
-    return {"message": "IMF data scraping started in background."}
+    job = enqueue("imf", priority=INTERACTIVE)
+    return {"message": "IMF data scraping queued in background.", "job_id": job.id}
 
 
 @app.get("/api/indicators/metadata")
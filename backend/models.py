@@ -2,7 +2,7 @@
 Database models for storing news articles and daily summaries.
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Date, Index, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, Date, Index, Float, Boolean
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -21,6 +21,8 @@ class Article(Base):
     country = Column(String(100), default="Global", nullable=False)
     published_date = Column(Date, nullable=False, index=True)
     scraped_at = Column(DateTime, default=datetime.utcnow)
+    # Sentiment score of title + description from -1.0 to +1.0, scored at ingest time
+    sentiment_score = Column(Float, nullable=True, default=None)
     
     # Create composite index for efficient queries
     __table_args__ = (
@@ -43,6 +45,15 @@ class DailySummary(Base):
     generated_at = Column(DateTime, default=datetime.utcnow)
     # Sentiment score from -1.0 (very negative) to +1.0 (very positive)
     sentiment_score = Column(Float, nullable=True, default=None)
+    # Hash of input article IDs, prompt version and model; unchanged inputs skip regeneration
+    input_fingerprint = Column(String(64), nullable=True)
+    llm_model = Column(String(200), nullable=True)
+    # Provider whose answer was used ("local" or "gemini"; differs from llm_model when a hedged request won)
+    llm_provider = Column(String(20), nullable=True)
+    # JSON list of the article IDs the summary covers, so later scrapes can send only the new ones
+    article_ids = Column(Text, nullable=True)
+    # Consecutive incremental (delta) updates since the last full regeneration
+    delta_updates = Column(Integer, nullable=True, default=0)
     
     # Ensure one summary per country per day
     __table_args__ = (
@@ -53,6 +64,166 @@ class DailySummary(Base):
         return f"<DailySummary(date={self.date}, country='{self.country}', articles={self.article_count})>"
 
 
+class SentimentSeries(Base):
+    """Model for the monthly sentiment series per country, derived from DailySummary scores."""
+    __tablename__ = "sentiment_series"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    country = Column(String(100), nullable=False)
+    date = Column(Date, nullable=False)  # First of month
+    score = Column(Float, nullable=False)
+    article_count = Column(Integer, default=0)
+    # Rolling statistics over the last N months (including this one)
+    rolling_mean = Column(Float, nullable=True)
+    rolling_std = Column(Float, nullable=True)
+    # Change from the previous month in the series
+    delta = Column(Float, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_series_country_date', 'country', 'date', unique=True),
+    )
+    
+    def __repr__(self):
+        return f"<SentimentSeries(country='{self.country}', date={self.date}, score={self.score})>"
+
+
+class CountryMomentum(Base):
+    """Model for the latest sentiment trend per country (one row per country)."""
+    __tablename__ = "country_momentum"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    country = Column(String(100), nullable=False, unique=True, index=True)
+    latest_date = Column(Date, nullable=False)
+    score = Column(Float, nullable=False)
+    previous_score = Column(Float, nullable=True)
+    # Month-over-month change of the latest score
+    delta = Column(Float, nullable=True, index=True)
+    rolling_mean = Column(Float, nullable=True)
+    # Latest score minus the rolling mean of the months before it
+    trend = Column(Float, nullable=True)
+    months = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<CountryMomentum(country='{self.country}', score={self.score}, delta={self.delta})>"
+
+
+class LLMCacheEntry(Base):
+    """Model for cached LLM responses, keyed by a hash of provider, model, temperature and prompt."""
+    __tablename__ = "llm_response_cache"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), nullable=False, unique=True, index=True)
+    provider = Column(String(50), nullable=False)
+    model = Column(String(200), nullable=False)
+    temperature = Column(Float, nullable=True)
+    response = Column(Text, nullable=False)
+    prompt_chars = Column(Integer, default=0)
+    # Time the original generation took; each hit saves about this much
+    generation_ms = Column(Float, nullable=True)
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    def __repr__(self):
+        return f"<LLMCacheEntry(model='{self.model}', hits={self.hit_count})>"
+
+
+class LLMCall(Base):
+    """Model for the LLM call ledger: one row per generation, cache hit or failed call."""
+    __tablename__ = "llm_calls"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    provider = Column(String(20), nullable=False)
+    model = Column(String(200), nullable=False)
+    # What triggered the call, e.g. "api:/api/summarize" or "script:generate_summaries_all_countries"
+    entry_point = Column(String(100), nullable=False, default="unknown")
+    kind = Column(String(50), nullable=True)  # summary, partial, comparative
+    country = Column(String(100), nullable=True)
+    target_date = Column(String(10), nullable=True)
+    outcome = Column(String(20), nullable=False)  # ok, error, cancelled, cache_hit
+    error = Column(Text, nullable=True)
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    # True when token counts are estimated from text length instead of reported by the provider
+    tokens_estimated = Column(Boolean, default=False)
+    streamed = Column(Boolean, default=False)
+    # Milliseconds from the call: until the request was sent, until the first chunk, and in total
+    queue_wait_ms = Column(Float, nullable=True)
+    ttft_ms = Column(Float, nullable=True)
+    latency_ms = Column(Float, nullable=True)
+    cost_usd = Column(Float, default=0.0)
+    
+    __table_args__ = (
+        Index('idx_llm_call_country_created', 'country', 'created_at'),
+    )
+    
+    def __repr__(self):
+        return f"<LLMCall(provider='{self.provider}', outcome='{self.outcome}', latency_ms={self.latency_ms})>"
+
+
+class Job(Base):
+    """Model for the durable background job queue (scrapes, summaries, data refreshes)."""
+    __tablename__ = "jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=True)  # JSON arguments for the handler
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, succeeded, failed, cancelled
+    # 0 = interactive, 1 = scheduled, 2 = backfill; lower runs first
+    priority = Column(Integer, nullable=True, default=1)
+    # Hash of kind + payload; a job is not queued twice while an identical one is pending
+    dedupe_key = Column(String(64), nullable=True, index=True)
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    error = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)  # JSON returned by the handler
+    worker = Column(String(100), nullable=True)
+    # Process running the job, which refreshes heartbeat_at while it is alive
+    owner = Column(String(100), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    # Not claimed before this time (retry backoff)
+    run_after = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        Index('idx_job_status_run_after', 'status', 'run_after'),
+        Index('idx_job_status_priority', 'status', 'priority', 'run_after'),
+    )
+    
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind='{self.kind}', status='{self.status}', attempts={self.attempts})>"
+
+
+class PipelineState(Base):
+    """Model for the build state of one pipeline stage for one (country, month) partition."""
+    __tablename__ = "pipeline_state"
+
+    id = Column(Integer, primary_key=True, index=True)
+    stage = Column(String(30), nullable=False)  # articles, summary, sentiment, aggregates, export, export_world
+    country = Column(String(100), nullable=False)
+    month = Column(Date, nullable=False)  # First of month
+    status = Column(String(20), nullable=False, default="dirty")  # dirty, clean, failed
+    # Fingerprint of the stage's output at the last build; downstream stages are
+    # only invalidated when it changes
+    fingerprint = Column(String(64), nullable=True)
+    error = Column(Text, nullable=True)
+    dirtied_at = Column(DateTime, default=datetime.utcnow)
+    built_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index('idx_pipeline_stage_partition', 'stage', 'country', 'month', unique=True),
+        Index('idx_pipeline_stage_status', 'stage', 'status'),
+    )
+
+    def __repr__(self):
+        return f"<PipelineState(stage='{self.stage}', country='{self.country}', month={self.month}, status='{self.status}')>"
+
+
 class EconomicIndicator(Base):
     """Model for storing World Bank economic indicators."""
     __tablename__ = "economic_indicators"
@@ -0,0 +1,120 @@
+"""
+Background health prober.
+
+Checks the LLM, the database and the sentiment model on an interval and
+keeps the latest result in memory, so /api/health answers instantly and
+never spends an LLM request (or a Gemini quota slot) per poll.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import text
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.services.sentiment_analyzer import get_model_status
+
+
+class HealthMonitor:
+    """Periodically probes dependencies and caches their status."""
+
+    def __init__(self, llm_client, interval: float = 30.0):
+        self.llm_client = llm_client
+        self.interval = max(1.0, interval)
+        self._state = {"llm": None, "database": None}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _probe_llm(self) -> dict:
+        start = time.perf_counter()
+        try:
+            available = self.llm_client.test_connection()
+            error = None
+        except Exception as e:
+            available, error = False, str(e)
+        return {
+            "available": available,
+            "provider": self.llm_client.provider,
+            "model": self.llm_client.model_id,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            "error": error,
+            "checked_at": datetime.utcnow().isoformat()
+        }
+
+    def _probe_database(self) -> dict:
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            db.execute(text("SELECT 1"))
+            available, error = True, None
+        except Exception as e:
+            available, error = False, str(e)
+        finally:
+            db.close()
+        return {
+            "available": available,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            "error": error,
+            "checked_at": datetime.utcnow().isoformat()
+        }
+
+    def refresh(self):
+        """Probe everything once and store the results."""
+        database = self._probe_database()
+        llm = self._probe_llm()
+        with self._lock:
+            self._state = {"llm": llm, "database": database}
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠ Health probe failed: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start probing in a daemon thread (no-op if already running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def snapshot(self) -> dict:
+        """Latest cached status (None for checks that haven't completed yet)."""
+        with self._lock:
+            state = dict(self._state)
+
+        database, llm = state["database"], state["llm"]
+        if database is not None and not database["available"]:
+            status = "unhealthy"
+        elif llm is not None and not llm["available"]:
+            status = "degraded"
+        else:
+            status = "healthy"
+
+        return {
+            "status": status,
+            "timestamp": datetime.utcnow().isoformat(),
+            "llm_available": llm["available"] if llm else None,
+            "llm": llm,
+            "database": database,
+            "sentiment_model": get_model_status()
+        }
+
+
+_monitor: Optional[HealthMonitor] = None
+
+
+def get_health_monitor(llm_client=None) -> HealthMonitor:
+    """Process-wide monitor; the first call must pass the LLM client to probe."""
+    global _monitor
+    if _monitor is None:
+        _monitor = HealthMonitor(llm_client, settings.health_check_interval_seconds)
+    return _monitor
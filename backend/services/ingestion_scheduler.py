@@ -0,0 +1,166 @@
+"""
+Continuous ingestion scheduler.
+
+Uses APScheduler to queue a scrape job (which chains summary and sentiment
+jobs) for every country once per INGESTION_INTERVAL_HOURS, plus periodic
+World Bank and IMF refreshes. Countries get evenly spaced slots anchored at a
+fixed midnight UTC, so the load is spread across the interval and slots survive
+restarts; jitter keeps them from lining up with other traffic. The
+scheduler only enqueues scheduled-priority jobs: the job queue's limits
+decide how much actually runs at once.
+
+Run it in a single process (the API); multiple schedulers would queue each
+country several times per interval (identical pending jobs are deduplicated,
+finished ones are not).
+"""
+import threading
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.models import Article
+from backend.services.job_queue import enqueue, SCHEDULED
+
+# APScheduler is optional; ingestion is disabled without it
+try:
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from apscheduler.triggers.interval import IntervalTrigger
+    HAS_APSCHEDULER = True
+except ImportError:
+    HAS_APSCHEDULER = False
+
+COUNTRY_JOB_PREFIX = "scrape:"
+
+
+def _anchor() -> datetime:
+    """Fixed start (a past midnight UTC) for the interval triggers, so run times don't shift on restart."""
+    return datetime(2024, 1, 1)
+
+
+def _queue_country(country: str):
+    job = enqueue("scrape", {"country": country, "target_date": date.today().isoformat(), "summarize": True},
+                  priority=SCHEDULED)
+    print(f"⏳ Scheduled scrape for {country} queued (job {job.id})")
+
+
+def _queue_refresh(kind: str):
+    job = enqueue(kind, priority=SCHEDULED)
+    print(f"⏳ Scheduled {kind} refresh queued (job {job.id})")
+
+
+class IngestionScheduler:
+    """Staggered per-country scrapes and periodic indicator refreshes."""
+
+    def __init__(self):
+        self._scheduler = None
+        self._countries: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._scheduler is not None and self._scheduler.running
+
+    def countries(self) -> List[str]:
+        """Configured countries, or every country that already has articles."""
+        if settings.ingestion_countries:
+            return sorted(set(settings.ingestion_countries))
+        db = SessionLocal()
+        try:
+            return sorted(country for (country,) in db.query(Article.country).distinct().all() if country)
+        finally:
+            db.close()
+
+    def start(self):
+        """Schedule all jobs and start the scheduler thread (no-op if running or unavailable)."""
+        if self.running:
+            return
+        if not HAS_APSCHEDULER:
+            print("⚠ APScheduler is not installed, continuous ingestion disabled")
+            return
+
+        self._scheduler = BackgroundScheduler(
+            timezone="UTC",
+            job_defaults={
+                # Jobs only enqueue work, so one instance is plenty; runs missed while
+                # the process was busy or down collapse into one if still within the grace time
+                "coalesce": True,
+                "max_instances": 1,
+                "misfire_grace_time": settings.ingestion_misfire_grace_seconds
+            }
+        )
+        self._schedule_refresh("worldbank", settings.ingestion_worldbank_interval_hours)
+        self._schedule_refresh("imf", settings.ingestion_imf_interval_hours)
+        # Pick up countries scraped for the first time (or removed) since the last sync
+        self._scheduler.add_job(self.sync_countries, IntervalTrigger(hours=1), id="sync-countries")
+        self.sync_countries()
+        self._scheduler.start()
+        print(f"✓ Ingestion scheduler started: {len(self._countries)} countries every "
+              f"{settings.ingestion_interval_hours:g}h")
+
+    def stop(self):
+        if self.running:
+            self._scheduler.shutdown(wait=False)
+        self._scheduler = None
+
+    def _schedule_refresh(self, kind: str, interval_hours: float):
+        if interval_hours <= 0:
+            return
+        self._scheduler.add_job(
+            _queue_refresh,
+            IntervalTrigger(hours=interval_hours, start_date=_anchor(), jitter=settings.ingestion_jitter_seconds,
+                            timezone="UTC"),
+            args=[kind], id=f"refresh:{kind}", replace_existing=True
+        )
+
+    def sync_countries(self):
+        """(Re)assign evenly spaced slots when the set of countries changed."""
+        with self._lock:
+            countries = self.countries()
+            if countries == self._countries:
+                return
+
+            for job in self._scheduler.get_jobs():
+                if job.id.startswith(COUNTRY_JOB_PREFIX) and job.id[len(COUNTRY_JOB_PREFIX):] not in countries:
+                    job.remove()
+
+            interval = timedelta(hours=settings.ingestion_interval_hours)
+            anchor = _anchor()
+            for i, country in enumerate(countries):
+                self._scheduler.add_job(
+                    _queue_country,
+                    IntervalTrigger(
+                        hours=settings.ingestion_interval_hours,
+                        start_date=anchor + interval * i / len(countries),
+                        jitter=settings.ingestion_jitter_seconds,
+                        timezone="UTC"
+                    ),
+                    args=[country], id=f"{COUNTRY_JOB_PREFIX}{country}", replace_existing=True
+                )
+            self._countries = countries
+
+    def status(self) -> dict:
+        """Whether the scheduler runs, and each scheduled job with its next run time."""
+        jobs = self._scheduler.get_jobs() if self.running else []
+        return {
+            "enabled": settings.ingestion_enabled,
+            "available": HAS_APSCHEDULER,
+            "running": self.running,
+            "interval_hours": settings.ingestion_interval_hours,
+            "countries": len(self._countries),
+            "jobs": sorted(
+                ({"id": job.id, "next_run_time": job.next_run_time} for job in jobs),
+                key=lambda job: (job["next_run_time"] is None, job["next_run_time"] or datetime.max)
+            )
+        }
+
+
+_ingestion_scheduler: Optional[IngestionScheduler] = None
+
+
+def get_ingestion_scheduler() -> IngestionScheduler:
+    """Process-wide ingestion scheduler."""
+    global _ingestion_scheduler
+    if _ingestion_scheduler is None:
+        _ingestion_scheduler = IngestionScheduler()
+    return _ingestion_scheduler
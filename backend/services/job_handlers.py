@@ -0,0 +1,105 @@
+"""
+Handlers for background jobs (see job_queue).
+
+Each handler receives its own database session plus the job payload and
+returns a JSON-serializable result. Importing this module registers them.
+"""
+import asyncio
+from datetime import date
+from typing import List, Optional
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.models import Article
+from backend.services.job_queue import register_job, enqueue, PermanentJobError
+from backend.services.news_scraper import NewsScraper
+from backend.services.summarizer import Summarizer
+from backend.services.summary_runner import default_concurrency
+from backend.services.sentiment_analyzer import analyze_sentiment
+from backend.services.sentiment_trends import refresh_country_series
+from backend.services.worldbank_scraper import scrape_world_bank_data
+from backend.services.imf_scraper import scrape_imf_data
+from backend.services.pipeline import run_pipeline, stage_names
+
+_scraper = None
+_summarizer = None
+
+
+def _get_scraper() -> NewsScraper:
+    global _scraper
+    if _scraper is None:
+        _scraper = NewsScraper()
+    return _scraper
+
+
+def _get_summarizer() -> Summarizer:
+    global _summarizer
+    if _summarizer is None:
+        _summarizer = Summarizer()
+    return _summarizer
+
+
+def _parse_date(value: Optional[str]) -> date:
+    return date.fromisoformat(value) if value else date.today()
+
+
+@register_job("scrape", max_concurrent=settings.job_scrape_concurrency)
+def scrape_job(db: Session, country: str = "Global", target_date: Optional[str] = None, summarize: bool = False) -> dict:
+    """
+    Scrape news for a country and date. With summarize, queue the follow-up work when articles
+    were added: a pipeline run for the country (PIPELINE_AFTER_SCRAPE) or a summary job.
+    """
+    target = _parse_date(target_date)
+    articles_added = _get_scraper().scrape_news(db, target, country)
+    result = {"articles_added": articles_added, "date": target.isoformat(), "country": country}
+
+    if summarize and articles_added > 0:
+        if settings.pipeline_after_scrape:
+            result["pipeline_job_id"] = enqueue("pipeline", {"countries": [country]}).id
+        else:
+            # Articles are stored under the first of their month, as are the summaries
+            month = target.replace(day=1)
+            result["summary_job_id"] = enqueue("summarize", {"country": country, "target_date": month.isoformat()}).id
+    return result
+
+
+@register_job("summarize", max_concurrent=default_concurrency())
+def summarize_job(db: Session, country: str = "Global", target_date: Optional[str] = None, force: bool = False) -> dict:
+    """Generate (or reuse) a summary and score its sentiment. Any day of a month selects that month."""
+    # Articles and summaries are stored under the first of their month
+    target = _parse_date(target_date).replace(day=1)
+    if db.query(Article.id).filter(Article.published_date == target, Article.country == country).first() is None:
+        # Retrying won't find any either
+        raise PermanentJobError(f"No articles for {target} in {country}")
+
+    summary = _get_summarizer().generate_daily_summary(db, target, country, force=force)
+    if summary is None:
+        # The LLM failed or is unavailable: fail the attempt so it is retried
+        raise RuntimeError(f"No summary generated for {target} in {country}")
+
+    if summary.sentiment_score is None and summary.summary_text:
+        summary.sentiment_score = analyze_sentiment(summary.summary_text)
+        db.commit()
+        refresh_country_series(db, country)
+
+    return {"summary_id": summary.id, "article_count": summary.article_count, "sentiment_score": summary.sentiment_score}
+
+
+@register_job("worldbank", max_concurrent=1)
+def worldbank_job(db: Session) -> dict:
+    asyncio.run(scrape_world_bank_data())
+    return {}
+
+
+@register_job("imf", max_concurrent=1)
+def imf_job(db: Session, limit: Optional[int] = None) -> dict:
+    asyncio.run(scrape_imf_data(limit))
+    return {}
+
+
+@register_job("pipeline", max_concurrent=1)
+def pipeline_job(db: Session, countries: Optional[List[str]] = None, stages: Optional[List[str]] = None) -> dict:
+    """Build the partitions made dirty by new articles (static export only if PIPELINE_EXPORT_ENABLED)."""
+    if not stages and not settings.pipeline_export_enabled:
+        stages = [name for name in stage_names() if not name.startswith("export")]
+    return run_pipeline(db, stages=stages, countries=countries)
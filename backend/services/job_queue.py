@@ -0,0 +1,597 @@
+"""
+Durable background job queue backed by the database.
+
+Jobs are rows in the jobs table, so queued work survives restarts and can
+be submitted by any process (API, scripts). A pool of worker threads in
+the API process claims due jobs, runs the handler registered for the job's
+kind with a session of its own, and retries failures with exponential
+backoff up to the job's max_attempts. Each kind can be capped to a number
+of concurrent jobs (e.g. scrapes, which hammer search engines).
+
+Jobs belong to a priority class: interactive (API requests) > scheduled >
+backfill (bulk scripts). Due jobs are claimed in priority order, and the
+lower classes may only occupy a share of the workers, so a user's request
+never waits behind a 195-country backfill. Interactive jobs also get a few
+slots on top of each kind's cap. Limits are counted from the running jobs
+in the database, so they hold across the API and script processes, and
+work the API does inline (track_inline) counts against them too.
+
+Every process stamps the jobs it runs with its owner id and refreshes their
+heartbeat while it is alive. Only running jobs whose heartbeat went stale
+(their process died) are recovered: queued jobs are requeued, inline work
+is marked cancelled, as its request is gone.
+"""
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from uuid import uuid4
+from sqlalchemy import and_, func, not_, or_, update
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.models import Job
+from backend.services.llm_ledger import call_context
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+PENDING_STATUSES = (QUEUED, RUNNING)
+
+# Priority classes, most urgent first (stored as Job.priority)
+INTERACTIVE = "interactive"
+SCHEDULED = "scheduled"
+BACKFILL = "backfill"
+PRIORITIES = {INTERACTIVE: 0, SCHEDULED: 1, BACKFILL: 2}
+_PRIORITY_NAMES = {value: name for name, value in PRIORITIES.items()}
+
+# Priority of the job running in this context; follow-up jobs it queues inherit it
+_current_priority: ContextVar[Optional[str]] = ContextVar("job_priority", default=None)
+
+# Identifies this process as the owner of the running jobs it heartbeats
+PROCESS_OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+INLINE_PREFIX = "inline:"
+
+_heartbeat_thread: Optional[threading.Thread] = None
+_heartbeat_lock = threading.Lock()
+
+
+def _priority_value(priority: str) -> int:
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown job priority '{priority}' (expected one of: {', '.join(PRIORITIES)})")
+    return PRIORITIES[priority]
+
+
+def priority_name(value: Optional[int]) -> str:
+    return _PRIORITY_NAMES.get(value, SCHEDULED)
+
+
+def _job_priority():
+    """Job.priority in queries; rows queued before the column existed (NULL) count as scheduled."""
+    return func.coalesce(Job.priority, PRIORITIES[SCHEDULED])
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler for a failure retrying cannot fix; the job fails without retries."""
+
+
+class JobHandler:
+    """A registered job kind: the function to run and its limits."""
+
+    def __init__(self, kind: str, func: Callable, max_concurrent: int = 0, max_attempts: Optional[int] = None):
+        self.kind = kind
+        self.func = func
+        self.max_concurrent = max_concurrent  # 0 = limited only by the worker count
+        self.max_attempts = max_attempts
+
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+def register_job(kind: str, max_concurrent: int = 0, max_attempts: Optional[int] = None):
+    """
+    Decorator registering func(db, **payload) -> dict as the handler for a job kind.
+    The returned dict is stored as the job's result.
+    """
+    def decorator(func):
+        _handlers[kind] = JobHandler(kind, func, max_concurrent, max_attempts)
+        return func
+    return decorator
+
+
+def registered_kinds() -> List[str]:
+    return sorted(_handlers)
+
+
+def _dedupe_key(kind: str, payload: dict) -> str:
+    return hashlib.sha256(json.dumps([kind, payload], sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def enqueue(kind: str, payload: Optional[dict] = None, priority: Optional[str] = None,
+            max_attempts: Optional[int] = None, dedupe: bool = True, db: Optional[Session] = None) -> Job:
+    """
+    Queue a job. With dedupe, an identical job (same kind and payload) that is
+    still queued or running is returned instead of queuing another; a queued
+    duplicate is promoted if this request is more urgent.
+
+    Args:
+        priority: interactive, scheduled or backfill (default: the priority of
+                  the job queuing it, else scheduled)
+        db: Session to use (a new one is opened and closed otherwise)
+    """
+    payload = payload or {}
+    priority = priority or _current_priority.get() or SCHEDULED
+    priority_value = _priority_value(priority)
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        key = _dedupe_key(kind, payload)
+        if dedupe:
+            existing = db.query(Job).filter(Job.dedupe_key == key, Job.status.in_(PENDING_STATUSES)).first()
+            if existing is not None:
+                if existing.status == QUEUED and priority_value < (existing.priority if existing.priority is not None else PRIORITIES[SCHEDULED]):
+                    existing.priority = priority_value
+                    db.commit()
+                    db.refresh(existing)
+                return existing
+
+        handler = _handlers.get(kind)
+        job = Job(
+            kind=kind,
+            payload=json.dumps(payload, default=str),
+            status=QUEUED,
+            priority=priority_value,
+            dedupe_key=key,
+            max_attempts=max_attempts or (handler.max_attempts if handler else None) or settings.job_max_attempts,
+            run_after=datetime.utcnow()
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+    finally:
+        if own_session:
+            db.expunge_all()
+            db.close()
+
+    if _queue is not None:
+        _queue.notify()
+    return job
+
+
+def job_to_dict(job: Job) -> dict:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "priority": priority_name(job.priority),
+        "payload": json.loads(job.payload) if job.payload else {},
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "created_at": job.created_at,
+        "run_after": job.run_after,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at
+    }
+
+
+def cancel_job(db: Session, job_id: int) -> bool:
+    """Cancel a queued job. Running jobs can't be interrupted."""
+    cancelled = db.execute(
+        update(Job).where(Job.id == job_id, Job.status == QUEUED)
+        .values(status=CANCELLED, finished_at=datetime.utcnow())
+    ).rowcount
+    db.commit()
+    return bool(cancelled)
+
+
+def retry_job(db: Session, job_id: int) -> bool:
+    """Queue a failed or cancelled job again with a fresh attempt budget."""
+    retried = db.execute(
+        update(Job).where(Job.id == job_id, Job.status.in_((FAILED, CANCELLED)))
+        .values(status=QUEUED, attempts=0, error=None, run_after=datetime.utcnow(), finished_at=None)
+    ).rowcount
+    db.commit()
+    if retried and _queue is not None:
+        _queue.notify()
+    return bool(retried)
+
+
+def wait_for_jobs(job_ids: List[int], poll_interval: float = 2.0) -> List[Job]:
+    """Block until the given jobs have finished (succeeded, failed or cancelled) and return them."""
+    while True:
+        db = SessionLocal()
+        try:
+            jobs = db.query(Job).filter(Job.id.in_(job_ids)).all()
+            if not any(job.status in PENDING_STATUSES for job in jobs):
+                db.expunge_all()
+                return jobs
+        finally:
+            db.close()
+        time.sleep(poll_interval)
+
+
+def _heartbeat_once():
+    """Mark the running jobs owned by this process as alive."""
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(Job).where(Job.status == RUNNING, Job.owner == PROCESS_OWNER).values(heartbeat_at=datetime.utcnow())
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _heartbeat_loop():
+    while True:
+        time.sleep(settings.job_heartbeat_seconds)
+        try:
+            _heartbeat_once()
+        except Exception as e:
+            print(f"⚠ Job heartbeat failed: {e}")
+
+
+def _ensure_heartbeat():
+    """Start this process's heartbeat thread (once)."""
+    global _heartbeat_thread
+    with _heartbeat_lock:
+        if _heartbeat_thread is None or not _heartbeat_thread.is_alive():
+            _heartbeat_thread = threading.Thread(target=_heartbeat_loop, name="job-heartbeat", daemon=True)
+            _heartbeat_thread.start()
+
+
+def recover_stale_jobs(db: Session) -> Dict[str, int]:
+    """
+    Recover running jobs whose owner stopped heartbeating: requeue queue jobs,
+    cancel inline work (never rerun outside its request).
+
+    Returns:
+        Counts of requeued and cancelled jobs
+    """
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=settings.job_stale_seconds)
+    stale = [
+        Job.status == RUNNING,
+        or_(Job.owner.is_(None), Job.owner != PROCESS_OWNER),
+        func.coalesce(Job.heartbeat_at, Job.started_at, Job.created_at) < cutoff
+    ]
+    inline = Job.worker.like(f"{INLINE_PREFIX}%")
+    cancelled = db.execute(
+        update(Job).where(*stale, inline).values(
+            status=CANCELLED, error="Interrupted: the process running it stopped", finished_at=now
+        )
+    ).rowcount
+    requeued = db.execute(
+        update(Job).where(*stale, or_(Job.worker.is_(None), not_(inline))).values(status=QUEUED, run_after=now)
+    ).rowcount
+    db.commit()
+    return {"requeued": requeued, "cancelled": cancelled}
+
+
+@contextmanager
+def track_inline(kind: str, payload: Optional[dict] = None, priority: str = INTERACTIVE):
+    """
+    Record work done outside the queue (e.g. a scrape inside an API request)
+    as a running job, so it holds a slot against the kind and class limits
+    while it runs. Yields the job id.
+    """
+    payload = payload or {}
+    _ensure_heartbeat()
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        job = Job(
+            kind=kind,
+            payload=json.dumps(payload, default=str),
+            status=RUNNING,
+            priority=_priority_value(priority),
+            dedupe_key=_dedupe_key(kind, payload),
+            attempts=1,
+            max_attempts=1,
+            worker=f"{INLINE_PREFIX}{threading.current_thread().name}",
+            owner=PROCESS_OWNER,
+            started_at=now,
+            heartbeat_at=now
+        )
+        db.add(job)
+        db.commit()
+        job_id = job.id
+    finally:
+        db.close()
+
+    status, error = SUCCEEDED, None
+    try:
+        yield job_id
+    except Exception as e:
+        status, error = FAILED, f"{type(e).__name__}: {e}"
+        raise
+    except BaseException:
+        # Client disconnected from a stream, or the task was cancelled
+        status = CANCELLED
+        raise
+    finally:
+        db = SessionLocal()
+        try:
+            db.execute(update(Job).where(Job.id == job_id).values(status=status, error=error, finished_at=datetime.utcnow()))
+            db.commit()
+        finally:
+            db.close()
+        if _queue is not None:
+            _queue.notify()
+
+
+class JobQueue:
+    """Worker threads that claim and run queued jobs."""
+
+    def __init__(self, workers: int = 4, poll_interval: float = 2.0):
+        self.workers = max(1, workers)
+        self.poll_interval = max(0.1, poll_interval)
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self, recover: bool = True):
+        """
+        Start the workers (no-op if running).
+
+        Args:
+            recover: Recover jobs orphaned by dead processes, at start and then
+                     periodically, and prune old finished jobs
+        """
+        if any(thread.is_alive() for thread in self._threads):
+            return
+        _ensure_heartbeat()
+        if recover:
+            self._recover()
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        if recover:
+            self._threads.append(threading.Thread(target=self._recover_loop, name="job-recovery", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        print(f"✓ Job queue started with {self.workers} workers")
+
+    def stop(self):
+        self._stop.set()
+        self.notify()
+
+    def notify(self):
+        """Wake idle workers (a job was queued or finished)."""
+        with self._wake:
+            self._wake.notify_all()
+
+    def _recover(self):
+        """
+        Recover running jobs whose process stopped heartbeating and prune old
+        finished jobs. Jobs of live processes (script workers, inline API work)
+        are left alone.
+        """
+        db = SessionLocal()
+        try:
+            recovered = recover_stale_jobs(db)
+            cutoff = datetime.utcnow() - timedelta(days=settings.job_retention_days)
+            pruned = db.query(Job).filter(
+                Job.status.in_((SUCCEEDED, FAILED, CANCELLED)),
+                Job.finished_at < cutoff
+            ).delete(synchronize_session=False)
+            db.commit()
+            self._report_recovered(recovered)
+            if pruned:
+                print(f"🧹 Pruned {pruned} finished jobs older than {settings.job_retention_days} days")
+        finally:
+            db.close()
+
+    def _recover_loop(self):
+        """Recover jobs of processes that die while this one runs."""
+        while not self._stop.wait(settings.job_stale_seconds):
+            db = SessionLocal()
+            try:
+                recovered = recover_stale_jobs(db)
+            except Exception as e:
+                print(f"⚠ Job recovery failed: {e}")
+                continue
+            finally:
+                db.close()
+            self._report_recovered(recovered)
+            if recovered["requeued"]:
+                self.notify()
+
+    @staticmethod
+    def _report_recovered(recovered: Dict[str, int]):
+        if recovered["requeued"]:
+            print(f"⚠ Requeued {recovered['requeued']} jobs whose process stopped")
+        if recovered["cancelled"]:
+            print(f"⚠ Cancelled {recovered['cancelled']} inline jobs whose process stopped")
+
+    def class_limits(self) -> Dict[str, Optional[int]]:
+        """Running jobs allowed per priority class (None = all workers)."""
+        return {
+            INTERACTIVE: None,
+            SCHEDULED: max(1, int(self.workers * settings.job_scheduled_share)),
+            BACKFILL: max(1, int(self.workers * settings.job_backfill_share))
+        }
+
+    def _running_counts(self, db: Session) -> Dict[tuple, int]:
+        """(kind, priority value) -> running jobs, across all processes."""
+        priority = _job_priority()
+        rows = db.query(Job.kind, priority, func.count(Job.id)).filter(Job.status == RUNNING).group_by(Job.kind, priority).all()
+        return {(kind, priority): count for kind, priority, count in rows}
+
+    def _capacity_filters(self, db: Session) -> Optional[list]:
+        """Filters selecting the queued jobs that fit the class and kind limits (None if none can run)."""
+        running = self._running_counts(db)
+        by_class, by_kind = {}, {}
+        for (kind, priority), count in running.items():
+            by_class[priority] = by_class.get(priority, 0) + count
+            by_kind[kind] = by_kind.get(kind, 0) + count
+
+        allowed = [
+            PRIORITIES[name] for name, limit in self.class_limits().items()
+            if limit is None or by_class.get(PRIORITIES[name], 0) < limit
+        ]
+        if not allowed:
+            return None
+        filters = [_job_priority().in_(allowed)]
+
+        for kind, handler in _handlers.items():
+            if not handler.max_concurrent:
+                continue
+            count = by_kind.get(kind, 0)
+            if count >= handler.max_concurrent + settings.job_interactive_reserved_slots:
+                filters.append(Job.kind != kind)
+            elif count >= handler.max_concurrent:
+                # Only interactive jobs may use the reserved slots
+                filters.append(not_(and_(Job.kind == kind, _job_priority() != PRIORITIES[INTERACTIVE])))
+        return filters
+
+    def _claim(self) -> Optional[Job]:
+        """Atomically mark the most urgent due job that fits the limits as running."""
+        with self._lock:
+            db = SessionLocal()
+            try:
+                now = datetime.utcnow()
+                filters = self._capacity_filters(db)
+                if filters is None:
+                    return None
+                job = db.query(Job).filter(Job.status == QUEUED, Job.run_after <= now, *filters).order_by(
+                    _job_priority(), Job.run_after, Job.id
+                ).first()
+                if job is None:
+                    return None
+
+                # Another process may have claimed it between the select and the update
+                claimed = db.execute(
+                    update(Job).where(Job.id == job.id, Job.status == QUEUED)
+                    .values(status=RUNNING, started_at=now, attempts=Job.attempts + 1,
+                            worker=threading.current_thread().name, owner=PROCESS_OWNER, heartbeat_at=now)
+                ).rowcount
+                db.commit()
+                if not claimed:
+                    return None
+
+                db.refresh(job)
+                db.expunge(job)
+                return job
+            finally:
+                db.close()
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                job = self._claim()
+            except Exception as e:
+                print(f"⚠ Job queue error: {e}")
+                job = None
+
+            if job is None:
+                with self._wake:
+                    self._wake.wait(self.poll_interval)
+                continue
+
+            try:
+                self._run(job)
+            finally:
+                self.notify()
+
+    def _run(self, job: Job):
+        handler = _handlers.get(job.kind)
+        payload = json.loads(job.payload) if job.payload else {}
+        priority = priority_name(job.priority)
+        print(f"▶️  Job {job.id} ({job.kind}, {priority}) started, attempt {job.attempts}/{job.max_attempts}")
+
+        db = SessionLocal()
+        token = _current_priority.set(priority)
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for job kind '{job.kind}'")
+            with call_context(entry_point=f"job:{job.kind}"):
+                result = handler.func(db, **payload)
+            error = None
+            retryable = True
+        except PermanentJobError as e:
+            db.rollback()
+            result = None
+            error = f"{type(e).__name__}: {e}"
+            retryable = False
+        except Exception as e:
+            db.rollback()
+            result = None
+            error = f"{type(e).__name__}: {e}"
+            retryable = handler is not None
+            traceback.print_exc()
+        finally:
+            _current_priority.reset(token)
+            db.close()
+
+        self._finish(job, result, error, retryable=retryable)
+
+    def _finish(self, job: Job, result: Optional[dict], error: Optional[str], retryable: bool = True):
+        now = datetime.utcnow()
+        values = {"finished_at": now, "error": error}
+        if error is None:
+            values.update(status=SUCCEEDED, result=json.dumps(result, default=str) if result is not None else None)
+            print(f"✓ Job {job.id} ({job.kind}) succeeded")
+        elif retryable and job.attempts < job.max_attempts:
+            delay = settings.job_retry_base_seconds * (2 ** (job.attempts - 1))
+            values.update(status=QUEUED, run_after=now + timedelta(seconds=delay), finished_at=None)
+            print(f"⚠ Job {job.id} ({job.kind}) failed: {error}; retrying in {delay:.0f}s")
+        else:
+            values.update(status=FAILED)
+            print(f"❌ Job {job.id} ({job.kind}) failed after {job.attempts} attempts: {error}")
+
+        db = SessionLocal()
+        try:
+            db.execute(update(Job).where(Job.id == job.id).values(**values))
+            db.commit()
+        finally:
+            db.close()
+
+    def status(self, db: Session) -> dict:
+        """Job counts by status, running and queued jobs per kind and class, and the limits."""
+        counts = dict(db.query(Job.status, func.count(Job.id)).group_by(Job.status).all())
+        priority = _job_priority()
+        queued = db.query(priority, func.count(Job.id)).filter(Job.status == QUEUED).group_by(priority).all()
+        running_by_kind, running_by_class = {}, {}
+        for (kind, priority), count in self._running_counts(db).items():
+            running_by_kind[kind] = running_by_kind.get(kind, 0) + count
+            running_by_class[priority_name(priority)] = running_by_class.get(priority_name(priority), 0) + count
+        return {
+            "workers": self.workers,
+            "alive": sum(1 for thread in self._threads if thread.is_alive()),
+            "counts": {status: counts.get(status, 0) for status in (QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED)},
+            "queued_by_class": {priority_name(priority): count for priority, count in queued},
+            "running_by_kind": running_by_kind,
+            "running_by_class": running_by_class,
+            "limits": {kind: handler.max_concurrent or None for kind, handler in _handlers.items()},
+            "class_limits": self.class_limits(),
+            "interactive_reserved_slots": settings.job_interactive_reserved_slots
+        }
+
+
+_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Process-wide job queue (workers start with start(), normally from the API startup)."""
+    global _queue
+    if _queue is None:
+        _queue = JobQueue(settings.job_workers, settings.job_poll_interval_seconds)
+    return _queue
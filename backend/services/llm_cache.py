@@ -0,0 +1,134 @@
+"""
+Persistent content-addressed cache of LLM responses.
+
+Entries are keyed by a hash of (provider, model, temperature, full prompt),
+expire after a TTL and are evicted least-recently-used beyond a size limit.
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy import func
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.models import LLMCacheEntry
+
+
+class LLMResponseCache:
+    """Prompt -> response cache stored in the application database."""
+
+    def __init__(self, ttl_seconds: int = None, max_entries: int = None):
+        self.ttl_seconds = settings.llm_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.max_entries = settings.llm_cache_max_entries if max_entries is None else max_entries
+
+    @staticmethod
+    def make_key(provider: str, model: str, temperature: Optional[float], prompt: str) -> str:
+        payload = json.dumps([provider, model, temperature, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _is_expired(self, entry: LLMCacheEntry) -> bool:
+        if not self.ttl_seconds:
+            return False
+        return entry.created_at < datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss or expired entry."""
+        found = self.lookup(key)
+        return found[0] if found else None
+
+    def lookup(self, key: str) -> Optional[Tuple[str, str]]:
+        """Return (response, provider that produced it) for key, or None on a miss or expired entry."""
+        db = SessionLocal()
+        try:
+            entry = db.query(LLMCacheEntry).filter(LLMCacheEntry.cache_key == key).first()
+            if entry is None:
+                return None
+
+            if self._is_expired(entry):
+                db.delete(entry)
+                db.commit()
+                return None
+
+            entry.hit_count = (entry.hit_count or 0) + 1
+            entry.last_accessed_at = datetime.utcnow()
+            db.commit()
+            return entry.response, entry.provider
+        finally:
+            db.close()
+
+    def put(self, key: str, provider: str, model: str, temperature: Optional[float],
+            response: str, prompt_chars: int = 0, generation_ms: Optional[float] = None):
+        """Store a response and evict entries beyond the TTL/size limits."""
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            entry = db.query(LLMCacheEntry).filter(LLMCacheEntry.cache_key == key).first()
+            if entry is None:
+                entry = LLMCacheEntry(cache_key=key, hit_count=0)
+                db.add(entry)
+
+            entry.provider = provider
+            entry.model = model
+            entry.temperature = temperature
+            entry.response = response
+            entry.prompt_chars = prompt_chars
+            entry.generation_ms = generation_ms
+            entry.created_at = now
+            entry.last_accessed_at = now
+            db.commit()
+
+            self._evict(db)
+        except Exception as e:
+            db.rollback()
+            print(f"⚠ Failed to store LLM cache entry: {e}")
+        finally:
+            db.close()
+
+    def _evict(self, db):
+        if self.ttl_seconds:
+            cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+            db.query(LLMCacheEntry).filter(LLMCacheEntry.created_at < cutoff).delete(synchronize_session=False)
+
+        if self.max_entries:
+            # Everything past the max_entries most recently used entries
+            stale_ids = [row[0] for row in db.query(LLMCacheEntry.id).order_by(
+                LLMCacheEntry.last_accessed_at.desc()
+            ).offset(self.max_entries).all()]
+            if stale_ids:
+                db.query(LLMCacheEntry).filter(LLMCacheEntry.id.in_(stale_ids)).delete(synchronize_session=False)
+
+        db.commit()
+
+    def clear(self) -> int:
+        """Delete all entries. Returns the number deleted."""
+        db = SessionLocal()
+        try:
+            deleted = db.query(LLMCacheEntry).delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        """Entry count, hits and the generation time hits have saved."""
+        db = SessionLocal()
+        try:
+            entries, hits, saved_ms = db.query(
+                func.count(LLMCacheEntry.id),
+                func.coalesce(func.sum(LLMCacheEntry.hit_count), 0),
+                func.coalesce(func.sum(LLMCacheEntry.hit_count * LLMCacheEntry.generation_ms), 0.0)
+            ).one()
+            avg_generation_ms = db.query(func.avg(LLMCacheEntry.generation_ms)).scalar()
+
+            return {
+                "enabled": settings.llm_cache_enabled,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": int(hits),
+                "saved_seconds": round(float(saved_ms) / 1000.0, 1),
+                "avg_generation_seconds": round(avg_generation_ms / 1000.0, 2) if avg_generation_ms else None
+            }
+        finally:
+            db.close()
@@ -1,11 +1,18 @@
 """
 Local LLM client for generating summaries using the LLM at localhost:1234 or Gemini API.
 """
-import requests
+import asyncio
 import time
-import threading
-from typing import Optional, Dict, Any
+from collections import deque
+from typing import AsyncIterator, Optional, Dict, Any
 from backend.config import settings
+from backend.services.llm_transport import (
+    get_transport, LLMTransportError, LLMConnectionError, LLMTimeoutError, LLMStatusError
+)
+from backend.services.llm_cache import LLMResponseCache
+from backend.services.llm_quota import get_gemini_scheduler, estimate_tokens, is_retryable
+from backend.services.llm_endpoints import get_endpoint_pool
+from backend.services.llm_ledger import CallTimer, call_context
 
 # Try to import google.genai, but don't fail if not installed (for local-only setups)
 try:
@@ -15,31 +22,212 @@ except ImportError:
     HAS_GEMINI = False
 
 
-class RateLimiter:
-    """Simple rate limiter to ensure we don't exceed N calls per minute."""
+# Output tokens assumed per Gemini request when reserving the TPM budget
+GEMINI_OUTPUT_TOKEN_ESTIMATE = 1500
+
+
+def _gemini_usage_tokens(response) -> Optional[int]:
+    """Total tokens reported by a Gemini response, if available."""
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "total_token_count", None) if usage else None
+
+
+def _record_gemini_usage(timer: CallTimer, response):
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        timer.set_usage(getattr(usage, "prompt_token_count", None), getattr(usage, "candidates_token_count", None))
+
+
+def _is_endpoint_failure(error: LLMTransportError) -> bool:
+    """Errors that say the endpoint itself is unhealthy (vs. a bad request)."""
+    if isinstance(error, LLMStatusError):
+        return error.status_code >= 500
+    return True
+
+
+class LLMText(str):
+    """Generated text that also records which provider produced it."""
     
-    def __init__(self, calls_per_minute: int):
-        self.calls_per_minute = calls_per_minute
-        self.interval = 60.0 / calls_per_minute
-        self.last_call_time = 0
-        self.lock = threading.Lock()
+    def __new__(cls, text: str, provider: str):
+        obj = super().__new__(cls, text)
+        obj.provider = provider
+        return obj
+
+
+# Recent successful request latencies per provider, for the hedge delay
+_latencies = {}
+
+
+def _record_latency(provider: str, seconds: float):
+    _latencies.setdefault(provider, deque(maxlen=200)).append(seconds)
+
+
+def hedge_delay(provider: str) -> float:
+    """p95 of the provider's recent latencies (LLM_HEDGE_DELAY_SECONDS until enough samples)."""
+    samples = sorted(_latencies.get(provider, ()))
+    if len(samples) < 20:
+        return settings.llm_hedge_delay_seconds
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return max(settings.llm_hedge_min_delay_seconds, p95)
+
+
+# Process-wide in-flight limits, shared by every LLMClient instance
+_in_flight = {}
+
+
+def _in_flight_limit(provider: str) -> asyncio.Semaphore:
+    """
+    Semaphore capping concurrent requests per provider.
+    Only used on the transport loop, so the semaphores are bound to that loop.
+    """
+    if provider not in _in_flight:
+        # Local servers are additionally capped per endpoint by the pool
+        limit = settings.llm_max_in_flight_gemini if provider == "gemini" else get_endpoint_pool().capacity
+        _in_flight[provider] = asyncio.Semaphore(max(1, limit))
+    return _in_flight[provider]
+
+
+# Bump whenever prompt wording or article formatting changes, so existing
+# summaries are no longer considered up to date
+PROMPT_VERSION = "2"
+
+
+def build_summary_prompts(articles_data: str, date: str, country_context: str) -> tuple:
+    """Return (system_prompt, user_prompt) for a daily/monthly country summary."""
+    system_prompt = f"""You are an expert economic analyst. Your task is to create a comprehensive, well-organized daily summary of economic news and signals{country_context}.
+
+Today's date is {date}.
+
+Guidelines:
+1. Organize the summary into clear sections (e.g., "GDP & Economic Growth", "Inflation & Monetary Policy", "Fiscal Policy & Government Actions", "Trade & International Relations", "Labor Market & Unemployment", "Currency & Exchange Rates")
+2. Highlight the most significant economic developments, trends, and policy changes
+3. Keep the summary to approximately 1 page (500-700 words)
+4. Use clear, professional language appropriate for economic analysis
+5. Focus on insights and implications, not just listing articles
+6. Identify any emerging patterns or themes across multiple articles
+7. Include relevant economic indicators and their implications
+
+Format the output in clean markdown with headers, bullet points where appropriate."""
+
+    user_prompt = f"""Based on the following economic news articles from {date}{country_context}, create a comprehensive daily economic analysis summary:
+
+{articles_data}
+
+Please provide a well-structured economic analysis summary following the guidelines."""
+
+    return system_prompt, user_prompt
+
+
+def build_partial_prompts(articles_data: str, date: str, country_context: str, category: str) -> tuple:
+    """Return (system_prompt, user_prompt) for the map step: one category's partial summary."""
+    system_prompt = f"""You are an expert economic analyst. Summarize the {category} news{country_context} for {date}.
+
+Guidelines:
+1. Write 150-250 words of concise bullet points
+2. Keep concrete figures, names, dates and policy decisions
+3. Note conflicting reports and emerging trends
+4. Do not add introductions, conclusions or information not in the articles"""
+
+    user_prompt = f"""{category} articles from {date}{country_context}:
+
+{articles_data}"""
+
+    return system_prompt, user_prompt
+
+
+def build_reduce_prompts(partial_summaries: str, date: str, country_context: str) -> tuple:
+    """Return (system_prompt, user_prompt) for the reduce step: the final report from category summaries."""
+    system_prompt, _ = build_summary_prompts("", date, country_context)
+
+    user_prompt = f"""Based on the following category-by-category briefings of economic news from {date}{country_context}, create a comprehensive daily economic analysis summary:
+
+{partial_summaries}
+
+Please provide a well-structured economic analysis summary following the guidelines. Connect developments across categories rather than repeating each briefing."""
+
+    return system_prompt, user_prompt
+
+
+def build_delta_prompts(existing_summary: str, new_articles_data: str, date: str, country_context: str) -> tuple:
+    """Return (system_prompt, user_prompt) to update an existing summary with newly added articles."""
+    system_prompt, _ = build_summary_prompts("", date, country_context)
+
+    user_prompt = f"""Below is the current economic analysis summary from {date}{country_context}, followed by news articles published since it was written.
+
+Update the summary to incorporate the new articles:
+- Keep the structure, length (500-700 words) and any points that remain valid
+- Add significant new developments to the relevant sections and revise statements the new articles contradict or supersede
+- Do not mention that this is an update
+
+## Current summary
+
+{existing_summary}
+
+## New articles
+{new_articles_data}
+
+Please provide the complete updated economic analysis summary following the guidelines."""
+
+    return system_prompt, user_prompt
+
+
+COMPARATIVE_SYSTEM_PROMPT = "You are a senior global economic strategist specializing in cross-country benchmarking."
+
+
+def build_comparative_prompt(articles_data: str, date: str, countries: list) -> str:
+    """Return the prompt for a comparative multi-country summary."""
+    countries_str = ", ".join(countries)
     
-    def wait(self):
-        """Wait if necessary to respect the rate limit."""
-        with self.lock:
-            current_time = time.time()
-            elapsed = current_time - self.last_call_time
-            
-            if elapsed < self.interval:
-                sleep_time = self.interval - elapsed
-                print(f"⏳ Rate limit: Waiting {sleep_time:.2f}s...")
-                time.sleep(sleep_time)
-            
-            self.last_call_time = time.time()
+    return f"""You are a senior global economic strategist. Your task is to provide a side-by-side comparative analysis of the economic landscape in {countries_str}.
+        
+        Today's date is {date}.
+        
+        Guidelines:
+        1. **Comparative Framework**: Do not just list summaries for each country. Instead, compare them across themes like "Monetary Policy Divergence", "Inflation Trends", "Global Trade Positioning", and "Growth Outlook".
+        2. **Relative Strengths**: Identify which countries are showing relative strength or weakness compared to the others in the group.
+        3. **Interconnections**: Discuss how economic shifts in one of these countries might impact the others (e.g., trade flows, currency pressure).
+        4. **Data Driven**: Reference specific developments from the news provided.
+        5. **Layout**: Use clear markdown headers and a structured approach that emphasizes comparison.
+        
+        Based on the following news data for {date}, generate a high-level comparative economic summary:
+        
+        {articles_data}
+        
+        Provide a sophisticated, professional comparative analysis."""
+
+
+def build_comparative_briefing_prompt(briefings: str, date: str, countries: list) -> str:
+    """Return the prompt for a comparative summary built from per-country briefings."""
+    countries_str = ", ".join(countries)
+    
+    return f"""You are a senior global economic strategist. Your task is to provide a side-by-side comparative analysis of the economic landscape in {countries_str}.
+
+Today's date is {date}.
+
+Each country below has a briefing: its latest economic analysis, its news sentiment score (-1 to +1) with the change from the previous month, and key macroeconomic indicators.
+
+Guidelines:
+1. **Comparative Framework**: Do not just restate each briefing. Compare the countries across themes like "Monetary Policy Divergence", "Inflation Trends", "Global Trade Positioning", and "Growth Outlook".
+2. **Relative Strengths**: Identify which countries are showing relative strength or weakness compared to the others in the group, using the sentiment scores and indicators.
+3. **Interconnections**: Discuss how economic shifts in one of these countries might impact the others (e.g., trade flows, currency pressure).
+4. **Data Driven**: Reference specific developments and figures from the briefings.
+5. **Layout**: Use clear markdown headers and a structured approach that emphasizes comparison.
+
+Country briefings for {date}:
+
+{briefings}
+
+Provide a sophisticated, professional comparative analysis."""
 
 
 class LLMClient:
-    """Client for interacting with LLM APIs (Local or Gemini)."""
+    """
+    Client for interacting with LLM APIs (Local or Gemini).
+    
+    Every call runs on the shared LLMTransport event loop, which keeps a pool
+    of keep-alive connections to the local server. Async callers use the
+    a-prefixed methods; scripts and sync endpoints use the plain sync wrappers.
+    """
     
     def __init__(self):
         self.provider = settings.llm_provider
@@ -49,31 +237,77 @@ class LLMClient:
         self.model = settings.llm_model
         self.temperature = settings.llm_temperature
         self.max_tokens = settings.llm_max_tokens
+        self.request_timeout = settings.llm_request_timeout
+        
+        # Shared connection-pooled transport and local endpoint pool
+        self.transport = get_transport()
+        self.endpoints = get_endpoint_pool()
+        
+        # Persistent prompt -> response cache
+        self.cache = LLMResponseCache() if settings.llm_cache_enabled else None
         
         # Gemini settings
         self.gemini_key = settings.gemini_api_key
         self.gemini_model = settings.gemini_model
         self.gemini_client = None
         
-        # Rate limiter for Gemini (10 calls per minute)
-        self.rate_limiter = RateLimiter(10)
+        # Gemini RPM/TPM budgets and retries (shared across clients)
+        self.quota = get_gemini_scheduler()
+        
+        # Gemini is also set up as the hedge target when hedging a local primary
+        if self.provider == "gemini" or settings.llm_hedge_enabled:
+            self._init_gemini(required=self.provider == "gemini")
+    
+    def _init_gemini(self, required: bool):
+        """Create the Gemini client; if Gemini is the primary provider and unavailable, fall back to local."""
+        fallback = " Falling back to local LLM." if required else " Hedging to Gemini is disabled."
+        if not HAS_GEMINI:
+            print(f"⚠ google-genai package not installed.{fallback}")
+        elif not self.gemini_key:
+            print(f"⚠ GEMINI_API_KEY not set.{fallback}")
+        else:
+            try:
+                self.gemini_client = genai.Client(api_key=self.gemini_key)
+                print(f"✓ Initialized Gemini client with model: {self.gemini_model}")
+                return
+            except Exception as e:
+                print(f"⚠ Failed to initialize Gemini client: {e}.{fallback}")
         
+        if required:
+            self.provider = "local"
+    
+    @property
+    def active_model(self) -> str:
+        """Model name used by the active provider."""
+        return self.gemini_model if self.provider == "gemini" else self.model
+    
+    @property
+    def model_id(self) -> str:
+        """Identifier of the provider and model that generates text."""
+        return self.provider_model_id(self.provider)
+    
+    def provider_model(self, provider: str) -> str:
+        """Model name used by a provider."""
+        return self.gemini_model if provider == "gemini" else self.model
+    
+    def provider_model_id(self, provider: str) -> str:
+        """Identifier of a provider and its model, e.g. "local:openai/gpt-oss-20b"."""
+        if provider == "gemini":
+            return f"gemini:{self.gemini_model}"
+        return f"local:{self.model}"
+    
+    @property
+    def hedge_provider(self) -> Optional[str]:
+        """Secondary provider for hedged requests, if hedging is enabled and possible."""
+        if not settings.llm_hedge_enabled:
+            return None
         if self.provider == "gemini":
-            if not HAS_GEMINI:
-                print("⚠ google-genai package not installed. Falling back to local LLM.")
-                self.provider = "local"
-            elif not self.gemini_key:
-                print("⚠ GEMINI_API_KEY not set. Falling back to local LLM.")
-                self.provider = "local"
-            else:
-                try:
-                    self.gemini_client = genai.Client(api_key=self.gemini_key)
-                    print(f"✓ Initialized Gemini client with model: {self.gemini_model}")
-                except Exception as e:
-                    print(f"⚠ Failed to initialize Gemini client: {e}. Falling back to local LLM.")
-                    self.provider = "local"
-    
-    def generate_summary(self, articles_data: str, date: str, country: str = "Global") -> Optional[str]:
+            return "local"
+        return "gemini" if self.gemini_client is not None else None
+    
+    # ----- Sync API -----
+    
+    def generate_summary(self, articles_data: str, date: str, country: str = "Global", use_cache: bool = True) -> Optional[str]:
         """
         Generate a daily summary from articles data.
         
@@ -81,196 +315,548 @@ class LLMClient:
             articles_data: Formatted string of articles with titles and descriptions
             date: Date string for context
             country: Country name for context (default: "Global")
+            use_cache: Set False to bypass the response cache
             
         Returns:
             Generated summary text or None if LLM is unavailable
         """
+        return self.transport.run_sync(self._generate_summary(articles_data, date, country, use_cache))
+
+    def generate_comparative_summary(self, articles_data: str, date: str, countries: list, use_cache: bool = True,
+                                     from_briefings: bool = False) -> Optional[str]:
+        """
+        Generate a comparative economic summary for multiple countries.
+        
+        Args:
+            articles_data: Raw articles grouped by country, or per-country briefings if from_briefings
+        """
+        return self.transport.run_sync(self._generate_comparative_summary(articles_data, date, countries, use_cache, from_briefings))
+    
+    def generate_map_reduce_summary(self, category_data: Dict[str, str], date: str, country: str = "Global",
+                                    use_cache: bool = True) -> Optional[str]:
+        """
+        Generate a summary for a large article set: one partial summary per
+        category (generated concurrently), then a final report from the partials.
+        
+        Args:
+            category_data: Dict mapping category to its formatted articles
+            date: Date string for context
+            country: Country name for context (default: "Global")
+            use_cache: Set False to bypass the response cache
+        """
+        return self.transport.run_sync(self._generate_map_reduce(category_data, date, country, use_cache))
+    
+    def generate_delta_summary(self, existing_summary: str, new_articles_data: str, date: str, country: str = "Global",
+                               use_cache: bool = True) -> Optional[str]:
+        """
+        Update an existing summary with newly added articles, instead of
+        regenerating it from every article.
+        
+        Args:
+            existing_summary: The current summary text
+            new_articles_data: Formatted string of only the new articles
+        """
+        return self.transport.run_sync(self._generate_delta(existing_summary, new_articles_data, date, country, use_cache))
+    
+    def test_connection(self) -> bool:
+        """Test if the LLM API is available."""
+        return self.transport.run_sync(self._test_connection())
+    
+    # ----- Async API -----
+    
+    async def agenerate_summary(self, articles_data: str, date: str, country: str = "Global", use_cache: bool = True) -> Optional[str]:
+        """Async version of generate_summary."""
+        return await self.transport.run(self._generate_summary(articles_data, date, country, use_cache))
+    
+    async def agenerate_comparative_summary(self, articles_data: str, date: str, countries: list, use_cache: bool = True,
+                                            from_briefings: bool = False) -> Optional[str]:
+        """Async version of generate_comparative_summary."""
+        return await self.transport.run(self._generate_comparative_summary(articles_data, date, countries, use_cache, from_briefings))
+    
+    async def agenerate_map_reduce_summary(self, category_data: Dict[str, str], date: str, country: str = "Global",
+                                           use_cache: bool = True) -> Optional[str]:
+        """Async version of generate_map_reduce_summary."""
+        return await self.transport.run(self._generate_map_reduce(category_data, date, country, use_cache))
+    
+    async def agenerate_delta_summary(self, existing_summary: str, new_articles_data: str, date: str, country: str = "Global",
+                                      use_cache: bool = True) -> Optional[str]:
+        """Async version of generate_delta_summary."""
+        return await self.transport.run(self._generate_delta(existing_summary, new_articles_data, date, country, use_cache))
+    
+    async def atest_connection(self) -> bool:
+        """Async version of test_connection."""
+        return await self.transport.run(self._test_connection())
+    
+    async def astream_summary(self, articles_data: str, date: str, country: str = "Global", use_cache: bool = True) -> AsyncIterator[str]:
+        """
+        Stream a daily summary as text chunks while the LLM produces them.
+        A cached response is yielded as a single chunk.
+        
+        Raises:
+            LLMTransportError: If the LLM is unavailable or fails mid-stream
+        """
+        async for chunk in self.transport.iterate(self._stream_summary(articles_data, date, country, use_cache)):
+            yield chunk
+    
+    async def astream_map_reduce_summary(self, category_data: Dict[str, str], date: str, country: str = "Global",
+                                         use_cache: bool = True) -> AsyncIterator[str]:
+        """
+        Map-reduce version of astream_summary: partial summaries are generated
+        first, then the final report is streamed.
+        
+        Raises:
+            LLMTransportError: If the LLM is unavailable or fails mid-stream
+        """
+        async for chunk in self.transport.iterate(self._stream_map_reduce(category_data, date, country, use_cache)):
+            yield chunk
+    
+    async def astream_delta_summary(self, existing_summary: str, new_articles_data: str, date: str, country: str = "Global",
+                                    use_cache: bool = True) -> AsyncIterator[str]:
+        """
+        Streaming version of generate_delta_summary.
+        
+        Raises:
+            LLMTransportError: If the LLM is unavailable or fails mid-stream
+        """
+        async for chunk in self.transport.iterate(self._stream_delta(existing_summary, new_articles_data, date, country, use_cache)):
+            yield chunk
+    
+    # ----- Implementation (runs on the transport loop) -----
+    
+    async def _generate_summary(self, articles_data: str, date: str, country: str, use_cache: bool = True) -> Optional[str]:
         country_context = f" for {country}" if country != "Global" else ""
+        system_prompt, user_prompt = build_summary_prompts(articles_data, date, country_context)
+        return await self._complete(system_prompt, user_prompt, use_cache)
+    
+    async def _stream_summary(self, articles_data: str, date: str, country: str, use_cache: bool = True) -> AsyncIterator[str]:
+        country_context = f" for {country}" if country != "Global" else ""
+        system_prompt, user_prompt = build_summary_prompts(articles_data, date, country_context)
+        async for chunk in self._stream(system_prompt, user_prompt, use_cache):
+            yield chunk
+    
+    async def _generate_delta(self, existing_summary: str, new_articles_data: str, date: str, country: str,
+                              use_cache: bool = True) -> Optional[str]:
+        country_context = f" for {country}" if country != "Global" else ""
+        return await self._complete(*build_delta_prompts(existing_summary, new_articles_data, date, country_context), use_cache)
+    
+    async def _stream_delta(self, existing_summary: str, new_articles_data: str, date: str, country: str,
+                            use_cache: bool = True) -> AsyncIterator[str]:
+        country_context = f" for {country}" if country != "Global" else ""
+        async for chunk in self._stream(*build_delta_prompts(existing_summary, new_articles_data, date, country_context), use_cache):
+            yield chunk
+    
+    async def _partial_summaries(self, category_data: Dict[str, str], date: str, country: str, use_cache: bool) -> Optional[str]:
+        """Map step: concurrent per-category summaries, joined under category headers."""
+        country_context = f" for {country}" if country != "Global" else ""
+        categories = list(category_data)
+        with call_context(kind="partial"):
+            partials = await asyncio.gather(*(
+                self._complete(*build_partial_prompts(category_data[category], date, country_context, category), use_cache)
+                for category in categories
+            ))
         
+        sections = [f"## {category}\n{partial.strip()}" for category, partial in zip(categories, partials) if partial]
+        if len(sections) < len(categories):
+            print(f"⚠ {len(categories) - len(sections)} of {len(categories)} category summaries failed")
+        return "\n\n".join(sections) if sections else None
+    
+    async def _generate_map_reduce(self, category_data: Dict[str, str], date: str, country: str, use_cache: bool = True) -> Optional[str]:
+        partials = await self._partial_summaries(category_data, date, country, use_cache)
+        if not partials:
+            return None
+        
+        country_context = f" for {country}" if country != "Global" else ""
+        return await self._complete(*build_reduce_prompts(partials, date, country_context), use_cache)
+    
+    async def _stream_map_reduce(self, category_data: Dict[str, str], date: str, country: str, use_cache: bool = True) -> AsyncIterator[str]:
+        partials = await self._partial_summaries(category_data, date, country, use_cache)
+        if not partials:
+            raise LLMTransportError("All category summaries failed")
+        
+        country_context = f" for {country}" if country != "Global" else ""
+        async for chunk in self._stream(*build_reduce_prompts(partials, date, country_context), use_cache):
+            yield chunk
+    
+    async def _stream(self, system_prompt: str, user_prompt: str, use_cache: bool = True) -> AsyncIterator[str]:
+        """Stream text for a system + user prompt with the active provider, via the cache."""
+        key = self._cache_key(system_prompt, user_prompt) if use_cache else None
+        if key:
+            timer = CallTimer(self.provider, self.active_model, streamed=True)
+            cached = await self._cache_get(key)
+            if cached is not None:
+                timer.finish("cache_hit")
+                yield cached
+                return
+        
+        timer = CallTimer(self.provider, self.active_model, streamed=True)
         if self.provider == "gemini":
-            return self._generate_with_gemini(articles_data, date, country_context)
+            stream = self._stream_with_gemini(f"{system_prompt}\n\n{user_prompt}", timer)
         else:
-            return self._generate_with_local(articles_data, date, country_context)
-
-    def _generate_with_gemini(self, articles_data: str, date: str, country_context: str) -> Optional[str]:
-        """Generate summary using Gemini API."""
-        prompt = f"""You are an expert economic analyst. Your task is to create a comprehensive, well-organized daily summary of economic news and signals{country_context}.
-
-Today's date is {date}.
-
-Guidelines:
-1. Organize the summary into clear sections (e.g., "GDP & Economic Growth", "Inflation & Monetary Policy", "Fiscal Policy & Government Actions", "Trade & International Relations", "Labor Market & Unemployment", "Currency & Exchange Rates")
-2. Highlight the most significant economic developments, trends, and policy changes
-3. Keep the summary to approximately 1 page (500-700 words)
-4. Use clear, professional language appropriate for economic analysis
-5. Focus on insights and implications, not just listing articles
-6. Identify any emerging patterns or themes across multiple articles
-7. Include relevant economic indicators and their implications
-
-Format the output in clean markdown with headers, bullet points where appropriate.
-
-Based on the following economic news articles from {date}{country_context}, create a comprehensive daily economic analysis summary:
-
-{articles_data}
-
-Please provide a well-structured economic analysis summary following the guidelines."""
-
+            stream = self._stream_with_local(system_prompt, user_prompt, timer)
+        
+        chunks = []
+        outcome = "error"
+        try:
+            async with _in_flight_limit(self.provider):
+                start = time.perf_counter()
+                async for chunk in stream:
+                    timer.mark_first_token()
+                    chunks.append(chunk)
+                    yield chunk
+            outcome = "ok" if chunks else "error"
+        except (asyncio.CancelledError, GeneratorExit):
+            outcome = "cancelled"
+            raise
+        except Exception as e:
+            timer.error = str(e)
+            raise
+        finally:
+            timer.estimate_usage(f"{system_prompt}\n\n{user_prompt}", "".join(chunks))
+            timer.finish(outcome)
+        
+        if key and chunks:
+            await self._cache_put(key, system_prompt, user_prompt, "".join(chunks), start)
+    
+    async def _generate_comparative_summary(self, articles_data: str, date: str, countries: list, use_cache: bool = True,
+                                            from_briefings: bool = False) -> Optional[str]:
+        if from_briefings:
+            prompt = build_comparative_briefing_prompt(articles_data, date, countries)
+        else:
+            prompt = build_comparative_prompt(articles_data, date, countries)
+        return await self._complete(COMPARATIVE_SYSTEM_PROMPT, prompt, use_cache)
+    
+    async def _complete(self, system_prompt: str, user_prompt: str, use_cache: bool = True) -> Optional[str]:
+        """
+        Generate text for a system + user prompt via the cache, hedging to
+        the secondary provider when enabled. The result is an LLMText
+        recording which provider produced it.
+        """
+        key = self._cache_key(system_prompt, user_prompt) if use_cache else None
+        if key:
+            timer = CallTimer(self.provider, self.active_model)
+            cached = await self._cache_get(key)
+            if cached is not None:
+                timer.finish("cache_hit")
+                return cached
+        
+        start = time.perf_counter()
+        if self.hedge_provider:
+            text = await self._generate_hedged(system_prompt, user_prompt)
+        else:
+            text = await self._generate_with(self.provider, system_prompt, user_prompt)
+        
+        if key and text:
+            # Stored under the request's key (the one looked up), recording the provider that answered
+            await self._cache_put(key, system_prompt, user_prompt, text, start, text.provider)
+        return text
+    
+    async def _generate_with(self, provider: str, system_prompt: str, user_prompt: str,
+                             acquired: Optional[asyncio.Event] = None) -> Optional["LLMText"]:
+        """
+        Generate with one provider, within its in-flight limit, recording its latency and ledger row.
+        
+        Args:
+            acquired: Set once the request holds its in-flight slot (latency is measured from there)
+        """
+        timer = CallTimer(provider, self.provider_model(provider))
+        text = None
+        outcome = "error"
+        try:
+            async with _in_flight_limit(provider):
+                if acquired is not None:
+                    acquired.set()
+                start = time.perf_counter()
+                if provider == "gemini":
+                    text = await self._generate_with_gemini(f"{system_prompt}\n\n{user_prompt}", timer)
+                else:
+                    text = await self._generate_with_local(system_prompt, user_prompt, timer)
+            if text:
+                outcome = "ok"
+        except asyncio.CancelledError:
+            # e.g. the losing side of a hedged request
+            outcome = "cancelled"
+            raise
+        finally:
+            if outcome == "ok":
+                timer.estimate_usage(f"{system_prompt}\n\n{user_prompt}", text)
+            timer.finish(outcome)
+        
+        if not text:
+            return None
+        _record_latency(provider, time.perf_counter() - start)
+        return LLMText(text, provider)
+    
+    async def _generate_hedged(self, system_prompt: str, user_prompt: str) -> Optional["LLMText"]:
+        """
+        Send the prompt to the primary provider; if it hasn't answered within
+        the hedge delay of getting its in-flight slot (or fails), also send it
+        to the secondary provider.
+        The first non-empty answer wins and the other request is cancelled.
+        """
+        primary, secondary = self.provider, self.hedge_provider
+        acquired = asyncio.Event()
+        primary_task = asyncio.ensure_future(self._generate_with(primary, system_prompt, user_prompt, acquired))
+        tasks = {primary_task: primary}
+        
         try:
-            # Apply rate limiting
-            self.rate_limiter.wait()
+            # The delay is a p95 of latencies measured once the slot is held, so time spent
+            # queued on the in-flight limit (e.g. during bulk runs) must not count towards it
+            slot_wait = asyncio.ensure_future(acquired.wait())
+            try:
+                await asyncio.wait({primary_task, slot_wait}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                slot_wait.cancel()
+            
+            delay = hedge_delay(primary)
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                print(f"🏁 {primary} hasn't answered in {delay:.1f}s, hedging to {secondary}")
+                tasks[asyncio.ensure_future(self._generate_with(secondary, system_prompt, user_prompt))] = secondary
             
-            response = self.gemini_client.models.generate_content(
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    provider = tasks.pop(task)
+                    text = task.result() if not task.cancelled() and task.exception() is None else None
+                    if text:
+                        return text
+                    if provider == primary and secondary not in tasks.values():
+                        # Primary failed before the hedge delay: fail over immediately
+                        print(f"⚠ {primary} failed, falling back to {secondary}")
+                        tasks[asyncio.ensure_future(self._generate_with(secondary, system_prompt, user_prompt))] = secondary
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    def _cache_key(self, system_prompt: str, user_prompt: str) -> Optional[str]:
+        """Cache key for a prompt sent to the active provider (hedged answers are stored under it too)."""
+        if self.cache is None:
+            return None
+        return LLMResponseCache.make_key(
+            self.provider, self.active_model, self.temperature, f"{system_prompt}\n\n{user_prompt}"
+        )
+    
+    async def _cache_get(self, key: str) -> Optional["LLMText"]:
+        """
+        Cached response with the provider that produced it, or None on a miss
+        or a cache error (e.g. a locked database).
+        """
+        try:
+            found = await asyncio.to_thread(self.cache.lookup, key)
+        except Exception as e:
+            print(f"⚠ LLM cache read failed, calling the LLM: {e}")
+            return None
+        return LLMText(*found) if found else None
+    
+    async def _cache_put(self, key: str, system_prompt: str, user_prompt: str, text: str, start: float,
+                         provider: Optional[str] = None):
+        provider = provider or self.provider
+        generation_ms = (time.perf_counter() - start) * 1000
+        try:
+            await asyncio.to_thread(
+                self.cache.put, key, provider, self.provider_model(provider), self.temperature,
+                str(text), len(system_prompt) + len(user_prompt), generation_ms
+            )
+        except Exception as e:
+            # The response is still returned; it just isn't cached
+            print(f"⚠ LLM cache write failed: {e}")
+
+    async def _generate_with_gemini(self, prompt: str, timer: CallTimer) -> Optional[str]:
+        """Generate text using Gemini API, within quota and with retries."""
+        def request():
+            timer.mark_sent()
+            return self.gemini_client.aio.models.generate_content(
                 model=self.gemini_model,
                 contents=prompt,
             )
+        
+        try:
+            response = await self.quota.call(
+                request,
+                tokens=self._gemini_token_estimate(prompt),
+                usage_tokens=_gemini_usage_tokens
+            )
+            _record_gemini_usage(timer, response)
             return response.text
         except Exception as e:
             print(f"⚠ Error calling Gemini API: {e}")
+            timer.error = str(e)
             return None
 
-    def _generate_with_local(self, articles_data: str, date: str, country_context: str) -> Optional[str]:
-        """Generate summary using local LLM."""
-        system_prompt = f"""You are an expert economic analyst. Your task is to create a comprehensive, well-organized daily summary of economic news and signals{country_context}.
-
-Today's date is {date}.
-
-Guidelines:
-1. Organize the summary into clear sections (e.g., "GDP & Economic Growth", "Inflation & Monetary Policy", "Fiscal Policy & Government Actions", "Trade & International Relations", "Labor Market & Unemployment", "Currency & Exchange Rates")
-2. Highlight the most significant economic developments, trends, and policy changes
-3. Keep the summary to approximately 1 page (500-700 words)
-4. Use clear, professional language appropriate for economic analysis
-5. Focus on insights and implications, not just listing articles
-6. Identify any emerging patterns or themes across multiple articles
-7. Include relevant economic indicators and their implications
-
-Format the output in clean markdown with headers, bullet points where appropriate."""
+    async def _stream_with_gemini(self, prompt: str, timer: CallTimer) -> AsyncIterator[str]:
+        """Stream text from Gemini API. Retries only before the first chunk arrives."""
+        tokens = self._gemini_token_estimate(prompt)
+        
+        for attempt in range(self.quota.max_retries + 1):
+            await self.quota.acquire(tokens)
+            timer.mark_sent()
+            started = False
+            try:
+                stream = await self.gemini_client.aio.models.generate_content_stream(
+                    model=self.gemini_model,
+                    contents=prompt,
+                )
+                async for chunk in stream:
+                    # Usage is reported on the final chunk
+                    _record_gemini_usage(timer, chunk)
+                    if chunk.text:
+                        started = True
+                        yield chunk.text
+                self.quota.record_success()
+                return
+            except Exception as e:
+                if started or not is_retryable(e) or attempt == self.quota.max_retries:
+                    print(f"⚠ Error streaming from Gemini API: {e}")
+                    raise LLMTransportError(str(e)) from e
+                await self.quota.before_retry(e, attempt)
 
-        user_prompt = f"""Based on the following economic news articles from {date}{country_context}, create a comprehensive daily economic analysis summary:
+    def _gemini_token_estimate(self, prompt: str) -> int:
+        # Prompt plus a typical summary (~700 words)
+        return estimate_tokens(prompt) + GEMINI_OUTPUT_TOKEN_ESTIMATE
 
-{articles_data}
+    async def _stream_with_local(self, system_prompt: str, user_prompt: str, timer: CallTimer) -> AsyncIterator[str]:
+        """Stream text from the local LLM pool. Fails over to another endpoint before the first chunk."""
+        payload = self._chat_payload([
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ])
+        
+        tried = set()
+        while True:
+            endpoint = await self.endpoints.acquire(tried)
+            if endpoint is None:
+                raise LLMConnectionError("No LLM endpoint available")
+            
+            timer.mark_sent()
+            start = time.perf_counter()
+            started = False
+            ok = None
+            try:
+                async for chunk in self.transport.stream_chat(endpoint.url, payload, timeout=self.request_timeout):
+                    started = True
+                    yield chunk
+                ok = True
+                return
+            except LLMTransportError as e:
+                ok = not _is_endpoint_failure(e)
+                if started or ok:
+                    print(f"⚠ Error streaming from LLM API: {e}")
+                    raise
+                print(f"⚠ LLM endpoint {endpoint.url} failed ({e}), trying another")
+                tried.add(endpoint.url)
+            finally:
+                await self.endpoints.release(endpoint, ok, time.perf_counter() - start if ok else None)
 
-Please provide a well-structured economic analysis summary following the guidelines."""
+    def _chat_payload(self, messages: list, temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> dict:
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature if temperature is None else temperature,
+            "max_tokens": self.max_tokens if max_tokens is None else max_tokens,
+            "stream": False
+        }
 
+    async def _generate_with_local(self, system_prompt: str, user_prompt: str, timer: CallTimer) -> Optional[str]:
+        """Generate text using the local LLM pool."""
+        payload = self._chat_payload([
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ])
+        
         try:
-            response = requests.post(
-                self.api_url,
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    "temperature": self.temperature,
-                    "max_tokens": self.max_tokens,
-                    "stream": False
-                },
-                timeout=120  # 2 minute timeout for summary generation
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("choices", [{}])[0].get("message", {}).get("content", "")
-            else:
-                print(f"⚠ LLM API returned status {response.status_code}: {response.text}")
-                return None
-                
-        except requests.exceptions.ConnectionError:
-            print("⚠ LLM API is not available. Make sure the LLM server is running at localhost:1234")
+            result = await self._post_local(payload, self.request_timeout, timer)
+        except LLMConnectionError as e:
+            print(f"⚠ LLM API is not available. Make sure the LLM server is running at {', '.join(settings.llm_api_urls)}")
+            timer.error = str(e) or "connection error"
             return None
-        except requests.exceptions.Timeout:
+        except LLMTimeoutError:
             print("⚠ LLM API request timed out")
+            timer.error = "timeout"
+            return None
+        except LLMStatusError as e:
+            print(f"⚠ LLM API returned status {e.status_code}: {e.body}")
+            timer.error = f"status {e.status_code}"
             return None
         except Exception as e:
             print(f"⚠ Error calling LLM API: {e}")
+            timer.error = str(e)
             return None
-
-    def generate_comparative_summary(self, articles_data: str, date: str, countries: list) -> Optional[str]:
+        
+        usage = result.get("usage") or {}
+        timer.set_usage(usage.get("prompt_tokens"), usage.get("completion_tokens"))
+        return result.get("choices", [{}])[0].get("message", {}).get("content", "")
+    
+    async def _post_local(self, payload: dict, timeout: float, timer: Optional[CallTimer] = None) -> dict:
         """
-        Generate a comparative economic summary for multiple countries.
+        POST to the least-loaded healthy endpoint, failing over to the others
+        on connection errors and 5xx responses.
         """
-        countries_str = ", ".join(countries)
-        
-        prompt = f"""You are a senior global economic strategist. Your task is to provide a side-by-side comparative analysis of the economic landscape in {countries_str}.
-        
-        Today's date is {date}.
-        
-        Guidelines:
-        1. **Comparative Framework**: Do not just list summaries for each country. Instead, compare them across themes like "Monetary Policy Divergence", "Inflation Trends", "Global Trade Positioning", and "Growth Outlook".
-        2. **Relative Strengths**: Identify which countries are showing relative strength or weakness compared to the others in the group.
-        3. **Interconnections**: Discuss how economic shifts in one of these countries might impact the others (e.g., trade flows, currency pressure).
-        4. **Data Driven**: Reference specific developments from the news provided.
-        5. **Layout**: Use clear markdown headers and a structured approach that emphasizes comparison.
-        
-        Based on the following news data for {date}, generate a high-level comparative economic summary:
-        
-        {articles_data}
-        
-        Provide a sophisticated, professional comparative analysis."""
-
-        if self.provider == "gemini":
-            try:
-                self.rate_limiter.wait()
-                response = self.gemini_client.models.generate_content(
-                    model=self.gemini_model,
-                    contents=prompt,
-                )
-                return response.text
-            except Exception as e:
-                print(f"⚠ Error calling Gemini API: {e}")
-                return None
-        else:
-            # Local LLM fallback
+        tried = set()
+        last_error = None
+        while True:
+            endpoint = await self.endpoints.acquire(tried)
+            if endpoint is None:
+                raise last_error or LLMConnectionError("No LLM endpoint available")
+            
+            if timer:
+                timer.mark_sent()
+            start = time.perf_counter()
+            ok = None
             try:
-                response = requests.post(
-                    self.api_url,
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": "You are a senior global economic strategist specializing in cross-country benchmarking."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        "temperature": self.temperature,
-                        "max_tokens": self.max_tokens,
-                        "stream": False
-                    },
-                    timeout=120
-                )
-                if response.status_code == 200:
-                    result = response.json()
-                    return result.get("choices", [{}])[0].get("message", {}).get("content", "")
-                return None
-            except Exception as e:
-                print(f"⚠ Error calling Local LLM: {e}")
-                return None
+                result = await self.transport.post_json(endpoint.url, payload, timeout=timeout)
+                ok = True
+                return result
+            except LLMTransportError as e:
+                ok = not _is_endpoint_failure(e)
+                # Timeouts aren't retried: another server would likely need as long
+                if ok or isinstance(e, LLMTimeoutError):
+                    raise
+                if len(self.endpoints.endpoints) > 1:
+                    print(f"⚠ LLM endpoint {endpoint.url} failed ({e}), trying another")
+                tried.add(endpoint.url)
+                last_error = e
+            finally:
+                await self.endpoints.release(endpoint, ok, time.perf_counter() - start if ok else None)
     
-    def test_connection(self) -> bool:
-        """Test if the LLM API is available."""
+    async def _test_connection(self) -> bool:
+        """
+        Check the LLM is reachable without generating text: Gemini model
+        metadata, or the local server's model list. Falls back to a tiny
+        completion for local servers without a /models endpoint.
+        """
         if self.provider == "gemini":
             try:
-                # Apply rate limiting
-                self.rate_limiter.wait()
-                
-                response = self.gemini_client.models.generate_content(
-                    model=self.gemini_model,
-                    contents="Hello",
-                )
+                await self.gemini_client.aio.models.get(model=self.gemini_model)
                 return True
             except Exception as e:
                 print(f"Gemini connection test failed: {e}")
                 return False
-        else:
+        
+        # Probe every local endpoint; results feed the pool's ejection state
+        results = await asyncio.gather(*(self._probe_endpoint(endpoint) for endpoint in self.endpoints.endpoints))
+        return any(results)
+    
+    async def _probe_endpoint(self, endpoint) -> bool:
+        ok = await self._probe_url(endpoint.url, endpoint.models_url)
+        self.endpoints.record(endpoint, ok)
+        return ok
+    
+    async def _probe_url(self, api_url: str, models_url: Optional[str]) -> bool:
+        if models_url:
             try:
-                response = requests.post(
-                    self.api_url,
-                    json={
-                        "model": self.model,
-                        "messages": [{"role": "user", "content": "Hello"}],
-                        "temperature": 0.7,
-                        "max_tokens": 10,
-                        "stream": False
-                    },
-                    timeout=10
-                )
-                return response.status_code == 200
-            except:
+                await self.transport.get_json(models_url, timeout=5)
+                return True
+            except LLMStatusError:
+                pass  # Reachable, but no model list: try a completion
+            except LLMTransportError:
                 return False
+        
+        payload = self._chat_payload([{"role": "user", "content": "Hello"}], temperature=0.7, max_tokens=10)
+        try:
+            await self.transport.post_json(api_url, payload, timeout=10)
+            return True
+        except LLMTransportError:
+            return False
+        except Exception:
+            return False
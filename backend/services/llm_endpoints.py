@@ -0,0 +1,155 @@
+"""
+Load balancing across a pool of local OpenAI-compatible endpoints.
+
+Requests go to the healthy endpoint with the fewest outstanding requests,
+each endpoint capped at its own concurrency limit. Endpoints that fail
+repeatedly are ejected for an exponentially growing period; a successful
+request or health probe brings them back.
+"""
+import asyncio
+import time
+from typing import List, Optional
+
+from backend.config import settings
+
+
+class Endpoint:
+    """One inference server and its load/health counters."""
+
+    def __init__(self, url: str, max_in_flight: int):
+        self.url = url
+        self.max_in_flight = max(1, max_in_flight)
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.latency_ewma = None
+
+    @property
+    def models_url(self) -> Optional[str]:
+        if self.url.endswith("/chat/completions"):
+            return self.url[:-len("/chat/completions")] + "/models"
+        return None
+
+    def is_ejected(self, now: float) -> bool:
+        return now < self.ejected_until
+
+    def status(self, now: float) -> dict:
+        return {
+            "url": self.url,
+            "healthy": not self.is_ejected(now),
+            "outstanding": self.outstanding,
+            "max_in_flight": self.max_in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "consecutive_failures": self.consecutive_failures,
+            "ejected_for_seconds": round(max(0.0, self.ejected_until - now), 1),
+            "latency_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None
+        }
+
+
+class EndpointPool:
+    """
+    Least-outstanding-requests routing with per-endpoint caps and ejection.
+    Only used on the transport loop (asyncio primitives are bound to it).
+    """
+
+    def __init__(self, urls: List[str], max_in_flight: int, max_failures: int = 3, ejection_seconds: float = 30.0):
+        self.endpoints = [Endpoint(url, max_in_flight) for url in urls]
+        self.max_failures = max(1, max_failures)
+        self.ejection_seconds = ejection_seconds
+        self._available = None
+
+    @property
+    def capacity(self) -> int:
+        """Total concurrent requests across all endpoints."""
+        return sum(endpoint.max_in_flight for endpoint in self.endpoints)
+
+    def _condition(self) -> asyncio.Condition:
+        if self._available is None:
+            self._available = asyncio.Condition()
+        return self._available
+
+    def _pick(self, exclude: set) -> Optional[Endpoint]:
+        now = time.monotonic()
+        candidates = [e for e in self.endpoints if e.url not in exclude and e.outstanding < e.max_in_flight]
+        healthy = [e for e in candidates if not e.is_ejected(now)]
+        if not healthy and not any(not e.is_ejected(now) for e in self.endpoints if e.url not in exclude):
+            # Everything left is ejected: fall back to the one closest to reinstatement
+            healthy = sorted(candidates, key=lambda e: e.ejected_until)[:1]
+        if not healthy:
+            return None
+        return min(healthy, key=lambda e: (e.outstanding, e.latency_ewma or 0.0))
+
+    async def acquire(self, exclude: set = frozenset()) -> Optional[Endpoint]:
+        """
+        Reserve a slot on the best endpoint, waiting while all are at capacity.
+        Returns None when every endpoint is excluded.
+        """
+        if all(e.url in exclude for e in self.endpoints):
+            return None
+
+        condition = self._condition()
+        async with condition:
+            while True:
+                endpoint = self._pick(exclude)
+                if endpoint is not None:
+                    endpoint.outstanding += 1
+                    endpoint.requests += 1
+                    return endpoint
+                await condition.wait()
+
+    async def release(self, endpoint: Endpoint, ok: Optional[bool], latency: Optional[float] = None):
+        """
+        Free the slot and update health. ok=False for connection errors,
+        timeouts and 5xx; None when the outcome says nothing about health
+        (e.g. the caller was cancelled).
+        """
+        endpoint.outstanding -= 1
+        if ok is not None:
+            self.record(endpoint, ok, latency)
+
+        condition = self._condition()
+        async with condition:
+            condition.notify_all()
+
+    def record(self, endpoint: Endpoint, ok: bool, latency: Optional[float] = None):
+        """Record a request or probe outcome, ejecting the endpoint after repeated failures."""
+        if ok:
+            endpoint.consecutive_failures = 0
+            endpoint.ejections = 0
+            endpoint.ejected_until = 0.0
+            if latency is not None:
+                endpoint.latency_ewma = latency if endpoint.latency_ewma is None else 0.8 * endpoint.latency_ewma + 0.2 * latency
+            return
+
+        endpoint.errors += 1
+        endpoint.consecutive_failures += 1
+        if endpoint.consecutive_failures >= self.max_failures:
+            duration = min(300.0, self.ejection_seconds * (2 ** endpoint.ejections))
+            endpoint.ejections += 1
+            endpoint.consecutive_failures = 0
+            endpoint.ejected_until = time.monotonic() + duration
+            print(f"⚠ Ejecting LLM endpoint {endpoint.url} for {duration:.0f}s after repeated failures")
+
+    def status(self) -> List[dict]:
+        now = time.monotonic()
+        return [endpoint.status(now) for endpoint in self.endpoints]
+
+
+_pool: Optional[EndpointPool] = None
+
+
+def get_endpoint_pool() -> EndpointPool:
+    """Process-wide pool of local LLM endpoints, shared by all LLMClient instances."""
+    global _pool
+    if _pool is None:
+        _pool = EndpointPool(
+            settings.llm_api_urls,
+            settings.llm_max_in_flight_local,
+            max_failures=settings.llm_endpoint_max_failures,
+            ejection_seconds=settings.llm_endpoint_ejection_seconds
+        )
+    return _pool
@@ -0,0 +1,248 @@
+"""
+Ledger of LLM calls for capacity planning.
+
+Every generation is recorded in the llm_calls table: provider, model,
+token counts, queue wait, time to first token, total latency, outcome,
+cost and the entry point that triggered it. Entry points and the
+(country, date) being summarized are attached with call_context(), which
+sets a ContextVar; LLMTransport carries the caller's context onto its
+loop. Rows are written on a background thread so calls never wait on it.
+"""
+import contextvars
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.models import LLMCall
+from backend.services.llm_quota import estimate_tokens
+
+_call_context = contextvars.ContextVar("llm_call_context", default={})
+
+REPORT_GROUPS = ("country", "day", "provider", "entry_point", "kind")
+
+
+@contextmanager
+def call_context(**fields):
+    """
+    Attach fields (entry_point, country, target_date, kind) to LLM calls
+    made inside the block. Nested blocks add to / override outer ones.
+    """
+    token = _call_context.set({**_call_context.get(), **{k: v for k, v in fields.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _call_context.reset(token)
+
+
+def in_call_context(func, **fields):
+    """Wrap func to run inside call_context(**fields), e.g. for background tasks."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with call_context(**fields):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def current_context() -> dict:
+    return dict(_call_context.get())
+
+
+def call_cost(provider: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> float:
+    """Cost in USD from the configured per-million-token prices (local calls are free)."""
+    if provider != "gemini":
+        return 0.0
+    return ((prompt_tokens or 0) * settings.gemini_price_input_per_mtok
+            + (completion_tokens or 0) * settings.gemini_price_output_per_mtok) / 1_000_000
+
+
+def record_call(provider: str, model: str, outcome: str, latency_ms: Optional[float] = None,
+                queue_wait_ms: Optional[float] = None, ttft_ms: Optional[float] = None,
+                prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None,
+                tokens_estimated: bool = False, streamed: bool = False, error: Optional[str] = None,
+                context: Optional[dict] = None):
+    """Persist one call. Failures to write are logged, never raised."""
+    if not settings.llm_ledger_enabled:
+        return
+
+    context = context if context is not None else current_context()
+    db = SessionLocal()
+    try:
+        db.add(LLMCall(
+            provider=provider,
+            model=model,
+            kind=context.get("kind"),
+            entry_point=context.get("entry_point", "unknown"),
+            country=context.get("country"),
+            target_date=str(context["target_date"]) if context.get("target_date") else None,
+            outcome=outcome,
+            error=error[:500] if error else None,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            tokens_estimated=tokens_estimated,
+            streamed=streamed,
+            queue_wait_ms=queue_wait_ms,
+            ttft_ms=ttft_ms,
+            latency_ms=latency_ms,
+            cost_usd=call_cost(provider, prompt_tokens, completion_tokens)
+        ))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"⚠ Failed to record LLM call: {e}")
+    finally:
+        db.close()
+
+
+# Single writer thread: keeps SQLite writes serialized and off the caller's path
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-ledger")
+
+
+class CallTimer:
+    """
+    Timing and token counts of one LLM call; finish() queues the ledger row.
+
+    Queue wait runs from the call until the request is sent (in-flight
+    limit, endpoint slot, Gemini quota). TTFT and latency are measured from
+    the call too, so they include the queue wait.
+    """
+
+    def __init__(self, provider: str, model: str, streamed: bool = False):
+        self.provider = provider
+        self.model = model
+        self.streamed = streamed
+        self.context = current_context()
+        self.started = time.perf_counter()
+        self.sent_at = None
+        self.first_token_at = None
+        self.prompt_tokens = None
+        self.completion_tokens = None
+        self.tokens_estimated = False
+        self.error = None
+
+    def mark_sent(self):
+        """Record when the first attempt was sent (retries count as latency, not queueing)."""
+        if self.sent_at is None:
+            self.sent_at = time.perf_counter()
+
+    def mark_first_token(self):
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+
+    def set_usage(self, prompt_tokens: Optional[int], completion_tokens: Optional[int]):
+        """Token counts reported by the provider."""
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+    def estimate_usage(self, prompt: str, completion: str):
+        """Fill in token counts the provider didn't report."""
+        if self.prompt_tokens is None:
+            self.prompt_tokens = estimate_tokens(prompt)
+            self.tokens_estimated = True
+        if self.completion_tokens is None and completion:
+            self.completion_tokens = estimate_tokens(completion)
+            self.tokens_estimated = True
+
+    def finish(self, outcome: str):
+        """Queue the ledger row (outcome: ok, error, cancelled or cache_hit)."""
+        if not settings.llm_ledger_enabled:
+            return
+
+        def elapsed_ms(until):
+            return round((until - self.started) * 1000, 1) if until is not None else None
+
+        _writer.submit(
+            record_call, self.provider, self.model, outcome,
+            latency_ms=elapsed_ms(time.perf_counter()),
+            queue_wait_ms=elapsed_ms(self.sent_at),
+            ttft_ms=elapsed_ms(self.first_token_at),
+            prompt_tokens=self.prompt_tokens,
+            completion_tokens=self.completion_tokens,
+            tokens_estimated=self.tokens_estimated,
+            streamed=self.streamed,
+            error=self.error,
+            context=self.context
+        )
+
+
+def flush(timeout: float = 10.0):
+    """Wait until ledger rows queued so far are written (e.g. before a report)."""
+    _writer.submit(lambda: None).result(timeout=timeout)
+
+
+def _percentiles(values: list) -> dict:
+    values = [v for v in values if v is not None]
+    if not values:
+        return {"p50": None, "p95": None, "p99": None}
+    p50, p95, p99 = np.percentile(np.asarray(values, dtype=float), [50, 95, 99])
+    return {"p50": round(float(p50), 1), "p95": round(float(p95), 1), "p99": round(float(p99), 1)}
+
+
+def ledger_report(db: Session, days: int = 7, group_by: str = "country") -> List[Dict]:
+    """
+    Call counts, tokens, cost and latency percentiles per group over the last N days.
+
+    Args:
+        group_by: One of REPORT_GROUPS
+    """
+    if group_by not in REPORT_GROUPS:
+        raise ValueError(f"group_by must be one of: {', '.join(REPORT_GROUPS)}")
+
+    since = datetime.utcnow() - timedelta(days=days)
+    calls = db.query(LLMCall).filter(LLMCall.created_at >= since).all()
+
+    groups = {}
+    for call in calls:
+        if group_by == "day":
+            key = call.created_at.date().isoformat()
+        else:
+            key = getattr(call, group_by) or "(none)"
+        groups.setdefault(key, []).append(call)
+
+    report = []
+    for key, group in sorted(groups.items()):
+        generated = [c for c in group if c.outcome == "ok"]
+        report.append({
+            group_by: key,
+            "calls": len(group),
+            "ok": len(generated),
+            "errors": sum(1 for c in group if c.outcome == "error"),
+            "cache_hits": sum(1 for c in group if c.outcome == "cache_hit"),
+            "cancelled": sum(1 for c in group if c.outcome == "cancelled"),
+            "prompt_tokens": sum(c.prompt_tokens or 0 for c in group),
+            "completion_tokens": sum(c.completion_tokens or 0 for c in group),
+            "cost_usd": round(sum(c.cost_usd or 0.0 for c in group), 4),
+            "latency_ms": _percentiles([c.latency_ms for c in generated]),
+            "queue_wait_ms": _percentiles([c.queue_wait_ms for c in generated]),
+            "ttft_ms": _percentiles([c.ttft_ms for c in generated if c.streamed])
+        })
+
+    return report
+
+
+def recent_calls(db: Session, limit: int = 50) -> List[LLMCall]:
+    return db.query(LLMCall).order_by(LLMCall.created_at.desc()).limit(limit).all()
+
+
+def ledger_totals(db: Session, days: int = 7) -> dict:
+    since = datetime.utcnow() - timedelta(days=days)
+    calls, prompt_tokens, completion_tokens, cost = db.query(
+        func.count(LLMCall.id),
+        func.coalesce(func.sum(LLMCall.prompt_tokens), 0),
+        func.coalesce(func.sum(LLMCall.completion_tokens), 0),
+        func.coalesce(func.sum(LLMCall.cost_usd), 0.0)
+    ).filter(LLMCall.created_at >= since).one()
+    return {
+        "days": days,
+        "calls": calls,
+        "prompt_tokens": int(prompt_tokens),
+        "completion_tokens": int(completion_tokens),
+        "cost_usd": round(float(cost), 4)
+    }
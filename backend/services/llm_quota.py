@@ -0,0 +1,254 @@
+"""
+Quota-aware scheduling and retries for rate-limited LLM APIs (Gemini).
+
+QuotaScheduler tracks requests-per-minute and tokens-per-minute over a
+sliding 60-second window. Callers wait asynchronously until both budgets
+have room. When the API answers 429 the scheduler pauses all callers for
+the server's retry delay and temporarily lowers its request rate, then
+recovers gradually after successful calls.
+"""
+import asyncio
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from backend.config import settings
+
+WINDOW_SECONDS = 60.0
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status of an API error, if it carries one."""
+    for attr in ("code", "status_code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    match = re.match(r"\s*(\d{3})\b", str(error))
+    return int(match.group(1)) if match else None
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Server-requested retry delay from a Retry-After header or a Gemini
+    RetryInfo detail ("retryDelay": "27s"), if present.
+    """
+    headers = getattr(error, "headers", None) or {}
+    response = getattr(error, "response", None)
+    if not headers and response is not None:
+        headers = getattr(response, "headers", None) or {}
+
+    for name in ("retry-after", "Retry-After"):
+        if name in headers:
+            try:
+                return max(0.0, float(headers[name]))
+            except (TypeError, ValueError):
+                pass
+
+    match = re.search(r"retryDelay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s", str(getattr(error, "details", "")) + str(error))
+    return float(match.group(1)) if match else None
+
+
+def is_retryable(error: Exception) -> bool:
+    status = error_status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    # No status: network-level failures (timeouts, resets) are worth retrying
+    return isinstance(error, (asyncio.TimeoutError, ConnectionError, TimeoutError))
+
+
+class QuotaScheduler:
+    """Sliding-window RPM/TPM budget with adaptive throttling after 429s."""
+
+    def __init__(self, name: str, rpm: int, tpm: int = 0, max_retries: int = 4,
+                 backoff_base: float = 2.0, backoff_max: float = 60.0):
+        self.name = name
+        self.rpm = max(1, rpm)
+        self.tpm = max(0, tpm)  # 0 = no token budget
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.effective_rpm = float(self.rpm)
+        self.cooldown_until = 0.0
+        self.window = deque()  # [timestamp, tokens] per request in the last minute
+        self.lock = threading.Lock()
+
+        self.requests = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self.failures = 0
+        self.total_wait_seconds = 0.0
+
+    def _prune(self, now: float):
+        while self.window and now - self.window[0][0] >= WINDOW_SECONDS:
+            self.window.popleft()
+
+    def _reserve(self, tokens: int) -> tuple:
+        """Record the request if the budgets allow it now. Returns (entry, wait_seconds)."""
+        with self.lock:
+            now = time.monotonic()
+            self._prune(now)
+
+            if now < self.cooldown_until:
+                return None, self.cooldown_until - now
+
+            waits = []
+            if len(self.window) >= int(self.effective_rpm):
+                # Wait until enough requests fall out of the window
+                oldest = self.window[len(self.window) - int(self.effective_rpm)][0]
+                waits.append(oldest + WINDOW_SECONDS - now)
+
+            if self.tpm:
+                used = sum(entry[1] for entry in self.window)
+                if used + tokens > self.tpm and self.window:
+                    excess = used + tokens - self.tpm
+                    for timestamp, entry_tokens in self.window:
+                        excess -= entry_tokens
+                        if excess <= 0:
+                            waits.append(timestamp + WINDOW_SECONDS - now)
+                            break
+
+            if waits:
+                return None, max(0.05, max(waits))
+
+            entry = [now, tokens]
+            self.window.append(entry)
+            self.requests += 1
+            return entry, 0.0
+
+    async def acquire(self, tokens: int = 0) -> list:
+        """Wait (without blocking the event loop) until the request fits the budgets."""
+        waited = 0.0
+        while True:
+            entry, delay = self._reserve(tokens)
+            if entry is not None:
+                if waited:
+                    with self.lock:
+                        self.total_wait_seconds += waited
+                    print(f"⏳ {self.name} quota: waited {waited:.1f}s")
+                return entry
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def record_usage(self, entry: list, tokens: Optional[int]):
+        """Replace a reservation's estimated tokens with the reported usage."""
+        if tokens is None:
+            return
+        with self.lock:
+            entry[1] = tokens
+
+    def record_success(self):
+        """Additively recover the request rate after a 429 slowdown."""
+        with self.lock:
+            if self.effective_rpm < self.rpm:
+                self.effective_rpm = min(float(self.rpm), self.effective_rpm + 0.5)
+
+    def record_rate_limited(self, retry_after: Optional[float], attempt: int) -> float:
+        """Pause all callers and halve the request rate. Returns the pause in seconds."""
+        delay = retry_after if retry_after is not None else self.backoff_delay(attempt)
+        with self.lock:
+            self.rate_limited += 1
+            self.effective_rpm = max(1.0, self.effective_rpm / 2)
+            self.cooldown_until = max(self.cooldown_until, time.monotonic() + delay)
+        return delay
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def call(self, make_call, tokens: int = 0, usage_tokens=None):
+        """
+        Run make_call() (a coroutine factory) within the budgets, retrying
+        rate-limit and transient errors with jittered exponential backoff.
+
+        Args:
+            make_call: Zero-argument function returning a new coroutine per attempt
+            tokens: Estimated tokens for the request
+            usage_tokens: Optional function(result) -> actual token count
+
+        Raises:
+            The last error once retries are exhausted or for non-retryable errors
+        """
+        for attempt in range(self.max_retries + 1):
+            entry = await self.acquire(tokens)
+            try:
+                result = await make_call()
+            except Exception as e:
+                if not is_retryable(e) or attempt == self.max_retries:
+                    with self.lock:
+                        self.failures += 1
+                    raise
+
+                await self.before_retry(e, attempt)
+                continue
+
+            self.record_success()
+            if usage_tokens:
+                self.record_usage(entry, usage_tokens(result))
+            return result
+
+    async def before_retry(self, error: Exception, attempt: int):
+        """Account for a failed attempt and sleep before the next one."""
+        with self.lock:
+            self.retries += 1
+
+        if error_status(error) == 429:
+            delay = self.record_rate_limited(retry_after_seconds(error), attempt)
+            print(f"⚠ {self.name} rate limited (429), retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+            # acquire() waits out the cooldown
+            return
+
+        delay = retry_after_seconds(error) or self.backoff_delay(attempt)
+        print(f"⚠ {self.name} error ({error}), retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+        await asyncio.sleep(delay)
+
+    def status(self) -> dict:
+        """Current budget usage and retry counters."""
+        with self.lock:
+            now = time.monotonic()
+            self._prune(now)
+            return {
+                "name": self.name,
+                "rpm_limit": self.rpm,
+                "effective_rpm": round(self.effective_rpm, 1),
+                "tpm_limit": self.tpm or None,
+                "requests_last_minute": len(self.window),
+                "tokens_last_minute": sum(entry[1] for entry in self.window),
+                "cooldown_seconds": round(max(0.0, self.cooldown_until - now), 1),
+                "requests": self.requests,
+                "rate_limited": self.rate_limited,
+                "retries": self.retries,
+                "failures": self.failures,
+                "total_wait_seconds": round(self.total_wait_seconds, 1)
+            }
+
+
+_gemini_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_gemini_scheduler() -> QuotaScheduler:
+    """Process-wide Gemini scheduler, shared by all LLMClient instances."""
+    global _gemini_scheduler
+    with _scheduler_lock:
+        if _gemini_scheduler is None:
+            _gemini_scheduler = QuotaScheduler(
+                "Gemini",
+                rpm=settings.gemini_rpm,
+                tpm=settings.gemini_tpm,
+                max_retries=settings.llm_max_retries,
+                backoff_base=settings.llm_backoff_base_seconds,
+                backoff_max=settings.llm_backoff_max_seconds
+            )
+    return _gemini_scheduler
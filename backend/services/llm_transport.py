@@ -0,0 +1,267 @@
+"""
+Pooled async HTTP transport for OpenAI-compatible chat-completions endpoints.
+
+A single httpx.AsyncClient (keep-alive connection pool) lives on a dedicated
+event loop thread. Async callers on any event loop and sync callers (scripts,
+worker threads, sync endpoints) all submit work to that loop, so every caller
+shares the same keep-alive connections.
+"""
+import asyncio
+import contextvars
+import json
+import threading
+from concurrent.futures import Future
+from typing import AsyncIterator, Optional
+import httpx
+
+from backend.config import settings
+
+
+class LLMTransportError(Exception):
+    """Base error for LLM transport failures."""
+
+
+class LLMConnectionError(LLMTransportError):
+    """The LLM server could not be reached."""
+
+
+class LLMTimeoutError(LLMTransportError):
+    """The LLM server did not answer in time."""
+
+
+class LLMStatusError(LLMTransportError):
+    """The LLM server answered with a non-200 status."""
+
+    def __init__(self, status_code: int, body: str, headers: Optional[dict] = None):
+        super().__init__(f"status {status_code}: {body}")
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+
+class LLMTransport:
+    """Connection-pooled async HTTP client running on its own event loop thread."""
+
+    def __init__(self, max_connections: int = 20, max_keepalive_connections: int = 10, keepalive_expiry: float = 30.0):
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self._client = None
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the transport event loop thread on first use."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    ready.set()
+                    loop.run_forever()
+
+                threading.Thread(target=run, name="llm-transport", daemon=True).start()
+                ready.wait()
+                self._loop = loop
+        return self._loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Only called on the transport loop, so the pool is bound to that loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(limits=self._limits)
+        return self._client
+
+    def submit(self, coro) -> Future:
+        """
+        Schedule a coroutine on the transport loop and return a concurrent Future.
+        The caller's context variables (e.g. the LLM ledger context) carry over.
+        """
+        return asyncio.run_coroutine_threadsafe(_in_context(coro, contextvars.copy_context()), self._ensure_loop())
+
+    async def run(self, coro):
+        """Await a coroutine on the transport loop from any event loop."""
+        loop = self._ensure_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is loop:
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def run_sync(self, coro):
+        """Run a coroutine on the transport loop and block until it finishes."""
+        return self.submit(coro).result()
+
+    async def iterate(self, agen) -> AsyncIterator:
+        """
+        Consume an async generator on the transport loop from any event loop.
+        Items are relayed through a queue on the caller's loop; if the caller
+        stops early (e.g. client disconnect) the upstream generator is cancelled.
+        """
+        loop = self._ensure_loop()
+        caller = asyncio.get_running_loop()
+
+        if caller is loop:
+            async for item in agen:
+                yield item
+            return
+
+        queue = asyncio.Queue()
+        done = object()
+
+        def relay(item, error=None):
+            try:
+                caller.call_soon_threadsafe(queue.put_nowait, (item, error))
+            except RuntimeError:
+                pass  # Caller loop already closed
+
+        async def pump():
+            try:
+                async for item in agen:
+                    relay(item)
+            except BaseException as e:
+                relay(done, e)
+                raise
+            relay(done)
+
+        future = self.submit(pump())
+        try:
+            while True:
+                item, error = await queue.get()
+                if item is done:
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            future.cancel()
+
+    async def post_json(self, url: str, payload: dict, timeout: float) -> dict:
+        """
+        POST a JSON payload and return the decoded JSON response.
+        Must run on the transport loop (use run/run_sync from elsewhere).
+
+        Raises:
+            LLMConnectionError, LLMTimeoutError, LLMStatusError, LLMTransportError
+        """
+        client = self._get_client()
+        try:
+            response = await client.post(url, json=payload, timeout=timeout)
+        except httpx.ConnectError as e:
+            raise LLMConnectionError(str(e)) from e
+        except httpx.TimeoutException as e:
+            raise LLMTimeoutError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise LLMTransportError(str(e)) from e
+
+        if response.status_code != 200:
+            raise LLMStatusError(response.status_code, response.text, dict(response.headers))
+
+        return response.json()
+
+    async def get_json(self, url: str, timeout: float) -> dict:
+        """
+        GET a URL and return the decoded JSON response.
+        Must run on the transport loop (use run/run_sync from elsewhere).
+
+        Raises:
+            LLMConnectionError, LLMTimeoutError, LLMStatusError, LLMTransportError
+        """
+        client = self._get_client()
+        try:
+            response = await client.get(url, timeout=timeout)
+        except httpx.ConnectError as e:
+            raise LLMConnectionError(str(e)) from e
+        except httpx.TimeoutException as e:
+            raise LLMTimeoutError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise LLMTransportError(str(e)) from e
+
+        if response.status_code != 200:
+            raise LLMStatusError(response.status_code, response.text, dict(response.headers))
+
+        return response.json()
+
+    async def stream_chat(self, url: str, payload: dict, timeout: float) -> AsyncIterator[str]:
+        """
+        POST a streaming chat-completions request and yield content deltas
+        from the server-sent events as they arrive.
+        Must run on the transport loop (use iterate from elsewhere).
+
+        Raises:
+            LLMConnectionError, LLMTimeoutError, LLMStatusError, LLMTransportError
+        """
+        client = self._get_client()
+        try:
+            async with client.stream("POST", url, json={**payload, "stream": True}, timeout=timeout) as response:
+                if response.status_code != 200:
+                    body = (await response.aread()).decode(errors="replace")
+                    raise LLMStatusError(response.status_code, body, dict(response.headers))
+
+                async for line in response.aiter_lines():
+                    line = line.strip()
+                    if not line.startswith("data:"):
+                        continue
+
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+
+                    try:
+                        event = json.loads(data)
+                    except ValueError:
+                        continue
+
+                    delta = (event.get("choices") or [{}])[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+        except httpx.ConnectError as e:
+            raise LLMConnectionError(str(e)) from e
+        except httpx.TimeoutException as e:
+            raise LLMTimeoutError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise LLMTransportError(str(e)) from e
+
+    def close(self):
+        """Close pooled connections and stop the transport loop."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+
+        async def _shutdown():
+            if self._client is not None:
+                await self._client.aclose()
+                self._client = None
+
+        asyncio.run_coroutine_threadsafe(_shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+async def _in_context(coro, context: contextvars.Context):
+    """Await coro with the variables of another thread's context set in this task."""
+    for var, value in context.items():
+        var.set(value)
+    return await coro
+
+
+def get_transport() -> LLMTransport:
+    """Process-wide shared transport, so all LLMClient instances share one connection pool."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = LLMTransport(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_keepalive_connections
+            )
+    return _transport
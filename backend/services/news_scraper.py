@@ -66,6 +66,7 @@ class NewsScraper:
                     continue
                 
                 count = 0
+                new_articles = []
                 
                 with ThreadPoolExecutor(max_workers=3) as executor:
                     future_to_url = {
@@ -133,6 +134,7 @@ class NewsScraper:
                                 
                                 db.add(article)
                                 db.commit()
+                                new_articles.append(article)
                                 articles_added += 1
                                 count += 1
                                 yield {"status": "success", "message": f"Saved: {article_data['title'][:50]}..."}
@@ -144,6 +146,10 @@ class NewsScraper:
                             yield {"status": "skipped", "message": f"Skipped: Error {str(e)[:20]}..."}
                             continue
                 
+                if new_articles and settings.article_sentiment_enabled:
+                    scored = self._score_articles(db, new_articles)
+                    yield {"status": "info", "message": f"Scored sentiment for {scored} {topic} articles"}
+                
                 yield {"status": "info", "message": f"Completed {topic}: Added {count} articles"}
             
             except Exception as e:
@@ -153,6 +159,22 @@ class NewsScraper:
         
         yield {"status": "complete", "articles_added": articles_added}
 
+    def _score_articles(self, db: Session, articles: List[Article]) -> int:
+        """Score newly saved articles in one batch and store the scores on their rows."""
+        try:
+            # Imported lazily so scraping-only scripts don't load torch
+            from backend.services.sentiment_analyzer import analyze_sentiment_batch, article_sentiment_text
+            
+            scores = analyze_sentiment_batch([article_sentiment_text(a) for a in articles])
+            for article, score in zip(articles, scores):
+                article.sentiment_score = score
+            db.commit()
+            return len(articles)
+        except Exception as e:
+            db.rollback()
+            print(f"⚠ Article sentiment scoring failed: {e}")
+            return 0
+
     def _search_news(self, query: str, max_results: int = 10) -> List[str]:
         """
         Search for news articles using multiple sources.
@@ -0,0 +1,350 @@
+"""
+Incremental, dependency-aware pipeline from scraped articles to the static site.
+
+Build state is tracked per stage and (country, month) partition in the
+pipeline_state table. The stages form a DAG:
+
+    articles --> summary --> sentiment --> aggregates
+        |           |            |
+        |           v            v
+        +-------> export     export_world
+
+A run first compares a cheap fingerprint of each partition's articles with
+the one seen by the previous run and marks the dependents of changed
+partitions dirty. Stages then run in order over their dirty partitions
+only. Each stage records a fingerprint of what it produced, and only when
+that changes are its dependents marked dirty: a summary kept because its
+inputs are unchanged, or a sentiment score that didn't move, stops the
+propagation there. Failed partitions are retried on the next run and
+invalidate nothing downstream.
+"""
+import hashlib
+import os
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.models import Article, DailySummary, PipelineState, SentimentSeries
+from backend.services.summary_runner import run_summary_jobs, GENERATED, UNCHANGED
+from backend.services.sentiment_analyzer import analyze_sentiment_batch
+from backend.services.sentiment_trends import refresh_country_series
+from backend.services.static_export import export_assets, export_country, export_month, export_world
+
+# Partition states
+DIRTY = "dirty"
+CLEAN = "clean"
+FAILED = "failed"
+
+# The source node: fingerprints of the scraped articles, refreshed by detect_changes
+SOURCE = "articles"
+
+Partition = Tuple[str, date]  # (country, month)
+
+
+class Stage:
+    """A pipeline stage: the function building it and the stages it depends on."""
+
+    def __init__(self, name: str, func: Callable, after: Tuple[str, ...], description: str = ""):
+        self.name = name
+        self.func = func
+        self.after = after
+        self.description = description
+
+
+# Registration order is a topological order (dependencies must exist first)
+_stages: Dict[str, Stage] = {}
+
+
+def stage(name: str, after: Tuple[str, ...]):
+    """
+    Decorator registering func(db, partitions) as a stage.
+
+    The function builds the given dirty partitions and returns a dict mapping
+    each partition to the fingerprint of its output, or to an exception if
+    that partition failed. Raising fails the whole batch.
+    """
+    def decorator(func):
+        for dependency in after:
+            if dependency != SOURCE and dependency not in _stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dependency}'")
+        _stages[name] = Stage(name, func, after, (func.__doc__ or "").strip().split("\n")[0])
+        return func
+    return decorator
+
+
+def stage_names() -> List[str]:
+    return list(_stages)
+
+
+def get_stages() -> List[Stage]:
+    """Registered stages in build order."""
+    return list(_stages.values())
+
+
+def dependents(name: str) -> List[str]:
+    """Stages that directly depend on a stage (or on the article source)."""
+    return [stage.name for stage in _stages.values() if name in stage.after]
+
+
+def _fingerprint(*parts) -> str:
+    return hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+def _states(db: Session, stage_name: str, partitions: Iterable[Partition]) -> Dict[Partition, PipelineState]:
+    """Existing state rows of a stage for the given partitions."""
+    partitions = set(partitions)
+    if not partitions:
+        return {}
+    countries = {country for country, _ in partitions}
+    rows = db.query(PipelineState).filter(
+        PipelineState.stage == stage_name,
+        PipelineState.country.in_(countries)
+    ).all()
+    return {(row.country, row.month): row for row in rows if (row.country, row.month) in partitions}
+
+
+def mark_dirty(db: Session, stage_names: Iterable[str], partitions: Iterable[Partition]) -> int:
+    """Mark partitions of the given stages for rebuild (without committing). Returns rows marked."""
+    partitions = set(partitions)
+    now = datetime.utcnow()
+    marked = 0
+    for stage_name in stage_names:
+        existing = _states(db, stage_name, partitions)
+        for partition in partitions:
+            row = existing.get(partition)
+            if row is None:
+                db.add(PipelineState(stage=stage_name, country=partition[0], month=partition[1],
+                                     status=DIRTY, dirtied_at=now))
+                marked += 1
+            elif row.status != DIRTY:
+                row.status = DIRTY
+                row.dirtied_at = now
+                marked += 1
+    return marked
+
+
+def _filter_partitions(query, country_column, date_column, countries: Optional[List[str]], months: Optional[List[date]]):
+    if countries:
+        query = query.filter(country_column.in_(countries))
+    if months:
+        query = query.filter(date_column.in_(months))
+    return query
+
+
+def detect_changes(db: Session, countries: Optional[List[str]] = None, months: Optional[List[date]] = None) -> List[Partition]:
+    """
+    Compare each partition's articles with the previous run and mark the
+    dependents of changed (or new) partitions dirty. Returns the changed partitions.
+    """
+    query = db.query(
+        Article.country,
+        Article.published_date,
+        func.count(Article.id),
+        func.min(Article.id),
+        func.max(Article.id),
+        func.max(Article.scraped_at)
+    ).group_by(Article.country, Article.published_date)
+    rows = _filter_partitions(query, Article.country, Article.published_date, countries, months).all()
+
+    current = {(country, month): _fingerprint(count, min_id, max_id, scraped_at)
+               for country, month, count, min_id, max_id, scraped_at in rows}
+    seen = _states(db, SOURCE, current)
+
+    changed = []
+    now = datetime.utcnow()
+    for partition, fingerprint in current.items():
+        row = seen.get(partition)
+        if row is not None and row.fingerprint == fingerprint:
+            continue
+        if row is None:
+            row = PipelineState(stage=SOURCE, country=partition[0], month=partition[1])
+            db.add(row)
+        row.status, row.fingerprint, row.built_at, row.error = CLEAN, fingerprint, now, None
+        changed.append(partition)
+
+    mark_dirty(db, dependents(SOURCE), changed)
+    db.commit()
+    return changed
+
+
+def invalidate(db: Session, stage_name: str, countries: Optional[List[str]] = None,
+               months: Optional[List[date]] = None) -> int:
+    """Force a rebuild of a stage (and, through fingerprints, whatever it changes) for all known partitions."""
+    query = db.query(Article.country, Article.published_date).distinct()
+    partitions = [tuple(row) for row in _filter_partitions(query, Article.country, Article.published_date, countries, months).all()]
+    marked = mark_dirty(db, [stage_name], partitions)
+    db.commit()
+    return marked
+
+
+def dirty_partitions(db: Session, stage_name: str, countries: Optional[List[str]] = None,
+                     months: Optional[List[date]] = None) -> List[Partition]:
+    """Partitions of a stage waiting to be built (dirty, or failed last time)."""
+    query = db.query(PipelineState.country, PipelineState.month).filter(
+        PipelineState.stage == stage_name,
+        PipelineState.status.in_((DIRTY, FAILED))
+    )
+    query = _filter_partitions(query, PipelineState.country, PipelineState.month, countries, months)
+    return [tuple(row) for row in query.order_by(PipelineState.country, PipelineState.month).all()]
+
+
+def _run_stage(db: Session, stage: Stage, partitions: List[Partition]) -> dict:
+    try:
+        results = stage.func(db, partitions)
+    except Exception as e:
+        db.rollback()
+        results = {partition: e for partition in partitions}
+
+    states = _states(db, stage.name, partitions)
+    now = datetime.utcnow()
+    built, changed, failed = [], [], []
+    for partition in partitions:
+        row = states[partition]
+        result = results.get(partition, RuntimeError("stage returned no result"))
+        if isinstance(result, Exception):
+            row.status, row.error = FAILED, f"{type(result).__name__}: {result}"
+            failed.append(partition)
+            continue
+        if row.fingerprint != result:
+            changed.append(partition)
+        row.status, row.fingerprint, row.error, row.built_at = CLEAN, result, None, now
+        built.append(partition)
+
+    mark_dirty(db, dependents(stage.name), changed)
+    db.commit()
+    return {"built": len(built), "changed": len(changed), "failed": len(failed)}
+
+
+def run_pipeline(db: Session, stages: Optional[List[str]] = None, countries: Optional[List[str]] = None,
+                 months: Optional[List[date]] = None, dry_run: bool = False) -> dict:
+    """
+    Detect new articles and build every dirty partition, stage by stage.
+
+    Args:
+        stages: Only run these stages; the others keep their dirty partitions for a later run
+        countries, months: Restrict the run to these partitions
+        dry_run: Only report the partitions each stage would build (new articles are still recorded)
+
+    Returns:
+        Per-stage counts of built, changed and failed partitions (or pending ones with dry_run)
+    """
+    changed = detect_changes(db, countries, months)
+    if changed:
+        print(f"🔁 New or changed articles in {len(changed)} partitions")
+
+    report = {SOURCE: {"changed": len(changed)}}
+    for name, stage in _stages.items():
+        if stages and name not in stages:
+            continue
+        partitions = dirty_partitions(db, name, countries, months)
+        if dry_run:
+            report[name] = {"pending": len(partitions)}
+            continue
+        if not partitions:
+            report[name] = {"built": 0, "changed": 0, "failed": 0}
+            continue
+
+        print(f"▶️  {name}: {len(partitions)} partitions")
+        report[name] = _run_stage(db, stage, partitions)
+        print(f"✓ {name}: {report[name]['built']} built, {report[name]['changed']} changed, "
+              f"{report[name]['failed']} failed")
+    return report
+
+
+def pipeline_status(db: Session) -> Dict[str, Dict[str, int]]:
+    """Partition counts per stage and state."""
+    rows = db.query(PipelineState.stage, PipelineState.status, func.count(PipelineState.id)).group_by(
+        PipelineState.stage, PipelineState.status
+    ).all()
+    status = {name: {DIRTY: 0, CLEAN: 0, FAILED: 0} for name in [SOURCE] + stage_names()}
+    for stage_name, state, count in rows:
+        status.setdefault(stage_name, {DIRTY: 0, CLEAN: 0, FAILED: 0})[state] = count
+    return status
+
+
+def _group_by_country(partitions: List[Partition]) -> Dict[str, List[date]]:
+    grouped = {}
+    for country, month in partitions:
+        grouped.setdefault(country, []).append(month)
+    return grouped
+
+
+# Stages
+
+@stage("summary", after=(SOURCE,))
+def summary_stage(db: Session, partitions: List[Partition]) -> dict:
+    """Generate (or update) the summary of each partition."""
+    # Forced, so existing summaries are updated; unchanged inputs still skip the LLM
+    jobs = [(country, month) for country, month in partitions]
+    results = {}
+    for country, month, outcome, detail in run_summary_jobs(jobs, force=True):
+        if outcome not in (GENERATED, UNCHANGED):
+            results[(country, month)] = RuntimeError(detail or outcome)
+            continue
+        summary = db.query(DailySummary).filter(DailySummary.country == country, DailySummary.date == month).first()
+        results[(country, month)] = _fingerprint(summary.id, summary.generated_at) if summary else "none"
+    return results
+
+
+@stage("sentiment", after=("summary",))
+def sentiment_stage(db: Session, partitions: List[Partition]) -> dict:
+    """Score the sentiment of each partition's summary."""
+    summaries = {}
+    for country, month in partitions:
+        summaries[(country, month)] = db.query(DailySummary).filter(
+            DailySummary.country == country, DailySummary.date == month
+        ).first()
+
+    to_score = [(partition, summary) for partition, summary in summaries.items() if summary and summary.summary_text]
+    scores = analyze_sentiment_batch([summary.summary_text for _, summary in to_score]) if to_score else []
+    for (_, summary), score in zip(to_score, scores):
+        summary.sentiment_score = score
+    db.commit()
+
+    return {
+        partition: f"{summary.sentiment_score:.4f}" if summary and summary.sentiment_score is not None else "none"
+        for partition, summary in summaries.items()
+    }
+
+
+@stage("aggregates", after=("sentiment",))
+def aggregates_stage(db: Session, partitions: List[Partition]) -> dict:
+    """Refresh the sentiment series and momentum of each affected country."""
+    results = {}
+    for country, months in _group_by_country(partitions).items():
+        refresh_country_series(db, country)
+        series = {row.date: row for row in db.query(SentimentSeries).filter(SentimentSeries.country == country).all()}
+        for month in months:
+            row = series.get(month.replace(day=1))
+            results[(country, month)] = _fingerprint(row.score, row.rolling_mean, row.delta) if row else "none"
+    return results
+
+
+def _ensure_static_assets():
+    if not os.path.exists(os.path.join(settings.static_output_dir, "index.html")):
+        export_assets()
+
+
+@stage("export", after=(SOURCE, "summary", "sentiment"))
+def export_stage(db: Session, partitions: List[Partition]) -> dict:
+    """Rewrite the static summary/article files of each partition and its country file."""
+    _ensure_static_assets()
+    results = {}
+    for country, months in _group_by_country(partitions).items():
+        export_country(country)
+        for month in months:
+            ok = export_month(country, month.isoformat())
+            results[(country, month)] = _fingerprint(datetime.utcnow()) if ok else RuntimeError("API snapshot failed")
+    return results
+
+
+@stage("export_world", after=("sentiment",))
+def export_world_stage(db: Session, partitions: List[Partition]) -> dict:
+    """Rewrite the world sentiment map file (once, whatever the number of partitions)."""
+    _ensure_static_assets()
+    if not export_world():
+        raise RuntimeError("API snapshot failed")
+    fingerprint = _fingerprint(datetime.utcnow())
+    return {partition: fingerprint for partition in partitions}
@@ -0,0 +1,167 @@
+"""
+Token-budgeted article formatting for summary prompts.
+
+Articles are deduplicated and ranked within each category, then taken
+round-robin across categories (best first) until the prompt token budget
+is reached, so every topic stays represented however many articles a
+country has. URLs are dropped: they cost many tokens and the LLM never
+needs them.
+"""
+import re
+from typing import Dict, List, Tuple
+
+from backend.config import settings
+from backend.services.llm_quota import estimate_tokens
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Titles sharing at least this fraction of words are treated as the same story
+DUPLICATE_SIMILARITY = 0.8
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens, at a paragraph or sentence boundary where possible."""
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    boundary = max(cut.rfind("\n\n"), cut.rfind(". "))
+    if boundary > max_chars // 2:
+        cut = cut[:boundary + 1]
+    return cut.rstrip() + " …"
+
+
+def _title_words(article) -> frozenset:
+    title = article.title or ""
+    # Google News titles end with " - <Source>"
+    if article.source and title.endswith(f" - {article.source}"):
+        title = title[:-len(article.source) - 3]
+    return frozenset(_WORD_RE.findall(title.lower()))
+
+
+def _is_duplicate(words: frozenset, seen: List[frozenset]) -> bool:
+    for other in seen:
+        union = len(words | other)
+        if union and len(words & other) / union >= DUPLICATE_SIMILARITY:
+            return True
+    return False
+
+
+def _rank_key(article) -> tuple:
+    """Articles with a description, a strong sentiment signal and a recent scrape come first."""
+    return (
+        bool(article.description),
+        abs(article.sentiment_score or 0.0),
+        article.scraped_at.timestamp() if article.scraped_at else 0.0
+    )
+
+
+def group_articles(articles: list) -> Dict[str, list]:
+    """Group articles by category, deduplicated and ranked best first."""
+    grouped = {}
+    for article in articles:
+        grouped.setdefault(article.category or "General", []).append(article)
+
+    ranked = {}
+    for category, cat_articles in grouped.items():
+        kept, seen = [], []
+        for article in sorted(cat_articles, key=_rank_key, reverse=True):
+            words = _title_words(article)
+            if words and _is_duplicate(words, seen):
+                continue
+            seen.append(words)
+            kept.append(article)
+        ranked[category] = kept
+
+    return ranked
+
+
+def _format_article(index: int, article, description_chars: int) -> str:
+    line = f"{index}. **{article.title}**"
+    if article.source:
+        line += f" ({article.source})"
+    description = (article.description or "").strip()
+    if description:
+        if len(description) > description_chars:
+            description = description[:description_chars].rsplit(" ", 1)[0] + "…"
+        line += f"\n   {description}"
+    return line
+
+
+def select_articles(grouped: Dict[str, list], token_budget: int, description_chars: int) -> Dict[str, List[str]]:
+    """
+    Take articles round-robin across categories until the budget is used.
+
+    Returns:
+        Dict mapping category to its formatted article lines, in category order
+    """
+    selected = {category: [] for category in grouped}
+    used = sum(estimate_tokens(f"\n## {category}\n") for category in grouped)
+    depth = 0
+    full = False
+
+    while not full and any(depth < len(cat_articles) for cat_articles in grouped.values()):
+        for category, cat_articles in grouped.items():
+            if depth >= len(cat_articles):
+                continue
+            line = _format_article(depth + 1, cat_articles[depth], description_chars)
+            cost = estimate_tokens(line)
+            if token_budget and used + cost > token_budget:
+                full = True
+                break
+            selected[category].append(line)
+            used += cost
+        depth += 1
+
+    return selected
+
+
+def build_articles_prompt(articles: list, token_budget: int = None, description_chars: int = None) -> Tuple[str, int]:
+    """
+    Format articles for a summary prompt within a token budget.
+
+    Args:
+        articles: Article rows
+        token_budget: Maximum estimated tokens for the articles section (0 = unlimited)
+        description_chars: Maximum characters kept from each description
+
+    Returns:
+        (formatted_text, number_of_articles_included)
+    """
+    token_budget = settings.summary_prompt_token_budget if token_budget is None else token_budget
+    description_chars = settings.summary_description_chars if description_chars is None else description_chars
+
+    selected = select_articles(group_articles(articles), token_budget, description_chars)
+
+    formatted = []
+    included = 0
+    for category, lines in selected.items():
+        if not lines:
+            continue
+        formatted.append(f"\n## {category}\n")
+        formatted.extend(lines)
+        included += len(lines)
+
+    return "\n".join(formatted), included
+
+
+def build_category_prompts(articles: list, token_budget: int = None, description_chars: int = None) -> Tuple[Dict[str, str], int]:
+    """
+    Format articles per category for map-reduce summarization, each
+    category within its own token budget.
+
+    Returns:
+        (dict mapping category to formatted_text, number_of_articles_included)
+    """
+    token_budget = settings.summary_prompt_token_budget if token_budget is None else token_budget
+    description_chars = settings.summary_description_chars if description_chars is None else description_chars
+
+    category_data = {}
+    included = 0
+    for category, cat_articles in group_articles(articles).items():
+        lines = select_articles({category: cat_articles}, token_budget, description_chars)[category]
+        if lines:
+            category_data[category] = "\n".join(lines)
+            included += len(lines)
+
+    return category_data, included
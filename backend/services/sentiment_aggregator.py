@@ -0,0 +1,134 @@
+"""
+Country sentiment aggregated from per-article sentiment scores.
+Scores are combined per (country, month) as weighted averages computed with NumPy.
+"""
+from datetime import date, datetime
+from typing import Dict, Optional
+import numpy as np
+from sqlalchemy import extract, func
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.models import Article
+
+# Supported weighting schemes
+#   uniform:  every article counts the same
+#   recency:  exponential decay by article age (SENTIMENT_RECENCY_HALF_LIFE_DAYS)
+#   source:   each source gets equal total weight, so one prolific outlet can't dominate
+#   category: each economic topic gets equal total weight
+WEIGHTINGS = ("uniform", "recency", "source", "category")
+
+
+def _inverse_frequency(partition_idx: np.ndarray, labels: list) -> np.ndarray:
+    """Weight 1/n for each row, where n is the size of its (partition, label) group."""
+    pair_keys = np.array([f"{p}|{label or ''}" for p, label in zip(partition_idx, labels)], dtype=object)
+    _, inverse, counts = np.unique(pair_keys, return_inverse=True, return_counts=True)
+    return 1.0 / counts[inverse]
+
+
+def _recency_weights(scraped_at: list, published: list) -> np.ndarray:
+    """Exponential decay weights by article age in days."""
+    now = datetime.utcnow()
+    ages = np.array([
+        (now - (s or datetime.combine(p, datetime.min.time()))).total_seconds() / 86400.0
+        for s, p in zip(scraped_at, published)
+    ])
+    half_life = max(settings.sentiment_recency_half_life_days, 1e-6)
+    return np.exp2(-np.clip(ages, 0, None) / half_life)
+
+
+def _compute_weights(weighting: str, partition_idx: np.ndarray, scraped_at: list,
+                     published: list, sources: list, categories: list) -> np.ndarray:
+    if weighting == "recency":
+        return _recency_weights(scraped_at, published)
+    if weighting == "source":
+        return _inverse_frequency(partition_idx, sources)
+    if weighting == "category":
+        return _inverse_frequency(partition_idx, categories)
+    return np.ones(len(partition_idx))
+
+
+def aggregate_article_sentiments(
+    db: Session,
+    weighting: str = "recency",
+    month: Optional[date] = None,
+    country: Optional[str] = None
+) -> Dict[str, dict]:
+    """
+    Aggregate scored articles into one sentiment score per country.
+
+    Args:
+        db: Database session
+        weighting: One of WEIGHTINGS
+        month: Month to aggregate (defaults to each country's latest month with scored articles)
+        country: Restrict to a single country
+
+    Returns:
+        Dict mapping country to {"score", "article_count", "date"}
+    """
+    if weighting not in WEIGHTINGS:
+        raise ValueError(f"Unknown weighting '{weighting}'. Use one of: {', '.join(WEIGHTINGS)}")
+
+    query = db.query(
+        Article.country,
+        Article.published_date,
+        Article.scraped_at,
+        Article.source,
+        Article.category,
+        Article.sentiment_score
+    ).filter(Article.sentiment_score.isnot(None))
+
+    if month:
+        query = query.filter(
+            extract('year', Article.published_date) == month.year,
+            extract('month', Article.published_date) == month.month
+        )
+    else:
+        # Only load each country's latest month, rather than every scored article ever stored
+        latest = db.query(
+            Article.country.label('country'),
+            func.max(Article.published_date).label('max_date')
+        ).filter(Article.sentiment_score.isnot(None))
+        if country:
+            latest = latest.filter(Article.country == country)
+        latest = latest.group_by(Article.country).subquery()
+
+        query = query.join(latest, Article.country == latest.c.country).filter(
+            extract('year', Article.published_date) == extract('year', latest.c.max_date),
+            extract('month', Article.published_date) == extract('month', latest.c.max_date)
+        )
+    if country:
+        query = query.filter(Article.country == country)
+
+    rows = query.all()
+    if not rows:
+        return {}
+
+    countries, published, scraped_at, sources, categories, scores = zip(*rows)
+    scores = np.asarray(scores, dtype=float)
+
+    # One partition per (country, month)
+    partition_labels = np.array(
+        [f"{d.replace(day=1).isoformat()}|{c}" for c, d in zip(countries, published)],
+        dtype=object
+    )
+    partition_keys, partition_idx = np.unique(partition_labels, return_inverse=True)
+
+    weights = _compute_weights(weighting, partition_idx, scraped_at, published, sources, categories)
+
+    weighted_sum = np.bincount(partition_idx, weights=weights * scores)
+    weight_total = np.bincount(partition_idx, weights=weights)
+    article_counts = np.bincount(partition_idx)
+    partition_scores = weighted_sum / np.where(weight_total > 0, weight_total, 1.0)
+
+    # Keys sort by month first, so later months overwrite earlier ones
+    result = {}
+    for key, score, count in zip(partition_keys, partition_scores, article_counts):
+        month_str, country_name = key.split("|", 1)
+        result[country_name] = {
+            "score": round(float(score), 3),
+            "article_count": int(count),
+            "date": month_str
+        }
+
+    return result
@@ -5,38 +5,150 @@ Uses nlptown/bert-base-multilingual-uncased-sentiment for 1-5 star ratings.
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import torch
 from typing import Optional
+from datetime import datetime
 import logging
+import os
+import threading
+import time
+
+from backend.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Use FinBERT which is better for financial/economic text
+MODEL_NAME = "yiyanghkust/finbert-tone"
+
 # Global model instance (lazy loaded)
 _tokenizer = None
 _model = None
 _device = None
+_model_lock = threading.Lock()
+_warmup_thread = None
+
+# Load/readiness state reported by /api/health
+_model_status = {
+    "state": "not_loaded",  # not_loaded, loading, ready, failed
+    "source": None,  # "local-cache" or "hub"
+    "load_seconds": None,
+    "warmup_inference_seconds": None,
+    "first_request_seconds": None,
+    "loaded_at": None,
+    "error": None,
+}
+
+
+def _local_model_path() -> Optional[str]:
+    """Directory holding the locally cached safetensors copy of the model."""
+    if not settings.sentiment_model_cache_dir:
+        return None
+    return os.path.join(settings.sentiment_model_cache_dir, MODEL_NAME.replace("/", "--"))
+
+
+def _load_model():
+    """
+    Load tokenizer and model, preferring the local safetensors cache.
+    
+    safetensors weights are memory-mapped by transformers, so loading from the
+    local cache avoids both the hub round-trip and a full read + unpickle of the
+    weights file.
+    """
+    local_path = _local_model_path()
+    
+    if local_path and os.path.exists(os.path.join(local_path, "model.safetensors")):
+        tokenizer = AutoTokenizer.from_pretrained(local_path)
+        model = AutoModelForSequenceClassification.from_pretrained(local_path, use_safetensors=True)
+        source = "local-cache"
+    else:
+        tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+        model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
+        source = "hub"
+        
+        # Persist a safetensors copy so later starts load from local disk
+        if local_path:
+            try:
+                os.makedirs(local_path, exist_ok=True)
+                tokenizer.save_pretrained(local_path)
+                model.save_pretrained(local_path, safe_serialization=True)
+                logger.info(f"Cached sentiment model at {local_path}")
+            except Exception as e:
+                logger.warning(f"Could not cache sentiment model locally: {e}")
+    
+    return tokenizer, model, source
 
 
 def get_model():
-    """Lazy load the sentiment model."""
+    """Lazy load the sentiment model (thread-safe, loads at most once)."""
     global _tokenizer, _model, _device
     
-    if _model is None:
-        logger.info("Loading sentiment analysis model...")
-        # Use FinBERT which is better for financial/economic text
-        model_name = "yiyanghkust/finbert-tone"
-        
-        _tokenizer = AutoTokenizer.from_pretrained(model_name)
-        _model = AutoModelForSequenceClassification.from_pretrained(model_name)
-        
-        # Use GPU if available
-        _device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        _model = _model.to(_device)
-        _model.eval()
-        
-        logger.info(f"Sentiment model loaded on {_device}")
+    if _model is not None:
+        return _tokenizer, _model, _device
+    
+    with _model_lock:
+        if _model is None:
+            logger.info("Loading sentiment analysis model...")
+            _model_status["state"] = "loading"
+            _model_status["error"] = None
+            start = time.perf_counter()
+            
+            try:
+                tokenizer, model, source = _load_model()
+                
+                # Use GPU if available
+                device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+                model = model.to(device)
+                model.eval()
+            except Exception as e:
+                _model_status["state"] = "failed"
+                _model_status["error"] = str(e)
+                raise
+            
+            _tokenizer, _device = tokenizer, device
+            _model = model
+            
+            _model_status.update({
+                "state": "ready",
+                "source": source,
+                "load_seconds": round(time.perf_counter() - start, 3),
+                "loaded_at": datetime.utcnow().isoformat(),
+            })
+            logger.info(f"Sentiment model loaded on {_device} from {source} in {_model_status['load_seconds']}s")
     
     return _tokenizer, _model, _device
 
 
+def is_model_ready() -> bool:
+    """Whether the sentiment model is loaded and can serve requests without stalling."""
+    return _model is not None
+
+
+def get_model_status() -> dict:
+    """Snapshot of model load state and latency measurements."""
+    return dict(_model_status)
+
+
+def warm_up_model():
+    """Load the model and run one inference so the first real request is fast."""
+    try:
+        get_model()
+        start = time.perf_counter()
+        _analyze_sentiment("Economic growth remained stable this quarter.")
+        _model_status["warmup_inference_seconds"] = round(time.perf_counter() - start, 3)
+        logger.info(f"Sentiment model warm-up complete ({_model_status['warmup_inference_seconds']}s inference)")
+    except Exception as e:
+        logger.error(f"Sentiment model warm-up failed: {e}")
+
+
+def start_background_warmup() -> threading.Thread:
+    """Start model warm-up in a daemon thread (no-op if already started)."""
+    global _warmup_thread
+    
+    if _warmup_thread is None:
+        _warmup_thread = threading.Thread(target=warm_up_model, name="sentiment-warmup", daemon=True)
+        _warmup_thread.start()
+    
+    return _warmup_thread
+
+
 def analyze_sentiment(text: str, max_length: int = 512) -> float:
     """
     Analyze sentiment of text and return normalized score.
@@ -52,109 +164,182 @@ def analyze_sentiment(text: str, max_length: int = 512) -> float:
     if not text or len(text.strip()) == 0:
         return 0.0
     
+    if _model_status["first_request_seconds"] is not None:
+        return _analyze_sentiment(text, max_length)
+    
+    # Measure the first real request (includes model load when warm-up is off)
+    start = time.perf_counter()
+    score = _analyze_sentiment(text, max_length)
+    _model_status["first_request_seconds"] = round(time.perf_counter() - start, 3)
+    logger.info(f"First sentiment request took {_model_status['first_request_seconds']}s")
+    return score
+
+
+def _analyze_sentiment(text: str, max_length: int = 512) -> float:
+    """Score text with the loaded model (see analyze_sentiment)."""
     tokenizer, model, device = get_model()
     
-    # For long texts, chunk and average
-    chunks = chunk_text(text, max_length=400)
+    # Cover the whole document with token windows that fill the model's input
+    window_tokens = max_length - tokenizer.num_special_tokens_to_add(pair=False)
+    windows = _token_windows(tokenizer, text, window_tokens, settings.sentiment_chunk_overlap)
     
-    if not chunks:
+    if not windows:
         return 0.0
     
-    scores = []
+    scores = _score_windows([ids for ids, _ in windows])
+    
+    # Weight each window by its token count so a short trailing window
+    # doesn't count as much as a full one
+    lengths = [len(ids) for ids, _ in windows]
+    avg_score = sum(score * n for score, n in zip(scores, lengths)) / sum(lengths)
+    
+    # Scale is already -1 to 1 naturally
+    return round(avg_score, 3)
+
+
+def analyze_sentiment_batch(texts: list, max_length: int = 512) -> list:
+    """
+    Analyze sentiment of many texts in as few forward passes as possible.
+    
+    Windows from all texts are scored together and mapped back to their text,
+    so scoring 50 short articles costs about one batch rather than 50 calls.
+    
+    Args:
+        texts: Texts to analyze
+        max_length: Maximum token length for BERT
+        
+    Returns:
+        list: Score per text from -1.0 to +1.0 (0.0 for empty texts)
+    """
+    if not texts:
+        return []
+    
+    tokenizer, _, _ = get_model()
+    window_tokens = max_length - tokenizer.num_special_tokens_to_add(pair=False)
+    
+    all_windows = []
+    owners = []
+    for i, text in enumerate(texts):
+        for ids, _ in _token_windows(tokenizer, text or "", window_tokens, settings.sentiment_chunk_overlap):
+            all_windows.append(ids)
+            owners.append(i)
+    
+    if not all_windows:
+        return [0.0] * len(texts)
     
+    window_scores = _score_windows(all_windows)
+    
+    weighted = [0.0] * len(texts)
+    totals = [0] * len(texts)
+    for owner, ids, score in zip(owners, all_windows, window_scores):
+        weighted[owner] += score * len(ids)
+        totals[owner] += len(ids)
+    
+    return [round(w / n, 3) if n else 0.0 for w, n in zip(weighted, totals)]
+
+
+def article_sentiment_text(article) -> str:
+    """Text used to score an article: title followed by its description."""
+    if article.description:
+        return f"{article.title}. {article.description}"
+    return article.title or ""
+
+
+def _label_indices(model) -> tuple:
+    """Return (positive, negative) logit indices from the model config."""
+    # yiyanghkust/finbert-tone: 0=Neutral, 1=Positive, 2=Negative
+    label2id = {label.lower(): idx for label, idx in (model.config.label2id or {}).items()}
+    return label2id.get("positive", 1), label2id.get("negative", 2)
+
+
+def _score_windows(windows: list) -> list:
+    """
+    Score pre-tokenized windows (token ids without special tokens).
+    
+    All windows go through the model together, split only when there are
+    more than SENTIMENT_BATCH_SIZE of them.
+    
+    Returns:
+        list: Score per window, Prob(Positive) - Prob(Negative)
+    """
+    tokenizer, model, device = get_model()
+    positive_idx, negative_idx = _label_indices(model)
+    batch_size = max(1, settings.sentiment_batch_size)
+    
+    scores = []
     with torch.no_grad():
-        for chunk in chunks:
-            # Tokenize
-            inputs = tokenizer(
-                chunk,
-                return_tensors="pt",
-                truncation=True,
-                max_length=max_length,
-                padding=True
-            ).to(device)
+        for start in range(0, len(windows), batch_size):
+            batch = [
+                tokenizer.build_inputs_with_special_tokens(ids)
+                for ids in windows[start:start + batch_size]
+            ]
+            inputs = tokenizer.pad({"input_ids": batch}, padding=True, return_tensors="pt").to(device)
             
-            # Get prediction
             outputs = model(**inputs)
             probabilities = torch.softmax(outputs.logits, dim=1)
             
-            # yiyanghkust/finbert-tone labels: [Neutral, Positive, Negative]
-            # Verify via config or assuming standard 3-class for now, usually:
-            # 0: Neutral, 1: Positive, 2: Negative (Actually check id2label if possible, but standard is usually this)
-            # WAIT: yiyanghkust/finbert-tone mapping is: {0: 'Neutral', 1: 'Positive', 2: 'Negative'}
-            # Let's verify by checking probabilities.
-            
-            # Actually, let's use the explicit indices if we can, but safely we can get them from the model config if we had access here easily.
-            # Standard FinBERT (yiyanghkust): 0=Neutral, 1=Positive, 2=Negative.
-            
-            # Score = Prob(Positive) - Prob(Negative)
-            # This gives range -1 to 1.
-            
-            # Get probabilities
-            probs = probabilities[0].tolist() # [neutral, positive, negative] based on widely used config for this model
-            
-            # However, sometimes models differ. ProsusAI/finbert is [positive, negative, neutral].
-            # yiyanghkust is usually [Neutral, Positive, Negative]. 
-            # Let's inspect model.config.id2label if we were running it, but I'll write code to be safe or rely on known config.
-            
-            # Safest is to rely on label names if we can, or just hardcode for yiyanghkust which is robust.
-            # yiyanghkust/finbert-tone:
-            # 0: Neutral
-            # 1: Positive
-            # 2: Negative
-            
-            neutral_prob = probs[0]
-            positive_prob = probs[1]
-            negative_prob = probs[2]
-            
-            # Calculate composite score
-            # Base it purely on Positive vs Negative
-            # If Neutral is high, score acts closer to 0 which is correct.
-            chunk_score = positive_prob - negative_prob
-            
-            scores.append(chunk_score)
+            # Neutral probability pulls the score towards 0
+            batch_scores = probabilities[:, positive_idx] - probabilities[:, negative_idx]
+            scores.extend(batch_scores.tolist())
     
-    # Average all chunk scores
-    avg_score = sum(scores) / len(scores)
+    return scores
+
+
+def _token_windows(tokenizer, text: str, max_tokens: int, overlap: int = 0) -> list:
+    """
+    Tokenize text once and slice it into windows of at most max_tokens tokens.
     
-    # Scale is already -1 to 1 naturally
-    return round(avg_score, 3)
+    Returns:
+        list: (token_ids, (char_start, char_end)) per window
+    """
+    if not text or not text.strip():
+        return []
+    
+    encoding = tokenizer(
+        text,
+        add_special_tokens=False,
+        return_offsets_mapping=True,
+        verbose=False
+    )
+    ids = encoding["input_ids"]
+    offsets = encoding["offset_mapping"]
+    
+    if not ids:
+        return []
+    
+    step = max(1, max_tokens - max(0, overlap))
+    windows = []
+    
+    for start in range(0, len(ids), step):
+        end = min(start + max_tokens, len(ids))
+        windows.append((ids[start:end], (offsets[start][0], offsets[end - 1][1])))
+        if end == len(ids):
+            break
+    
+    return windows
 
 
-def chunk_text(text: str, max_length: int = 400) -> list:
+def chunk_text(text: str, max_length: int = 510, overlap: Optional[int] = None) -> list:
     """
     Split text into chunks that fit within BERT's token limit.
     
+    Chunks are cut on exact token boundaries using the tokenizer's offset
+    mapping and together cover the whole text.
+    
     Args:
         text: The text to chunk
-        max_length: Maximum characters per chunk (approximation)
+        max_length: Maximum tokens per chunk (excluding special tokens)
+        overlap: Tokens shared between consecutive chunks (default: SENTIMENT_CHUNK_OVERLAP)
         
     Returns:
         list: List of text chunks
     """
-    # Simple sentence-based chunking
-    sentences = text.replace('\n', '. ').split('. ')
-    sentences = [s.strip() for s in sentences if s.strip()]
-    
-    chunks = []
-    current_chunk = ""
-    
-    for sentence in sentences:
-        if len(current_chunk) + len(sentence) < max_length:
-            current_chunk += sentence + ". "
-        else:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-            current_chunk = sentence + ". "
-    
-    if current_chunk:
-        chunks.append(current_chunk.strip())
+    tokenizer, _, _ = get_model()
     
-    # If we still have no chunks, just split by character count
-    if not chunks and text:
-        chunks = [text[i:i+max_length] for i in range(0, len(text), max_length)]
+    if overlap is None:
+        overlap = settings.sentiment_chunk_overlap
     
-    # Limit to first 5 chunks to avoid slow processing
-    return chunks[:5]
+    return [text[start:end] for _, (start, end) in _token_windows(tokenizer, text, max_length, overlap)]
 
 
 def get_sentiment_label(score: float) -> str:
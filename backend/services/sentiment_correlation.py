@@ -0,0 +1,224 @@
+"""
+Cross-country sentiment correlation and clustering.
+
+Builds the country x month sentiment matrix from the precomputed sentiment
+series, computes pairwise correlation/similarity matrices and clusters with
+NumPy, and caches the result until a country's series changes. Staleness is
+checked against the series table itself (row count and latest update), so
+series rebuilt by scripts, the pipeline or another worker are picked up too.
+"""
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.models import SentimentSeries
+
+_cache_lock = threading.Lock()
+_cache_version = 0
+_cache = {"version": None, "result": None}
+
+
+def invalidate_correlation_cache():
+    """Mark the cached correlation result as stale (called when a sentiment series changes)."""
+    global _cache_version
+    with _cache_lock:
+        _cache_version += 1
+
+
+def _series_version(db: Session) -> tuple:
+    """Changes whenever any process adds, removes or rewrites sentiment series rows."""
+    count, updated_at = db.query(func.count(SentimentSeries.id), func.max(SentimentSeries.updated_at)).one()
+    return count, updated_at
+
+
+def build_sentiment_matrix(db: Session) -> tuple:
+    """
+    Build the country x month score matrix.
+
+    Returns:
+        (countries, months, matrix) where matrix[i, j] is the score of
+        countries[i] in months[j], NaN where missing
+    """
+    rows = db.query(SentimentSeries.country, SentimentSeries.date, SentimentSeries.score).all()
+    if not rows:
+        return [], [], np.empty((0, 0))
+
+    countries = sorted({row[0] for row in rows})
+    months = sorted({row[1] for row in rows})
+    country_idx = {c: i for i, c in enumerate(countries)}
+    month_idx = {m: j for j, m in enumerate(months)}
+
+    matrix = np.full((len(countries), len(months)), np.nan)
+    rows_i = np.fromiter((country_idx[r[0]] for r in rows), dtype=int, count=len(rows))
+    cols_j = np.fromiter((month_idx[r[1]] for r in rows), dtype=int, count=len(rows))
+    matrix[rows_i, cols_j] = np.fromiter((r[2] for r in rows), dtype=float, count=len(rows))
+
+    return countries, months, matrix
+
+
+def pairwise_statistics(matrix: np.ndarray, min_overlap: int) -> tuple:
+    """
+    Pairwise-complete Pearson correlation and cosine similarity between rows.
+
+    Each pair only uses the months where both countries have a score; pairs
+    with fewer than min_overlap shared months (or no variance) are NaN.
+
+    Returns:
+        (correlation, similarity, overlap) matrices
+    """
+    present = ~np.isnan(matrix)
+    values = np.where(present, matrix, 0.0)
+    mask = present.astype(float)
+
+    overlap = mask @ mask.T
+    sum_x = values @ mask.T          # sum of row i over months shared with row j
+    sum_y = sum_x.T
+    sum_xx = (values ** 2) @ mask.T
+    sum_yy = sum_xx.T
+    sum_xy = values @ values.T
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n = np.where(overlap > 0, overlap, np.nan)
+        cov = sum_xy - sum_x * sum_y / n
+        var_x = sum_xx - sum_x ** 2 / n
+        var_y = sum_yy - sum_y ** 2 / n
+        denom = np.sqrt(var_x * var_y)
+        correlation = np.where(denom > 1e-12, cov / denom, np.nan)
+
+        norm = np.sqrt(sum_xx * sum_yy)
+        similarity = np.where(norm > 1e-12, sum_xy / norm, np.nan)
+
+    too_short = overlap < min_overlap
+    correlation[too_short] = np.nan
+    similarity[too_short] = np.nan
+
+    return np.clip(correlation, -1.0, 1.0), np.clip(similarity, -1.0, 1.0), overlap.astype(int)
+
+
+def cluster_countries(correlation: np.ndarray, min_correlation: float) -> List[List[int]]:
+    """
+    Average-linkage agglomerative clustering on correlation distance (1 - r).
+
+    Clusters are merged while their average correlation is at least
+    min_correlation. Pairs without a correlation count as uncorrelated.
+
+    Returns:
+        List of clusters (row indices), largest first
+    """
+    n = correlation.shape[0]
+    if n == 0:
+        return []
+
+    distance = 1.0 - np.nan_to_num(correlation, nan=0.0)
+    np.fill_diagonal(distance, np.inf)
+    max_distance = 1.0 - min_correlation
+
+    clusters = [[i] for i in range(n)]
+    sizes = np.ones(n)
+    active = np.ones(n, dtype=bool)
+
+    while active.sum() > 1:
+        masked = np.where(active[:, None] & active[None, :], distance, np.inf)
+        a, b = np.unravel_index(np.argmin(masked), masked.shape)
+        if masked[a, b] > max_distance:
+            break
+
+        # Merge b into a; average linkage distance to every other cluster
+        merged = (sizes[a] * distance[a] + sizes[b] * distance[b]) / (sizes[a] + sizes[b])
+        distance[a, :] = merged
+        distance[:, a] = merged
+        distance[a, a] = np.inf
+        sizes[a] += sizes[b]
+        clusters[a].extend(clusters[b])
+        active[b] = False
+
+    result = [clusters[i] for i in range(n) if active[i]]
+    return sorted(result, key=len, reverse=True)
+
+
+def _compute(db: Session) -> dict:
+    countries, months, matrix = build_sentiment_matrix(db)
+    correlation, similarity, overlap = pairwise_statistics(matrix, settings.sentiment_correlation_min_months)
+    clusters = cluster_countries(correlation, settings.sentiment_cluster_min_correlation)
+
+    return {
+        "countries": countries,
+        "index": {c: i for i, c in enumerate(countries)},
+        "months": months,
+        "correlation": correlation,
+        "similarity": similarity,
+        "overlap": overlap,
+        "clusters": clusters,
+        "computed_at": datetime.utcnow()
+    }
+
+
+def get_correlation_result(db: Session) -> dict:
+    """Return the cached correlation result, recomputing it if stale."""
+    series_version = _series_version(db)
+    with _cache_lock:
+        version = (_cache_version, series_version)
+        if _cache["version"] == version and _cache["result"] is not None:
+            return _cache["result"]
+
+    result = _compute(db)
+
+    with _cache_lock:
+        # Don't overwrite a newer invalidation that happened while computing
+        if version[0] == _cache_version:
+            _cache["version"] = version
+            _cache["result"] = result
+
+    return result
+
+
+def get_most_correlated(db: Session, country: str, limit: int = 10) -> Optional[List[Dict]]:
+    """
+    Countries whose sentiment moves most closely with the given country.
+
+    Returns:
+        List of {"country", "correlation", "similarity", "overlap_months"}, or
+        None if the country has no sentiment series
+    """
+    result = get_correlation_result(db)
+    i = result["index"].get(country)
+    if i is None:
+        return None
+
+    correlation = result["correlation"][i]
+    candidates = [j for j in np.argsort(-np.nan_to_num(correlation, nan=-np.inf))
+                  if j != i and not np.isnan(correlation[j])]
+
+    return [
+        {
+            "country": result["countries"][j],
+            "correlation": round(float(correlation[j]), 3),
+            "similarity": round(float(result["similarity"][i, j]), 3),
+            "overlap_months": int(result["overlap"][i, j])
+        }
+        for j in candidates[:limit]
+    ]
+
+
+def get_clusters(db: Session, min_size: int = 2) -> List[Dict]:
+    """Clusters of countries whose sentiment moves together."""
+    result = get_correlation_result(db)
+    correlation = result["correlation"]
+
+    clusters = []
+    for members in result["clusters"]:
+        if len(members) < min_size:
+            continue
+        block = correlation[np.ix_(members, members)]
+        off_diagonal = block[~np.eye(len(members), dtype=bool)]
+        clusters.append({
+            "countries": sorted(result["countries"][i] for i in members),
+            "size": len(members),
+            "mean_correlation": round(float(np.nanmean(off_diagonal)), 3) if np.any(~np.isnan(off_diagonal)) else None
+        })
+
+    return clusters
@@ -0,0 +1,136 @@
+"""
+Precomputed sentiment time series and momentum per country.
+
+The series is derived from DailySummary sentiment scores and refreshed one
+country at a time whenever one of that country's scores changes, so trend
+queries never have to rebuild history from the summaries table.
+"""
+from datetime import datetime
+from statistics import mean, pstdev
+from typing import List, Optional
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.models import DailySummary, SentimentSeries, CountryMomentum
+from backend.services.sentiment_correlation import invalidate_correlation_cache
+
+
+def _monthly_scores(db: Session, country: str) -> List[tuple]:
+    """Return (month, score, article_count) for a country, one row per month."""
+    rows = db.query(
+        DailySummary.date,
+        DailySummary.sentiment_score,
+        DailySummary.article_count
+    ).filter(
+        DailySummary.country == country,
+        DailySummary.sentiment_score.isnot(None)
+    ).order_by(DailySummary.date).all()
+
+    # Older data may have several summaries per month; the latest one wins
+    by_month = {}
+    for summary_date, score, article_count in rows:
+        by_month[summary_date.replace(day=1)] = (score, article_count or 0)
+
+    return [(month, score, count) for month, (score, count) in sorted(by_month.items())]
+
+
+def refresh_country_series(db: Session, country: str) -> Optional[CountryMomentum]:
+    """
+    Recompute the sentiment series and momentum row for one country.
+
+    Call this after any of the country's summary scores change.
+
+    Returns:
+        The country's momentum row, or None if it has no scored summaries
+    """
+    window = max(1, settings.sentiment_rolling_window)
+    monthly = _monthly_scores(db, country)
+    now = datetime.utcnow()
+
+    db.query(SentimentSeries).filter(SentimentSeries.country == country).delete(synchronize_session=False)
+    momentum = db.query(CountryMomentum).filter(CountryMomentum.country == country).first()
+
+    if not monthly:
+        if momentum:
+            db.delete(momentum)
+        db.commit()
+        invalidate_correlation_cache()
+        return None
+
+    scores = [score for _, score, _ in monthly]
+    for i, (month, score, article_count) in enumerate(monthly):
+        recent = scores[max(0, i - window + 1):i + 1]
+        db.add(SentimentSeries(
+            country=country,
+            date=month,
+            score=score,
+            article_count=article_count,
+            rolling_mean=round(mean(recent), 4),
+            rolling_std=round(pstdev(recent), 4),
+            delta=round(score - scores[i - 1], 4) if i > 0 else None,
+            updated_at=now
+        ))
+
+    latest_month, latest_score, _ = monthly[-1]
+    previous = scores[-window - 1:-1]
+
+    if momentum is None:
+        momentum = CountryMomentum(country=country)
+        db.add(momentum)
+
+    momentum.latest_date = latest_month
+    momentum.score = latest_score
+    momentum.previous_score = scores[-2] if len(scores) > 1 else None
+    momentum.delta = round(latest_score - scores[-2], 4) if len(scores) > 1 else None
+    momentum.rolling_mean = round(mean(scores[-window:]), 4)
+    momentum.trend = round(latest_score - mean(previous), 4) if previous else None
+    momentum.months = len(scores)
+    momentum.updated_at = now
+
+    db.commit()
+    invalidate_correlation_cache()
+    return momentum
+
+
+def rebuild_all_series(db: Session) -> int:
+    """Rebuild the series for every country with summaries. Returns the number of countries."""
+    countries = [row[0] for row in db.query(DailySummary.country).distinct().all()]
+    for country in countries:
+        refresh_country_series(db, country)
+    return len(countries)
+
+
+def get_country_series(db: Session, country: str) -> List[SentimentSeries]:
+    """Get the monthly sentiment series for a country, oldest first."""
+    return db.query(SentimentSeries).filter(
+        SentimentSeries.country == country
+    ).order_by(SentimentSeries.date).all()
+
+
+def get_latest_series(db: Session) -> List[SentimentSeries]:
+    """Get each country's latest month of the sentiment series, by country."""
+    return db.query(SentimentSeries).join(
+        CountryMomentum,
+        (SentimentSeries.country == CountryMomentum.country) &
+        (SentimentSeries.date == CountryMomentum.latest_date)
+    ).order_by(SentimentSeries.country).all()
+
+
+def get_momentum_ranking(db: Session, direction: str = "rising", by: str = "delta", limit: int = 10) -> List[CountryMomentum]:
+    """
+    Rank countries by sentiment change.
+
+    Args:
+        direction: "rising" (largest increase first) or "falling" (largest decrease first)
+        by: "delta" (month-over-month change) or "trend" (latest vs. rolling mean of prior months)
+        limit: Maximum number of countries to return
+    """
+    if direction not in ("rising", "falling"):
+        raise ValueError("direction must be 'rising' or 'falling'")
+    if by not in ("delta", "trend"):
+        raise ValueError("by must be 'delta' or 'trend'")
+
+    column = getattr(CountryMomentum, by)
+    order = column.desc() if direction == "rising" else column.asc()
+
+    return db.query(CountryMomentum).filter(column.isnot(None)).order_by(order).limit(limit).all()
@@ -0,0 +1,149 @@
+"""
+Static site export (GitHub Pages): the frontend plus JSON snapshots of the API.
+
+Snapshots are fetched from a running API (STATIC_API_URL), so they match
+what the live frontend receives. Besides the full rebuild done by
+generate_static_site.py, single countries, (country, month) partitions and
+the world map can be re-exported, which the pipeline uses to rewrite only
+the files affected by new data.
+"""
+import os
+import json
+import shutil
+import urllib.parse
+from pathlib import Path
+from typing import List, Optional
+
+import requests
+
+from backend.config import settings
+
+FRONTEND_DIR = "frontend"
+
+
+def ensure_dir(path):
+    Path(path).mkdir(parents=True, exist_ok=True)
+
+
+def country_slug(country: str) -> str:
+    return country.replace(" ", "_")
+
+
+def fetch_json(url_path: str):
+    """GET a path of the API and return the decoded JSON, or None on failure."""
+    try:
+        response = requests.get(f"{settings.static_api_url}{url_path}")
+        if response.status_code == 200:
+            return response.json()
+        print(f"⚠ Failed to fetch {url_path}: {response.status_code}")
+    except Exception as e:
+        print(f"Error fetching {url_path}: {e}")
+    return None
+
+
+def save_json(data, output_path: str):
+    ensure_dir(os.path.dirname(output_path))
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def fetch_and_save(url_path: str, output_path: str) -> bool:
+    """Fetch JSON from API and save to file."""
+    data = fetch_json(url_path)
+    if data is None:
+        return False
+    save_json(data, output_path)
+    return True
+
+
+def export_assets(output_dir: Optional[str] = None):
+    """Copy the frontend into the output directory, with app.js switched to static mode."""
+    output_dir = output_dir or settings.static_output_dir
+    ensure_dir(output_dir)
+    shutil.copy(os.path.join(FRONTEND_DIR, "index.html"), os.path.join(output_dir, "index.html"))
+    shutil.copy(os.path.join(FRONTEND_DIR, "styles.css"), os.path.join(output_dir, "styles.css"))
+
+    with open(os.path.join(FRONTEND_DIR, "app.js"), 'r', encoding='utf-8') as src:
+        js_content = src.read()
+
+    # Replace default false with true for static mode
+    if "var STATIC_MODE = false;" in js_content:
+        js_content = js_content.replace("var STATIC_MODE = false;", "var STATIC_MODE = true;")
+    else:
+        # Fallback if not found (shouldn't happen with correct app.js)
+        print("⚠️ Warning: STATIC_MODE declaration not found in app.js, prepending...")
+        js_content = "var STATIC_MODE = true;\n" + js_content
+
+    with open(os.path.join(output_dir, "app.js"), 'w', encoding='utf-8') as dst:
+        dst.write(js_content)
+
+
+def export_country(country: str, output_dir: Optional[str] = None) -> dict:
+    """
+    Write api/countries/{country}.json: last run date, available dates and the latest overview.
+
+    Returns:
+        The country data (its 'dates' list the months that have detail files)
+    """
+    output_dir = output_dir or settings.static_output_dir
+    safe_country = urllib.parse.quote(country)
+
+    country_data = {}
+    for key, url_path in (
+        ('last_run', f"/api/last-run-date?country={safe_country}"),
+        ('dates', f"/api/dates?country={safe_country}"),
+        ('overview', f"/api/country-overview?country={safe_country}")
+    ):
+        data = fetch_json(url_path)
+        if data is not None:
+            country_data[key] = data
+
+    save_json(country_data, os.path.join(output_dir, "api", "countries", f"{country_slug(country)}.json"))
+    return country_data
+
+
+def export_month(country: str, date_str: str, output_dir: Optional[str] = None) -> bool:
+    """Write the summary and article files of one (country, date). Returns False if either fetch failed."""
+    output_dir = output_dir or settings.static_output_dir
+    safe_country = urllib.parse.quote(country)
+    slug = country_slug(country)
+
+    summary_ok = fetch_and_save(
+        f"/api/summary/{date_str}?country={safe_country}",
+        os.path.join(output_dir, "api", "summary", slug, f"{date_str}.json")
+    )
+    articles_ok = fetch_and_save(
+        f"/api/articles?date={date_str}&country={safe_country}",
+        os.path.join(output_dir, "api", "articles", slug, f"{date_str}.json")
+    )
+    return summary_ok and articles_ok
+
+
+def export_world(output_dir: Optional[str] = None) -> bool:
+    """Write api/world/sentiments.json (country sentiments for the map)."""
+    output_dir = output_dir or settings.static_output_dir
+    return fetch_and_save("/api/country-sentiments", os.path.join(output_dir, "api", "world", "sentiments.json"))
+
+
+def export_site(countries: List[str], output_dir: Optional[str] = None):
+    """Rebuild the whole static site from scratch."""
+    output_dir = output_dir or settings.static_output_dir
+
+    # 1. Clean and Create Output Dir
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    ensure_dir(output_dir)
+
+    # 2. Copy Frontend Assets
+    print("📦 Copying frontend assets...")
+    export_assets(output_dir)
+
+    # 3. Generate Data API Snapshots
+    print("💾 Generating API snapshots...")
+    for country in countries:
+        country_data = export_country(country, output_dir)
+        for d in country_data.get('dates', []):
+            export_month(country, d['date'], output_dir)
+
+    # 4. Generate Country Sentiments for Map
+    export_world(output_dir)
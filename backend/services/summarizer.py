@@ -1,11 +1,71 @@
 """
 Daily summarization service using the local LLM.
 """
-from datetime import date
+from datetime import date, datetime
+import asyncio
+import hashlib
+import json
+import threading
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from backend.models import Article, DailySummary
-from backend.services.llm_client import LLMClient
-from typing import Optional
+from backend.config import settings
+from backend.models import Article, DailySummary, CountryMomentum, EconomicIndicator
+from backend.services.llm_client import LLMClient, LLMText, PROMPT_VERSION
+from backend.services.sentiment_trends import refresh_country_series
+from backend.services.prompt_builder import build_articles_prompt, build_category_prompts, truncate_to_tokens
+from backend.services.llm_quota import estimate_tokens
+from backend.services.llm_ledger import call_context
+from typing import AsyncIterator, Dict, Optional
+
+
+class _Flight:
+    """An in-progress summary generation that other callers can wait on."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.summary_id = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def _join_flight(target_date: date, country: str) -> tuple:
+    """Return (flight, is_leader) for (date, country); the leader must call _finish_flight."""
+    key = (target_date, country)
+    with _flights_lock:
+        flight = _flights.get(key)
+        if flight is not None:
+            return flight, False
+        flight = _flights[key] = _Flight()
+        return flight, True
+
+
+def _finish_flight(target_date: date, country: str, flight: _Flight):
+    with _flights_lock:
+        if _flights.get((target_date, country)) is flight:
+            del _flights[(target_date, country)]
+    flight.done.set()
+
+
+# World Bank indicators included in comparative briefings (all in percent)
+COMPARATIVE_INDICATORS = {
+    "NY.GDP.MKTP.KD.ZG": "GDP growth",
+    "FP.CPI.TOTL.ZG": "Inflation",
+    "SL.UEM.TOTL.ZS": "Unemployment",
+    "BN.CAB.XOKA.GD.ZS": "Current account/GDP",
+    "GC.DOD.TOTL.GD.ZS": "Government debt/GDP",
+}
+
+
+def compute_fingerprint(article_ids: list, prompt_version: str, model_id: str) -> str:
+    """Hash of everything that determines a summary's input."""
+    payload = json.dumps({
+        "articles": sorted(article_ids),
+        "prompt_version": prompt_version,
+        "model": model_id
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
 class Summarizer:
@@ -14,7 +74,28 @@ class Summarizer:
     def __init__(self):
         self.llm_client = LLMClient()
     
-    def generate_daily_summary(self, db: Session, target_date: date, country: str = "Global") -> Optional[DailySummary]:
+    def generate_daily_summary(self, db: Session, target_date: date, country: str = "Global", force: bool = False) -> Optional[DailySummary]:
+        """
+        Generate (or reuse) the summary for a date and country.
+        
+        Concurrent calls for the same (date, country) share one generation:
+        the first caller generates, the others wait and load its result in
+        their own session.
+        """
+        flight, leader = _join_flight(target_date, country)
+        if not leader:
+            print(f"⏳ Summary for {target_date} in {country} is already being generated, waiting for it...")
+            flight.done.wait()
+            return self._load_flight_result(db, flight)
+        
+        try:
+            summary = self._generate_daily_summary(db, target_date, country, force)
+            flight.summary_id = summary.id if summary else None
+            return summary
+        finally:
+            _finish_flight(target_date, country, flight)
+    
+    def _generate_daily_summary(self, db: Session, target_date: date, country: str, force: bool) -> Optional[DailySummary]:
         """
         You are a senior economic analyst providing a comprehensive monthly economic analysis for {country}.
 
@@ -54,18 +135,219 @@ Format the report in markdown with clear headers and subheaders. Be concise and
             print(f"⚠ No articles found for {target_date}")
             return None
         
-        # Format articles data for the LLM
-        articles_text = self._format_articles(articles)
+        # Skip the LLM call when the inputs behind the existing summary are unchanged
+        fingerprint = self._fingerprint(articles)
+        existing = self._find_unchanged(db, target_date, country, fingerprint)
+        if existing and not force:
+            print(f"⏭️  Inputs unchanged for {target_date} in {country}, keeping existing summary")
+            return existing
+        
+        # A few articles added since the last summary: update it from only the new ones
+        base, new_articles = (None, None) if force else self._delta_base(db, target_date, country, articles)
+        if base is not None:
+            print(f"\n🔁 Updating summary for {target_date} in {country} with {len(new_articles)} new articles...")
+            with call_context(kind="delta", country=country, target_date=target_date):
+                summary_text = self.llm_client.generate_delta_summary(
+                    base.summary_text, self._format_articles(new_articles), str(target_date), country
+                )
+            if summary_text:
+                return self._save_summary(db, target_date, country, summary_text, len(articles), fingerprint, articles, delta=True)
+            print("⚠ Delta update failed, regenerating the full summary")
         
         print(f"\n📝 Generating summary for {target_date} in {country} ({len(articles)} articles)...")
         
-        # Generate summary using LLM
-        summary_text = self.llm_client.generate_summary(articles_text, str(target_date), country)
+        # Generate summary using LLM; large article sets are summarized per category first
+        category_data = self._map_reduce_inputs(articles)
+        with call_context(kind="summary", country=country, target_date=target_date):
+            if category_data:
+                print(f"🧩 Map-reduce: summarizing {len(category_data)} categories concurrently")
+                summary_text = self.llm_client.generate_map_reduce_summary(category_data, str(target_date), country, use_cache=not force)
+            else:
+                articles_text = self._format_articles(articles)
+                summary_text = self.llm_client.generate_summary(articles_text, str(target_date), country, use_cache=not force)
         
         if not summary_text:
             print("⚠ Failed to generate summary (LLM unavailable)")
             return None
         
+        return self._save_summary(db, target_date, country, summary_text, len(articles), fingerprint, articles)
+    
+    def is_up_to_date(self, db: Session, target_date: date, country: str = "Global") -> bool:
+        """Whether the existing summary was generated from the current articles, prompt and model."""
+        articles = db.query(Article.id).filter(
+            Article.published_date == target_date,
+            Article.country == country
+        ).all()
+        if not articles:
+            return False
+        return self._find_unchanged(db, target_date, country, self._fingerprint(articles)) is not None
+    
+    def _fingerprint(self, articles: list) -> str:
+        return compute_fingerprint([a.id for a in articles], PROMPT_VERSION, self.llm_client.model_id)
+    
+    def _find_unchanged(self, db: Session, target_date: date, country: str, fingerprint: str) -> Optional[DailySummary]:
+        return db.query(DailySummary).filter(
+            DailySummary.date == target_date,
+            DailySummary.country == country,
+            DailySummary.input_fingerprint == fingerprint
+        ).first()
+    
+    def _delta_base(self, db: Session, target_date: date, country: str, articles: list) -> tuple:
+        """
+        The existing summary and the articles added since it, when an
+        incremental update is enough. Returns (None, None) when the summary
+        must be regenerated in full: no summary or article list, a different
+        prompt version or model, removed articles, too many new articles, or
+        too many delta updates in a row.
+        """
+        threshold = settings.summary_delta_threshold
+        if not threshold:
+            return None, None
+        
+        existing = db.query(DailySummary).filter(
+            DailySummary.date == target_date,
+            DailySummary.country == country
+        ).first()
+        if existing is None or not existing.article_ids:
+            return None, None
+        if (existing.delta_updates or 0) >= settings.summary_delta_max_updates:
+            return None, None
+        
+        covered = set(json.loads(existing.article_ids))
+        if existing.input_fingerprint != compute_fingerprint(list(covered), PROMPT_VERSION, self.llm_client.model_id):
+            return None, None
+        if not covered <= {a.id for a in articles}:
+            return None, None
+        
+        new_articles = [a for a in articles if a.id not in covered]
+        if not new_articles or len(new_articles) > threshold * len(articles):
+            return None, None
+        return existing, new_articles
+    
+    async def astream_daily_summary(self, db: Session, target_date: date, country: str = "Global") -> AsyncIterator[dict]:
+        """
+        Generate a summary while streaming progress and text chunks.
+        
+        Yields status dicts in the same shape as the scrape stream:
+        {"status": "info"|"token"|"reset"|"error"|"complete", ...}. "reset" discards
+        the tokens streamed so far (a failed delta update being regenerated in full).
+        The final text is persisted to DailySummary before the "complete" event.
+        """
+        articles = db.query(Article).filter(
+            Article.published_date == target_date,
+            Article.country == country
+        ).all()
+        
+        if not articles:
+            yield {"status": "error", "message": f"No articles found for {target_date} in {country}"}
+            return
+        
+        flight, leader = _join_flight(target_date, country)
+        if not leader:
+            yield {"status": "info", "message": "This summary is already being generated, waiting for it..."}
+            await asyncio.to_thread(flight.done.wait)
+            summary = self._load_flight_result(db, flight)
+            if summary is None:
+                yield {"status": "error", "message": "Summary generation failed"}
+                return
+            yield {"status": "token", "text": summary.summary_text}
+            yield {"status": "complete", "summary_id": summary.id, "article_count": summary.article_count}
+            return
+        
+        try:
+            async for update in self._astream_daily_summary(db, target_date, country, articles):
+                if update["status"] == "complete":
+                    flight.summary_id = update["summary_id"]
+                yield update
+        finally:
+            _finish_flight(target_date, country, flight)
+    
+    async def _astream_daily_summary(self, db: Session, target_date: date, country: str, articles: list) -> AsyncIterator[dict]:
+        fingerprint = self._fingerprint(articles)
+        existing = self._find_unchanged(db, target_date, country, fingerprint)
+        if existing:
+            yield {"status": "info", "message": "Articles unchanged since the last summary, reusing it"}
+            yield {"status": "token", "text": existing.summary_text}
+            yield {"status": "complete", "summary_id": existing.id, "article_count": existing.article_count}
+            return
+        
+        base, new_articles = self._delta_base(db, target_date, country, articles)
+        if base is not None:
+            yield {"status": "info", "message": f"Updating the summary for {target_date} in {country} with {len(new_articles)} new articles..."}
+            stream = self.llm_client.astream_delta_summary(
+                base.summary_text, self._format_articles(new_articles), str(target_date), country
+            )
+            chunks = []
+            try:
+                with call_context(kind="delta", country=country, target_date=target_date):
+                    async for chunk in stream:
+                        chunks.append(chunk)
+                        yield {"status": "token", "text": chunk}
+                error = None
+            except Exception as e:
+                error = e
+            
+            summary_text = "".join(chunks)
+            if error is None and summary_text.strip():
+                summary = self._save_summary(db, target_date, country, summary_text, len(articles), fingerprint, articles,
+                                             delta=True)
+                yield {"status": "complete", "summary_id": summary.id, "article_count": summary.article_count}
+                return
+            
+            # Like the sync path: regenerate the full summary, discarding any partial delta text
+            print(f"⚠ Delta update failed ({error or 'empty response'}), regenerating the full summary")
+            if chunks:
+                yield {"status": "reset"}
+            yield {"status": "info", "message": "Updating the summary failed, regenerating it from all articles..."}
+        
+        category_data = self._map_reduce_inputs(articles)
+        if category_data:
+            yield {"status": "info", "message": f"Generating summary for {target_date} in {country} ({len(articles)} articles)..."}
+            yield {"status": "info", "message": f"Summarizing {len(category_data)} categories before writing the report..."}
+            stream = self.llm_client.astream_map_reduce_summary(category_data, str(target_date), country)
+        else:
+            yield {"status": "info", "message": f"Generating summary for {target_date} in {country} ({len(articles)} articles)..."}
+            stream = self.llm_client.astream_summary(self._format_articles(articles), str(target_date), country)
+        
+        chunks = []
+        try:
+            with call_context(kind="summary", country=country, target_date=target_date):
+                async for chunk in stream:
+                    chunks.append(chunk)
+                    yield {"status": "token", "text": chunk}
+        except Exception as e:
+            yield {"status": "error", "message": f"Summary generation failed: {e}"}
+            return
+        
+        summary_text = "".join(chunks)
+        if not summary_text.strip():
+            yield {"status": "error", "message": "LLM returned an empty summary"}
+            return
+        
+        summary = self._save_summary(db, target_date, country, summary_text, len(articles), fingerprint, articles)
+        yield {"status": "complete", "summary_id": summary.id, "article_count": summary.article_count}
+    
+    def _load_flight_result(self, db: Session, flight: "_Flight") -> Optional[DailySummary]:
+        """Load the summary another caller generated, bypassing this session's cached state."""
+        if flight.summary_id is None:
+            return None
+        return db.get(DailySummary, flight.summary_id, populate_existing=True)
+    
+    def _save_summary(self, db: Session, target_date: date, country: str, summary_text: str,
+                      article_count: int, fingerprint: Optional[str] = None, articles: Optional[list] = None,
+                      delta: bool = False) -> DailySummary:
+        """
+        Create or update the DailySummary for (date, country).
+        
+        Args:
+            articles: Articles the summary covers (recorded for later delta updates)
+            delta: Whether this is an incremental update of the existing summary
+        """
+        # LLMText records the provider that answered (the hedge target may win)
+        provider = getattr(summary_text, "provider", self.llm_client.provider)
+        summary_text = str(summary_text)
+        article_ids = json.dumps(sorted(a.id for a in articles)) if articles is not None else None
+        
         # Check if summary already exists
         existing = db.query(DailySummary).filter(
             DailySummary.date == target_date,
@@ -73,10 +355,20 @@ Format the report in markdown with clear headers and subheaders. Be concise and
         ).first()
         
         if existing:
-            # Update existing summary
+            # Update existing summary; the old score no longer matches the text
             existing.summary_text = summary_text
-            existing.article_count = len(articles)
+            existing.article_count = article_count
+            existing.input_fingerprint = fingerprint
+            existing.llm_model = self.llm_client.model_id
+            existing.llm_provider = provider
+            existing.article_ids = article_ids
+            existing.delta_updates = (existing.delta_updates or 0) + 1 if delta else 0
+            existing.generated_at = datetime.utcnow()
+            had_score = existing.sentiment_score is not None
+            existing.sentiment_score = None
             db.commit()
+            if had_score:
+                refresh_country_series(db, country)
             print(f"✓ Updated summary for {target_date}\n")
             return existing
         else:
@@ -85,10 +377,21 @@ Format the report in markdown with clear headers and subheaders. Be concise and
                 date=target_date,
                 country=country,
                 summary_text=summary_text,
-                article_count=len(articles)
+                article_count=article_count,
+                input_fingerprint=fingerprint,
+                llm_model=self.llm_client.model_id,
+                llm_provider=provider,
+                article_ids=article_ids,
+                delta_updates=0
             )
             db.add(summary)
-            db.commit()
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another process created it in the meantime; update that row instead
+                db.rollback()
+                return self._save_summary(db, target_date, country, LLMText(summary_text, provider), article_count, fingerprint,
+                                          articles, delta)
             print(f"✓ Created summary for {target_date}\n")
             return summary
     
@@ -116,10 +419,35 @@ Format the report in markdown with clear headers and subheaders. Be concise and
                 DailySummary.country == country
             ).first()
 
-    def generate_comparative_summary(self, db: Session, target_date: date, countries: list) -> Optional[str]:
+    def generate_comparative_summary(self, db: Session, target_date: date, countries: list,
+                                     mode: str = "summaries", country_codes: Optional[Dict[str, str]] = None) -> Optional[str]:
         """
         Generate a comparative economic analysis for a group of countries.
+        
+        Args:
+            mode: "summaries" builds the prompt from each country's existing summary plus
+                sentiment and indicator stats (missing summaries are generated first);
+                "articles" sends every raw article
+            country_codes: Optional country name -> ISO3 code, used to add indicator stats
         """
+        if mode == "articles":
+            return self._comparative_from_articles(db, target_date, countries)
+        
+        summaries = self._ensure_summaries(db, target_date, countries)
+        if not summaries:
+            print(f"⚠ No summaries available for comparative summary on {target_date}")
+            return None
+        
+        briefings = "\n\n".join(
+            self._country_briefing(db, country, summaries[country], (country_codes or {}).get(country))
+            for country in countries if country in summaries
+        )
+        
+        print(f"\n📊 Generating comparative summary for {', '.join(summaries)} from {len(summaries)} country summaries...")
+        with call_context(kind="comparative", target_date=target_date):
+            return self.llm_client.generate_comparative_summary(briefings, str(target_date), list(summaries), from_briefings=True)
+    
+    def _comparative_from_articles(self, db: Session, target_date: date, countries: list) -> Optional[str]:
         # Get articles for all selected countries
         all_articles = db.query(Article).filter(
             Article.published_date == target_date,
@@ -136,8 +464,66 @@ Format the report in markdown with clear headers and subheaders. Be concise and
         print(f"\n📊 Generating comparative summary for {', '.join(countries)} ({len(all_articles)} articles)...")
         
         # Generate using LLM
-        summary_text = self.llm_client.generate_comparative_summary(formatted_text, str(target_date), countries)
-        return summary_text
+        with call_context(kind="comparative", target_date=target_date):
+            return self.llm_client.generate_comparative_summary(formatted_text, str(target_date), countries)
+    
+    def _ensure_summaries(self, db: Session, target_date: date, countries: list) -> Dict[str, DailySummary]:
+        """Existing summary per country, generating the missing ones concurrently first."""
+        summaries = {}
+        missing = []
+        for country in countries:
+            summary = self.get_summary_by_date(db, target_date, country)
+            if summary:
+                summaries[country] = summary
+            elif db.query(Article.id).filter(Article.published_date == target_date, Article.country == country).first():
+                missing.append(country)
+        
+        if missing:
+            print(f"📝 Generating missing summaries first: {', '.join(missing)}")
+            # Imported here: summary_runner depends on this module
+            from backend.services.summary_runner import run_summary_jobs
+            run_summary_jobs([(country, target_date) for country in missing])
+            
+            for country in missing:
+                summary = self.get_summary_by_date(db, target_date, country)
+                if summary:
+                    summaries[country] = summary
+        
+        return summaries
+    
+    def _country_briefing(self, db: Session, country: str, summary: DailySummary, iso3: Optional[str]) -> str:
+        """Compact briefing: sentiment, indicators and the (truncated) summary text."""
+        lines = [f"# {country}"]
+        
+        momentum = db.query(CountryMomentum).filter(CountryMomentum.country == country).first()
+        score = summary.sentiment_score if summary.sentiment_score is not None else (momentum.score if momentum else None)
+        if score is not None:
+            sentiment = f"Sentiment: {score:+.2f}"
+            if momentum and momentum.delta is not None:
+                sentiment += f" (change vs previous month {momentum.delta:+.2f})"
+            lines.append(sentiment)
+        
+        indicators = self._indicator_stats(db, iso3) if iso3 else []
+        if indicators:
+            lines.append("Indicators: " + "; ".join(indicators))
+        
+        lines.append(f"Analysis ({summary.date}, {summary.article_count} articles):")
+        lines.append(truncate_to_tokens(summary.summary_text, settings.comparative_country_token_budget))
+        return "\n".join(lines)
+    
+    def _indicator_stats(self, db: Session, iso3: str) -> list:
+        """Latest value of each key indicator, e.g. "GDP growth 1.1% (2024)"."""
+        stats = []
+        for code, label in COMPARATIVE_INDICATORS.items():
+            row = db.query(EconomicIndicator).filter(
+                EconomicIndicator.country_iso3 == iso3,
+                EconomicIndicator.indicator_code == code,
+                EconomicIndicator.value.isnot(None),
+                EconomicIndicator.date <= str(date.today().year)
+            ).order_by(EconomicIndicator.date.desc()).first()
+            if row:
+                stats.append(f"{label} {row.value:.1f}% ({row.date})")
+        return stats
 
     def _format_comparative_articles(self, articles: list) -> str:
         """Format articles grouped by country for comparative analysis."""
@@ -157,26 +543,18 @@ Format the report in markdown with clear headers and subheaders. Be concise and
         
         return "\n".join(formatted)
     
-    def _format_articles(self, articles: list) -> str:
-        """Format articles into a structured text for the LLM."""
-        formatted = []
-        
-        # Group by category
-        categories = {}
-        for article in articles:
-            cat = article.category or "General"
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append(article)
-        
-        # Format each category
-        for category, cat_articles in categories.items():
-            formatted.append(f"\n## {category}\n")
-            for i, article in enumerate(cat_articles, 1):
-                formatted.append(f"{i}. **{article.title}**")
-                formatted.append(f"   Source: {article.source}")
-                if article.description:
-                    formatted.append(f"   {article.description}")
-                formatted.append(f"   URL: {article.url}\n")
+    def _map_reduce_inputs(self, articles: list) -> Optional[Dict[str, str]]:
+        """Per-category article texts when the set is large enough for map-reduce, else None."""
+        threshold = settings.summary_map_reduce_threshold
+        if not threshold or len(articles) < threshold:
+            return None
         
-        return "\n".join(formatted)
+        category_data, _ = build_category_prompts(articles)
+        return category_data if len(category_data) > 1 else None
+    
+    def _format_articles(self, articles: list) -> str:
+        """Format articles into a structured, token-budgeted text for the LLM."""
+        articles_text, included = build_articles_prompt(articles)
+        if included < len(articles):
+            print(f"✂️  Prompt budget: using {included} of {len(articles)} articles (~{estimate_tokens(articles_text)} tokens)")
+        return articles_text
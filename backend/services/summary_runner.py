@@ -0,0 +1,98 @@
+"""
+Concurrent bulk summary generation.
+
+Runs summary jobs on a thread pool, one database session per job. The
+actual LLM concurrency is capped per provider inside LLMClient, so the
+pool size only needs to be large enough to keep those slots busy.
+"""
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from typing import Callable, List, Optional, Tuple
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.models import DailySummary
+from backend.services.summarizer import Summarizer
+
+# Job outcomes
+GENERATED = "generated"
+EXISTS = "exists"          # summary already exists (not forced)
+UNCHANGED = "unchanged"    # forced, but articles/prompt/model are unchanged
+FAILED = "failed"
+
+
+def default_concurrency() -> int:
+    """Total in-flight limit of the configured provider."""
+    if settings.llm_provider == "gemini":
+        return max(1, settings.llm_max_in_flight_gemini)
+    # Scales with the number of local inference servers
+    return max(1, settings.llm_max_in_flight_local) * len(settings.llm_api_urls)
+
+
+def _run_job(summarizer: Summarizer, country: str, target_date: date, force: bool, ignore_fingerprint: bool) -> tuple:
+    """Generate one summary in its own session. Returns (outcome, summary_text_or_error)."""
+    db = SessionLocal()
+    try:
+        if not force and db.query(DailySummary).filter(
+            DailySummary.country == country,
+            DailySummary.date == target_date
+        ).first() is not None:
+            return EXISTS, None
+
+        # With force, still skip summaries whose articles, prompt and model are unchanged
+        if force and not ignore_fingerprint and summarizer.is_up_to_date(db, target_date, country):
+            return UNCHANGED, None
+
+        summary = summarizer.generate_daily_summary(db, target_date, country, force=ignore_fingerprint)
+        if summary:
+            return GENERATED, summary.summary_text
+        return FAILED, "No summary returned"
+    except Exception as e:
+        db.rollback()
+        return FAILED, str(e)
+    finally:
+        db.close()
+
+
+def run_summary_jobs(
+    jobs: List[Tuple[str, date]],
+    concurrency: Optional[int] = None,
+    force: bool = False,
+    ignore_fingerprint: bool = False,
+    on_result: Optional[Callable[[int, str, date, str, Optional[str]], None]] = None
+) -> List[tuple]:
+    """
+    Generate summaries for (country, date) jobs concurrently.
+
+    Args:
+        jobs: List of (country, date)
+        concurrency: Worker threads (defaults to the provider's in-flight limit)
+        force: Regenerate existing summaries (unless their inputs are unchanged)
+        ignore_fingerprint: With force, regenerate even when inputs are unchanged
+        on_result: Called as on_result(index, country, date, outcome, detail) from the
+            calling thread as each job finishes
+
+    Returns:
+        List of (country, date, outcome, detail) in the same order as jobs
+    """
+    concurrency = max(1, concurrency or default_concurrency())
+    summarizer = Summarizer()
+    results = [None] * len(jobs)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="summary") as executor:
+        futures = {
+            # Each job carries the caller's context (e.g. the LLM ledger entry point)
+            executor.submit(contextvars.copy_context().run, _run_job, summarizer, country, target_date, force, ignore_fingerprint): i
+            for i, (country, target_date) in enumerate(jobs)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            country, target_date = jobs[i]
+            outcome, detail = future.result()
+            results[i] = (country, target_date, outcome, detail)
+
+            if on_result:
+                on_result(i, country, target_date, outcome, detail)
+
+    return results
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+End-to-end summary throughput benchmark against the fake LLM server.
+
+Seeds a throwaway SQLite database with synthetic articles, starts one or
+more fake OpenAI-compatible servers (see fake_llm_server.py) and generates
+a summary per country through the real Summarizer / LLMClient path, then
+reports throughput and the latency percentiles recorded in the LLM call
+ledger. Use --url to benchmark an already running server instead.
+
+Example:
+    python benchmark_summaries.py --countries 40 --endpoints 2 --ttft 2 --tokens-per-second 30 --max-concurrency 4
+"""
+import sys
+import os
+import asyncio
+import random
+import tempfile
+import time
+from datetime import date
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fake_llm_server import FakeLLMServer, WORDS, add_config_arguments, config_from_args
+
+
+def _configure_environment(args, urls: list, db_path: str):
+    """Settings are read at import time, so this must run before importing backend."""
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["LLM_PROVIDER"] = "local"
+    os.environ["LLM_API_URLS"] = ",".join(urls)
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    os.environ["LLM_HEDGE_ENABLED"] = "false"
+    os.environ["LLM_REQUEST_TIMEOUT"] = str(args.timeout)
+    if args.in_flight:
+        os.environ["LLM_MAX_IN_FLIGHT_LOCAL"] = str(args.in_flight)
+
+
+def _seed_articles(countries: list, articles_per_country: int, target_date: date):
+    from backend.database import SessionLocal
+    from backend.config import settings
+    from backend.models import Article
+
+    topics = settings.search_topics
+    rng = random.Random(0)
+    db = SessionLocal()
+    try:
+        for country in countries:
+            for i in range(articles_per_country):
+                topic = topics[i % len(topics)]
+                db.add(Article(
+                    # Varied wording, so the prompt builder doesn't drop them as duplicates
+                    title=f"{country} {topic.lower()}: {' '.join(rng.sample(WORDS, 6))}",
+                    url=f"https://example.com/{country.replace(' ', '-').lower()}/{i}",
+                    source=f"Source {i % 7}",
+                    description=(f"Analysts in {country} discussed {topic.lower()} developments, "
+                                 f"citing data releases, policy signals and market reactions (item {i}). ") * 2,
+                    category=topic,
+                    country=country,
+                    published_date=target_date
+                ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _run_sync(jobs: list, concurrency: int) -> dict:
+    from backend.services.summary_runner import run_summary_jobs
+
+    outcomes = {}
+    for _, _, outcome, _ in run_summary_jobs(jobs, concurrency):
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    return outcomes
+
+
+def _run_stream(jobs: list, concurrency: int) -> dict:
+    """Generate through the streaming path, as /api/summarize/{date}/stream does."""
+    from backend.database import SessionLocal
+    from backend.services.summarizer import Summarizer
+
+    summarizer = Summarizer()
+    outcomes = {}
+
+    async def one(semaphore, country, target_date):
+        async with semaphore:
+            db = SessionLocal()
+            try:
+                status = "failed"
+                async for update in summarizer.astream_daily_summary(db, target_date, country):
+                    if update["status"] == "complete":
+                        status = "generated"
+                outcomes[status] = outcomes.get(status, 0) + 1
+            finally:
+                db.close()
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+        await asyncio.gather(*(one(semaphore, country, target_date) for country, target_date in jobs))
+
+    asyncio.run(main())
+    return outcomes
+
+
+def _fmt(stats: dict) -> str:
+    return " / ".join("-" if stats[p] is None else f"{stats[p] / 1000:.2f}s" for p in ("p50", "p95", "p99"))
+
+
+def run_benchmark(args):
+    servers = []
+    if args.url:
+        urls = [args.url]
+    else:
+        config = config_from_args(args)
+        servers = [FakeLLMServer(config, port=args.port + i).start() for i in range(args.endpoints)]
+        urls = [server.url for server in servers]
+
+    db_dir = tempfile.mkdtemp(prefix="signals-bench-")
+    _configure_environment(args, urls, os.path.join(db_dir, "bench.db"))
+
+    from backend.database import init_db, SessionLocal
+    from backend.services.summary_runner import default_concurrency
+    from backend.services.llm_ledger import call_context, flush, ledger_report
+    from backend.services.llm_endpoints import get_endpoint_pool
+
+    init_db()
+    target_date = date.today()
+    countries = [f"Country {i + 1:03d}" for i in range(args.countries)]
+    _seed_articles(countries, args.articles, target_date)
+    jobs = [(country, target_date) for country in countries]
+    concurrency = args.concurrency or default_concurrency()
+
+    print(f"\n{'='*80}")
+    print(f"🏎️  BENCHMARK: {len(jobs)} summaries, {args.articles} articles each, {args.mode} mode")
+    print(f"{'='*80}")
+    print(f"Endpoints: {', '.join(urls)}")
+    print(f"Concurrency: {concurrency}  |  Database: {db_dir}")
+
+    start = time.perf_counter()
+    with call_context(entry_point="script:benchmark_summaries"):
+        outcomes = _run_stream(jobs, concurrency) if args.mode == "stream" else _run_sync(jobs, concurrency)
+    elapsed = time.perf_counter() - start
+    flush()
+
+    db = SessionLocal()
+    try:
+        report = ledger_report(db, days=1, group_by="kind")
+    finally:
+        db.close()
+
+    generated = outcomes.get("generated", 0)
+    print(f"\n{'='*80}")
+    print("📊 RESULTS")
+    print(f"{'='*80}")
+    print(f"Outcomes: {', '.join(f'{k}={v}' for k, v in sorted(outcomes.items()))}")
+    print(f"Wall time: {elapsed:.1f}s  |  Throughput: {generated / elapsed * 60:.1f} summaries/min")
+    print(f"\n{'LLM CALLS':<14} {'CALLS':>6} {'ERR':>5} {'LATENCY p50/95/99':<26} {'QUEUE p50/95/99':<26} {'TTFT p50/95/99'}")
+    print("-" * 110)
+    for row in report:
+        print(f"{row['kind']:<14} {row['calls']:>6} {row['errors']:>5} {_fmt(row['latency_ms']):<26} "
+              f"{_fmt(row['queue_wait_ms']):<26} {_fmt(row['ttft_ms'])}")
+
+    print("\nEndpoints:")
+    for endpoint in get_endpoint_pool().status():
+        print(f"  {endpoint['url']}: {endpoint['requests']} requests, {endpoint['errors']} errors")
+    for server in servers:
+        print(f"  fake server {server.url}: {server.stats}")
+        server.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark end-to-end summary throughput against a fake LLM')
+    parser.add_argument('--countries', type=int, default=20, help='Summaries to generate (default: 20)')
+    parser.add_argument('--articles', type=int, default=40, help='Articles per country (default: 40)')
+    parser.add_argument('--mode', choices=['sync', 'stream'], default='sync',
+                        help='sync: bulk runner (as the scripts); stream: streaming endpoint path')
+    parser.add_argument('--concurrency', type=int, default=None, help='Summaries in parallel (default: provider in-flight limit)')
+    parser.add_argument('--in-flight', type=int, default=None, help='Override LLM_MAX_IN_FLIGHT_LOCAL')
+    parser.add_argument('--timeout', type=float, default=120, help='LLM request timeout in seconds (default: 120)')
+    parser.add_argument('--endpoints', type=int, default=1, help='Fake servers to start (default: 1)')
+    parser.add_argument('--port', type=int, default=18080, help='Port of the first fake server (default: 18080)')
+    parser.add_argument('--url', type=str, default=None, help='Benchmark an existing server instead of starting fakes')
+    add_config_arguments(parser)
+
+    run_benchmark(parser.parse_args())
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Fake OpenAI-compatible LLM server for load and latency testing.
+
+Speaks the chat-completions protocol (streaming and non-streaming) and
+GET /v1/models, so LLMClient can be pointed at it with LLM_API_URL(S).
+Response times follow a configurable distribution: a time to first token
+plus a per-token decode rate, with an optional cap on concurrent
+generations to emulate a single GPU. Errors, 429s, hangs and mid-stream
+disconnects can be injected at given rates.
+
+Example:
+    python fake_llm_server.py --port 1234 --ttft 1.5 --ttft-dist lognormal --tokens-per-second 40 --error-rate 0.05
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from typing import Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORDS = (
+    "growth inflation outlook policy rates demand exports investment labour market fiscal deficit "
+    "currency central bank tightening easing consumer spending manufacturing services recovery "
+    "risk momentum trade balance productivity wages housing credit energy prices supply"
+).split()
+
+DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+class FakeLLMConfig:
+    """Latency, throughput and failure settings of the fake server."""
+
+    def __init__(self, ttft: float = 0.5, ttft_dist: str = "lognormal", ttft_spread: float = 0.5,
+                 tokens_per_second: float = 50.0, completion_tokens: int = 600, completion_jitter: float = 0.2,
+                 prefill_tokens_per_second: float = 0.0, max_concurrency: int = 0,
+                 error_rate: float = 0.0, error_status: int = 500, rate_limit_rate: float = 0.0,
+                 retry_after: float = 1.0, hang_rate: float = 0.0, disconnect_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        if ttft_dist not in DISTRIBUTIONS:
+            raise ValueError(f"ttft_dist must be one of: {', '.join(DISTRIBUTIONS)}")
+        self.ttft = ttft
+        self.ttft_dist = ttft_dist
+        self.ttft_spread = ttft_spread
+        self.tokens_per_second = tokens_per_second  # 0 = instant decode
+        self.completion_tokens = completion_tokens
+        self.completion_jitter = completion_jitter
+        self.prefill_tokens_per_second = prefill_tokens_per_second  # 0 = prompt length doesn't matter
+        self.max_concurrency = max_concurrency  # 0 = unlimited
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.hang_rate = hang_rate
+        self.disconnect_rate = disconnect_rate
+        self.random = random.Random(seed)
+
+    def sample_ttft(self, prompt_tokens: int) -> float:
+        """Seconds before the first token: sampled queueing/prefill noise plus prompt prefill."""
+        mean, spread = self.ttft, self.ttft_spread
+        if self.ttft_dist == "fixed" or mean <= 0:
+            delay = mean
+        elif self.ttft_dist == "uniform":
+            delay = self.random.uniform(mean * (1 - spread), mean * (1 + spread))
+        elif self.ttft_dist == "exponential":
+            delay = self.random.expovariate(1 / mean)
+        else:
+            # Median at `mean`, right-skewed tail controlled by spread (sigma)
+            delay = self.random.lognormvariate(0, spread) * mean
+        if self.prefill_tokens_per_second:
+            delay += prompt_tokens / self.prefill_tokens_per_second
+        return max(0.0, delay)
+
+    def sample_completion_tokens(self) -> int:
+        jitter = self.completion_tokens * self.completion_jitter
+        return max(1, int(self.random.uniform(self.completion_tokens - jitter, self.completion_tokens + jitter)))
+
+    def token_delay(self) -> float:
+        return 1 / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    def roll(self, rate: float) -> bool:
+        return rate > 0 and self.random.random() < rate
+
+
+class FakeLLMStats:
+    """Request counters, exposed at GET /stats."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.completed = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.hung = 0
+        self.disconnected = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completion_tokens = 0
+
+    def add(self, name: str, value: int = 1):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + value)
+            if name == "in_flight":
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def as_dict(self) -> dict:
+        with self.lock:
+            return {key: value for key, value in vars(self).items() if key != "lock"}
+
+
+def _fake_text(rng: random.Random, tokens: int) -> list:
+    """Markdown-ish pieces, one per token."""
+    pieces = ["## Economic", " Overview", "\n\n"]
+    while len(pieces) < tokens:
+        word = rng.choice(WORDS)
+        pieces.append(f" {word}")
+        if rng.random() < 0.08:
+            pieces.append(".\n\n" if rng.random() < 0.3 else ".")
+    return pieces[:tokens]
+
+
+def create_app(config: FakeLLMConfig) -> FastAPI:
+    """FastAPI app serving the fake chat-completions API with the given config."""
+    app = FastAPI(title="Fake LLM")
+    stats = FakeLLMStats()
+    app.state.stats = stats
+    slots = asyncio.Semaphore(config.max_concurrency) if config.max_concurrency else None
+
+    async def acquire_slot():
+        if slots is not None:
+            await slots.acquire()
+        stats.add("in_flight")
+
+    def release_slot():
+        stats.add("in_flight", -1)
+        if slots is not None:
+            slots.release()
+
+    def injected_error() -> Optional[JSONResponse]:
+        if config.roll(config.rate_limit_rate):
+            stats.add("rate_limited")
+            return JSONResponse(
+                {"error": {"message": "Rate limit exceeded", "type": "rate_limit_error"}},
+                status_code=429, headers={"Retry-After": str(config.retry_after)}
+            )
+        if config.roll(config.error_rate):
+            stats.add("errors")
+            return JSONResponse({"error": {"message": "Injected failure", "type": "server_error"}},
+                                status_code=config.error_status)
+        return None
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "fake-model", "object": "model", "owned_by": "fake"}]}
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats.as_dict()
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats.add("requests")
+
+        error = injected_error()
+        if error is not None:
+            return error
+
+        if config.roll(config.hang_rate):
+            # Never answer: exercises client timeouts
+            stats.add("hung")
+            await asyncio.sleep(3600)
+
+        prompt = "".join(str(message.get("content", "")) for message in body.get("messages", []))
+        prompt_tokens = max(1, len(prompt) // 4)
+        max_tokens = body.get("max_tokens") or -1
+        completion_tokens = config.sample_completion_tokens()
+        if max_tokens > 0:
+            completion_tokens = min(completion_tokens, max_tokens)
+        pieces = _fake_text(config.random, completion_tokens)
+        model = body.get("model", "fake-model")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+
+        if not body.get("stream"):
+            await acquire_slot()
+            try:
+                await asyncio.sleep(config.sample_ttft(prompt_tokens) + config.token_delay() * completion_tokens)
+            finally:
+                release_slot()
+            stats.add("completed")
+            stats.add("completion_tokens", completion_tokens)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(pieces)},
+                             "finish_reason": "stop"}],
+                "usage": usage
+            }
+
+        disconnect_at = config.random.randint(1, len(pieces)) if config.roll(config.disconnect_rate) else None
+
+        async def events():
+            await acquire_slot()
+            try:
+                await asyncio.sleep(config.sample_ttft(prompt_tokens))
+                for i, piece in enumerate(pieces):
+                    if disconnect_at is not None and i == disconnect_at:
+                        stats.add("disconnected")
+                        raise ConnectionResetError("Injected disconnect")
+                    chunk = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                    if config.tokens_per_second:
+                        await asyncio.sleep(config.token_delay())
+                final = {"id": completion_id, "object": "chat.completion.chunk", "model": model,
+                         "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage}
+                yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+                stats.add("completed")
+                stats.add("completion_tokens", completion_tokens)
+            finally:
+                release_slot()
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+class FakeLLMServer:
+    """Runs the fake server on a background thread (for benchmarks)."""
+
+    def __init__(self, config: FakeLLMConfig, host: str = "127.0.0.1", port: int = 18080):
+        self.app = create_app(config)
+        self.url = f"http://{host}:{port}/v1/chat/completions"
+        # Injected disconnects are logged by uvicorn as errors; keep benchmark output readable
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host=host, port=port, log_level="critical"))
+        self._thread = None
+
+    @property
+    def stats(self) -> dict:
+        return self.app.state.stats.as_dict()
+
+    def start(self, timeout: float = 10.0) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self._server.run, name="fake-llm", daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError(f"Fake LLM server failed to start at {self.url}")
+            time.sleep(0.05)
+        return self
+
+    def stop(self):
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+
+
+def add_config_arguments(parser):
+    """Fake server options, shared with the benchmark script."""
+    group = parser.add_argument_group('fake LLM')
+    group.add_argument('--ttft', type=float, default=0.5, help='Median/mean seconds to first token (default: 0.5)')
+    group.add_argument('--ttft-dist', choices=DISTRIBUTIONS, default='lognormal',
+                       help='Time-to-first-token distribution (default: lognormal)')
+    group.add_argument('--ttft-spread', type=float, default=0.5,
+                       help='Lognormal sigma, or uniform +/- fraction of --ttft (default: 0.5)')
+    group.add_argument('--tokens-per-second', type=float, default=50.0, help='Decode rate per request, 0 = instant (default: 50)')
+    group.add_argument('--completion-tokens', type=int, default=600, help='Tokens per response (default: 600)')
+    group.add_argument('--prefill-tokens-per-second', type=float, default=0.0,
+                       help='Add prompt_tokens / rate to the first-token time (default: 0 = off)')
+    group.add_argument('--max-concurrency', type=int, default=0,
+                       help='Generations processed at once, others queue (default: 0 = unlimited)')
+    group.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with --error-status')
+    group.add_argument('--error-status', type=int, default=500, help='Status code of injected errors (default: 500)')
+    group.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    group.add_argument('--retry-after', type=float, default=1.0,
+                       help='Retry-After seconds sent with injected 429s (default: 1)')
+    group.add_argument('--hang-rate', type=float, default=0.0, help='Fraction of requests that never answer')
+    group.add_argument('--disconnect-rate', type=float, default=0.0, help='Fraction of streams cut off mid-response')
+    group.add_argument('--seed', type=int, default=None, help='Random seed for reproducible runs')
+
+
+def config_from_args(args) -> FakeLLMConfig:
+    return FakeLLMConfig(
+        ttft=args.ttft,
+        ttft_dist=args.ttft_dist,
+        ttft_spread=args.ttft_spread,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        prefill_tokens_per_second=args.prefill_tokens_per_second,
+        max_concurrency=args.max_concurrency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        hang_rate=args.hang_rate,
+        disconnect_rate=args.disconnect_rate,
+        seed=args.seed
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Fake OpenAI-compatible LLM server for load and latency testing')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=1234, help='Port (default: 1234, same as LM Studio)')
+    add_config_arguments(parser)
+
+    args = parser.parse_args()
+
+    print(f"🧪 Fake LLM at http://{args.host}:{args.port}/v1/chat/completions "
+          f"(ttft {args.ttft}s {args.ttft_dist}, {args.tokens_per_second} tok/s, {args.completion_tokens} tokens)")
+    uvicorn.run(create_app(config_from_args(args)), host=args.host, port=args.port, log_level="warning")
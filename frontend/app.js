@@ -1411,6 +1411,17 @@ function getIso3(iso2) {
     return COUNTRY_ISO3[iso2] || null;
 }
 
+// Country name -> ISO3 map so comparative summaries can include indicator stats
+function comparisonCountryCodes(countryNames) {
+    const codes = {};
+    countryNames.forEach(name => {
+        const entry = COUNTRY_LIST.find(c => c.name.toLowerCase() === name.toLowerCase());
+        const iso3 = entry ? getIso3(entry.code) : null;
+        if (iso3) codes[name] = iso3;
+    });
+    return codes;
+}
+
 function formatValue(value, config) {
     if (value === null || value === undefined) return 'N/A';
 
@@ -2413,21 +2424,20 @@ async function generateSummary(e) {
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({
                     countries: allCountries,
-                    target_date: dateStr
+                    target_date: dateStr,
+                    country_codes: comparisonCountryCodes(allCountries)
                 })
             });
         } else {
-            // Single Country Summary
-            response = await fetchAPI(`${API_BASE}/api/summarize/${dateStr}?country=${encodeURIComponent(country)}`, {
-                method: 'POST'
-            });
+            // Single Country Summary - render tokens as they stream in
+            await streamCountrySummary(dateStr, country);
         }
 
-        if (!response.ok) {
+        if (response && !response.ok) {
             throw new Error('Failed to regenerate summary');
         }
 
-        const data = await response.json();
+        const data = response ? await response.json() : null;
 
         // If comparative, display directly. If single, load overview date.
         if (comparisonCountries.length > 0) {
@@ -2450,6 +2460,45 @@ async function generateSummary(e) {
     }
 }
 
+// Stream a summary over SSE, updating the summary card as text arrives
+function streamCountrySummary(dateStr, country) {
+    return new Promise((resolve, reject) => {
+        const eventSource = new EventSource(`${API_BASE}/api/summarize/${dateStr}/stream?country=${encodeURIComponent(country)}`);
+        let summaryText = '';
+        let renderPending = false;
+
+        eventSource.onmessage = function (event) {
+            const data = JSON.parse(event.data);
+
+            if (data.status === 'token') {
+                summaryText += data.text;
+                // Re-render at most once per frame
+                if (!renderPending) {
+                    renderPending = true;
+                    requestAnimationFrame(() => {
+                        renderPending = false;
+                        displayCountrySummary(summaryText, new Date().toISOString());
+                    });
+                }
+            } else if (data.status === 'reset') {
+                // The server is regenerating the summary from scratch
+                summaryText = '';
+            } else if (data.status === 'complete') {
+                eventSource.close();
+                resolve(data.summary);
+            } else if (data.status === 'error') {
+                eventSource.close();
+                reject(new Error(data.message));
+            }
+        };
+
+        eventSource.onerror = function () {
+            eventSource.close();
+            reject(new Error('Summary stream interrupted'));
+        };
+    });
+}
+
 // ===== Display Functions =====
 function displayArticles(articles) {
     const container = document.getElementById('articlesList');
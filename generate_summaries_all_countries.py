@@ -13,8 +13,9 @@ from sqlalchemy import func
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from backend.database import init_db, get_db
-from backend.services.summarizer import Summarizer
-from backend.models import Article, DailySummary
+from backend.services.summary_runner import run_summary_jobs, default_concurrency, GENERATED, EXISTS, UNCHANGED
+from backend.services.llm_ledger import call_context
+from backend.models import Article
 
 
 def get_countries_with_data(db, target_date: Optional[date] = None) -> List[tuple]:
@@ -65,21 +66,16 @@ def get_countries_with_data(db, target_date: Optional[date] = None) -> List[tupl
     return results
 
 
-def check_summary_exists(db, country: str, target_date: date) -> bool:
-    """Check if a summary already exists for a country and date."""
-    return db.query(DailySummary).filter(
-        DailySummary.country == country,
-        DailySummary.date == target_date
-    ).first() is not None
-
-
-def generate_all_summaries(target_date: Optional[date] = None, force: bool = False):
+def generate_all_summaries(target_date: Optional[date] = None, force: bool = False, ignore_fingerprint: bool = False,
+                           concurrency: Optional[int] = None):
     """
     Generate summaries for all countries that have data.
     
     Args:
         target_date: Date to generate summaries for (defaults to latest for each country)
-        force: If True, regenerate even if summary exists
+        force: If True, regenerate even if summary exists (unless its inputs are unchanged)
+        ignore_fingerprint: If True, regenerate with force even when inputs are unchanged
+        concurrency: Summaries generated in parallel (defaults to the provider's in-flight limit)
     """
     print("🤖 AI Summary Generation for All Countries")
     print("=" * 80)
@@ -87,10 +83,11 @@ def generate_all_summaries(target_date: Optional[date] = None, force: bool = Fal
     # Initialize services
     init_db()
     db = next(get_db())
-    summarizer = Summarizer()
+    concurrency = concurrency or default_concurrency()
     
     # Get countries with data
     countries_data = get_countries_with_data(db, target_date)
+    db.close()
     
     if not countries_data:
         print("❌ No countries with data found")
@@ -102,6 +99,7 @@ def generate_all_summaries(target_date: Optional[date] = None, force: bool = Fal
     else:
         print(f"📅 Processing latest date for each country")
     print(f"🔄 Force regenerate: {force}")
+    print(f"⚡ Concurrency: {concurrency}")
     print("=" * 80)
     
     results = {
@@ -110,31 +108,32 @@ def generate_all_summaries(target_date: Optional[date] = None, force: bool = Fal
         'failed': []
     }
     
-    for i, (country, article_count, pub_date) in enumerate(countries_data, 1):
-        print(f"\n[{i}/{len(countries_data)}] {country} ({pub_date})")
+    article_counts = {(country, pub_date): article_count for country, article_count, pub_date in countries_data}
+    
+    def report(i, country, pub_date, outcome, detail):
+        print(f"\n[{i + 1}/{len(countries_data)}] {country} ({pub_date})")
         print("-" * 80)
         
-        # Check if summary exists
-        if not force and check_summary_exists(db, country, pub_date):
+        if outcome == EXISTS:
             print(f"⏭️  Summary already exists, skipping")
+        elif outcome == UNCHANGED:
+            print(f"⏭️  Inputs unchanged since last summary, skipping")
+        elif outcome == GENERATED:
+            print(f"✅ Summary generated successfully")
+            print(f"   Preview: {detail[:100]}...")
+        else:
+            print(f"❌ Failed to generate summary: {detail}")
+    
+    jobs = [(country, pub_date) for country, _, pub_date in countries_data]
+    outcomes = run_summary_jobs(jobs, concurrency, force, ignore_fingerprint, on_result=report)
+    
+    for country, pub_date, outcome, detail in outcomes:
+        if outcome in (EXISTS, UNCHANGED):
             results['skipped'].append((country, pub_date))
-            continue
-        
-        try:
-            print(f"📝 Generating summary for {article_count} articles...")
-            summary = summarizer.generate_daily_summary(db, pub_date, country)
-            
-            if summary:
-                print(f"✅ Summary generated successfully")
-                print(f"   Preview: {summary.summary_text[:100]}...")
-                results['generated'].append((country, pub_date, article_count))
-            else:
-                print(f"❌ Failed to generate summary")
-                results['failed'].append((country, pub_date, "No summary returned"))
-                
-        except Exception as e:
-            print(f"❌ Error: {str(e)}")
-            results['failed'].append((country, pub_date, str(e)))
+        elif outcome == GENERATED:
+            results['generated'].append((country, pub_date, article_counts[(country, pub_date)]))
+        else:
+            results['failed'].append((country, pub_date, detail))
     
     # Print summary
     print("\n" + "=" * 80)
@@ -145,7 +144,7 @@ def generate_all_summaries(target_date: Optional[date] = None, force: bool = Fal
     for country, pub_date, count in results['generated']:
         print(f"   - {country} ({pub_date}): {count} articles")
     
-    print(f"\n⏭️  Skipped: {len(results['skipped'])} (already exist)")
+    print(f"\n⏭️  Skipped: {len(results['skipped'])} (already exist or unchanged)")
     for country, pub_date in results['skipped']:
         print(f"   - {country} ({pub_date})")
     
@@ -158,14 +157,17 @@ def generate_all_summaries(target_date: Optional[date] = None, force: bool = Fal
     print("=" * 80)
 
 
-def generate_summaries_for_countries(countries: List[str], target_date: Optional[date] = None, force: bool = False):
+def generate_summaries_for_countries(countries: List[str], target_date: Optional[date] = None, force: bool = False,
+                                    ignore_fingerprint: bool = False, concurrency: Optional[int] = None):
     """
     Generate summaries for specific countries.
     
     Args:
         countries: List of country names
         target_date: Date to generate summaries for (defaults to latest)
-        force: If True, regenerate even if summary exists
+        force: If True, regenerate even if summary exists (unless its inputs are unchanged)
+        ignore_fingerprint: If True, regenerate with force even when inputs are unchanged
+        concurrency: Summaries generated in parallel (defaults to the provider's in-flight limit)
     """
     print(f"🤖 Generating summaries for {len(countries)} countries")
     print("=" * 80)
@@ -173,12 +175,9 @@ def generate_summaries_for_countries(countries: List[str], target_date: Optional
     # Initialize services
     init_db()
     db = next(get_db())
-    summarizer = Summarizer()
+    jobs = []
     
     for country in countries:
-        print(f"\n📍 {country}")
-        print("-" * 80)
-        
         # Get the date to use
         if target_date:
             date_to_use = target_date
@@ -189,6 +188,7 @@ def generate_summaries_for_countries(countries: List[str], target_date: Optional
             ).order_by(Article.published_date.desc()).first()
             
             if not result:
+                print(f"\n📍 {country}")
                 print(f"❌ No data found for {country}")
                 continue
             
@@ -201,25 +201,28 @@ def generate_summaries_for_countries(countries: List[str], target_date: Optional
         ).count()
         
         if article_count == 0:
+            print(f"\n📍 {country}")
             print(f"❌ No articles found for {date_to_use}")
             continue
         
-        # Check if summary exists
-        if not force and check_summary_exists(db, country, date_to_use):
-            print(f"⏭️  Summary already exists for {date_to_use}, skipping (use --force to regenerate)")
-            continue
+        jobs.append((country, date_to_use))
+    
+    db.close()
+    
+    def report(i, country, date_to_use, outcome, detail):
+        print(f"\n📍 {country}")
+        print("-" * 80)
         
-        try:
-            print(f"📝 Generating summary for {article_count} articles ({date_to_use})...")
-            summary = summarizer.generate_daily_summary(db, date_to_use, country)
-            
-            if summary:
-                print(f"✅ Summary generated successfully")
-            else:
-                print(f"❌ Failed to generate summary")
-                
-        except Exception as e:
-            print(f"❌ Error: {str(e)}")
+        if outcome == EXISTS:
+            print(f"⏭️  Summary already exists for {date_to_use}, skipping (use --force to regenerate)")
+        elif outcome == UNCHANGED:
+            print(f"⏭️  Inputs unchanged since last summary for {date_to_use}, skipping (use --ignore-fingerprint to regenerate)")
+        elif outcome == GENERATED:
+            print(f"✅ Summary generated successfully ({date_to_use})")
+        else:
+            print(f"❌ Failed to generate summary: {detail}")
+    
+    run_summary_jobs(jobs, concurrency, force, ignore_fingerprint, on_result=report)
 
 
 if __name__ == "__main__":
@@ -229,6 +232,10 @@ if __name__ == "__main__":
     parser.add_argument('--countries', nargs='+', help='Specific countries to generate summaries for (default: all)')
     parser.add_argument('--date', type=str, help='Target date (YYYY-MM-DD, default: latest for each country)')
     parser.add_argument('--force', action='store_true', help='Regenerate summaries even if they exist')
+    parser.add_argument('--ignore-fingerprint', action='store_true',
+                        help='With --force, regenerate even when articles, prompt and model are unchanged')
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help='Summaries generated in parallel (default: LLM_MAX_IN_FLIGHT_LOCAL / LLM_MAX_IN_FLIGHT_GEMINI)')
     
     args = parser.parse_args()
     
@@ -242,7 +249,8 @@ if __name__ == "__main__":
             sys.exit(1)
     
     # Run summary generation
-    if args.countries:
-        generate_summaries_for_countries(args.countries, target_date, args.force)
-    else:
-        generate_all_summaries(target_date, args.force)
+    with call_context(entry_point="script:generate_summaries_all_countries"):
+        if args.countries:
+            generate_summaries_for_countries(args.countries, target_date, args.force, args.ignore_fingerprint, args.concurrency)
+        else:
+            generate_all_summaries(target_date, args.force, args.ignore_fingerprint, args.concurrency)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+LLM call ledger report.
+Prints calls, tokens, cost and latency percentiles (p50/p95/p99) from the
+llm_calls table, grouped by country, day, provider, entry point or kind.
+"""
+import sys
+import os
+import json
+import contextlib
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.database import init_db, SessionLocal
+from backend.services.llm_ledger import ledger_report, ledger_totals, REPORT_GROUPS
+
+
+def _ms(value) -> str:
+    if value is None:
+        return "-"
+    return f"{value / 1000:.1f}s" if value >= 1000 else f"{value:.0f}ms"
+
+
+def _percentiles(stats: dict) -> str:
+    return "/".join(_ms(stats[p]) for p in ("p50", "p95", "p99"))
+
+
+def print_report(days: int, group_by: str):
+    db = SessionLocal()
+    try:
+        totals = ledger_totals(db, days)
+        groups = ledger_report(db, days, group_by)
+    finally:
+        db.close()
+
+    print(f"\n{'='*100}")
+    print(f"📒 LLM CALLS - LAST {days} DAYS (by {group_by})")
+    print(f"{'='*100}")
+    print(f"Calls: {totals['calls']}  |  Tokens: {totals['prompt_tokens']:,} in / {totals['completion_tokens']:,} out"
+          f"  |  Cost: ${totals['cost_usd']:.4f}")
+
+    if not groups:
+        print("\nNo LLM calls recorded.")
+        return
+
+    print(f"\n{group_by.upper():<28} {'CALLS':>6} {'OK':>5} {'ERR':>4} {'CACHE':>6} {'TOKENS IN/OUT':>17} {'COST':>9}"
+          f"  {'LATENCY p50/95/99':<22} {'QUEUE p50/95/99':<22} {'TTFT p50/95/99'}")
+    print("-" * 150)
+    for row in groups:
+        tokens = f"{row['prompt_tokens']:,}/{row['completion_tokens']:,}"
+        print(f"{str(row[group_by])[:28]:<28} {row['calls']:>6} {row['ok']:>5} {row['errors']:>4} {row['cache_hits']:>6}"
+              f" {tokens:>17} {'$' + format(row['cost_usd'], '.4f'):>9}"
+              f"  {_percentiles(row['latency_ms']):<22} {_percentiles(row['queue_wait_ms']):<22} {_percentiles(row['ttft_ms'])}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Report LLM calls, tokens, cost and latency from the call ledger')
+    parser.add_argument('--days', type=int, default=7, help='Days to include (default: 7)')
+    parser.add_argument('--by', choices=REPORT_GROUPS, default='country', help='Grouping (default: country)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    args = parser.parse_args()
+
+    if args.json:
+        # Keep stdout valid JSON
+        with contextlib.redirect_stdout(sys.stderr):
+            init_db()
+        db = SessionLocal()
+        try:
+            print(json.dumps({
+                "totals": ledger_totals(db, args.days),
+                "group_by": args.by,
+                "groups": ledger_report(db, args.days, args.by)
+            }, indent=2))
+        finally:
+            db.close()
+    else:
+        init_db()
+        print_report(args.days, args.by)
@@ -1,6 +1,9 @@
 """
 Script to recalculate sentiment scores for all existing summaries in the database
 using the updated FinBERT model.
+
+With --articles, scores stored articles instead (batched), e.g. to backfill
+articles scraped before per-article scoring existed.
 """
 import sys
 import os
@@ -11,8 +14,9 @@ from tqdm import tqdm
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from backend.database import SessionLocal
-from backend.models import DailySummary
-from backend.services.sentiment_analyzer import analyze_sentiment
+from backend.models import Article, DailySummary
+from backend.services.sentiment_analyzer import analyze_sentiment, analyze_sentiment_batch, article_sentiment_text
+from backend.services.sentiment_trends import refresh_country_series
 
 def recalculate_sentiments():
     db: Session = SessionLocal()
@@ -24,6 +28,7 @@ def recalculate_sentiments():
         print(f"Found {total} summaries to process.")
         
         updated_count = 0
+        changed_countries = set()
         
         print("\nRecalculating sentiments using FinBERT...")
         # Use simple iteration with progress indication
@@ -41,6 +46,7 @@ def recalculate_sentiments():
                 if summary.sentiment_score is None or abs(summary.sentiment_score - new_score) > 0.001:
                     # print(f"  -> Score changed: {summary.sentiment_score} -> {new_score}")
                     summary.sentiment_score = new_score
+                    changed_countries.add(summary.country)
                     updated_count += 1
             except Exception as e:
                 print(f"Error processing {summary.country}: {e}")
@@ -53,12 +59,61 @@ def recalculate_sentiments():
 
         # Final commit
         db.commit()
+        
+        # Refresh the precomputed series only for countries whose scores changed
+        for country in changed_countries:
+            refresh_country_series(db, country)
+        
         print(f"\n\nCompleted! Updated {updated_count} summaries out of {total}.")
+        print(f"Refreshed sentiment series for {len(changed_countries)} countries.")
         
     except Exception as e:
         print(f"Error during recalculation: {e}")
     finally:
         db.close()
 
+def recalculate_article_sentiments(only_missing: bool = True, batch_size: int = 64):
+    db: Session = SessionLocal()
+    try:
+        query = db.query(Article)
+        if only_missing:
+            query = query.filter(Article.sentiment_score.is_(None))
+        articles = query.order_by(Article.id).all()
+        total = len(articles)
+        print(f"Found {total} articles to score.")
+        
+        for start in range(0, total, batch_size):
+            batch = articles[start:start + batch_size]
+            try:
+                scores = analyze_sentiment_batch([article_sentiment_text(a) for a in batch])
+                for article, score in zip(batch, scores):
+                    article.sentiment_score = score
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"\nError scoring articles {start}-{start + len(batch)}: {e}")
+            
+            sys.stdout.write(f"\rProgress: {min(start + batch_size, total)}/{total} articles processed")
+            sys.stdout.flush()
+        
+        print(f"\n\nCompleted! Scored {total} articles.")
+        
+    except Exception as e:
+        print(f"Error during article scoring: {e}")
+    finally:
+        db.close()
+
 if __name__ == "__main__":
-    recalculate_sentiments()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Recalculate sentiment scores')
+    parser.add_argument('--articles', action='store_true', help='Score articles instead of summaries')
+    parser.add_argument('--all', action='store_true', help='With --articles, rescore articles that already have a score')
+    parser.add_argument('--batch-size', type=int, default=64, help='Articles per scoring batch')
+    
+    args = parser.parse_args()
+    
+    if args.articles:
+        recalculate_article_sentiments(only_missing=not args.all, batch_size=args.batch_size)
+    else:
+        recalculate_sentiments()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Incremental pipeline: summaries, sentiment, aggregates and the static site.
+
+Replaces running generate_summaries_all_countries.py, recalculate_sentiments.py
+and generate_static_site.py by hand. Only (country, month) partitions with new
+or changed articles are rebuilt, and each stage only invalidates the
+downstream work whose inputs actually changed (see backend/services/pipeline.py).
+The export stages snapshot the running API (STATIC_API_URL).
+
+Examples:
+    python run_pipeline.py                      # build everything that is dirty
+    python run_pipeline.py --dry-run            # show what would be rebuilt
+    python run_pipeline.py --no-export          # everything except the static site
+    python run_pipeline.py --rebuild sentiment --countries India   # force a stage
+"""
+import sys
+import os
+from datetime import date
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.database import init_db, SessionLocal
+from backend.services.pipeline import run_pipeline, invalidate, pipeline_status, stage_names, get_stages
+from backend.services.llm_ledger import call_context
+
+
+def main(args):
+    init_db()
+    db = SessionLocal()
+    try:
+        if args.list:
+            for stage in get_stages():
+                print(f"{stage.name:<14} after {', '.join(stage.after):<32} {stage.description}")
+            return
+
+        months = None
+        if args.months:
+            try:
+                months = [date.fromisoformat(month + "-01" if len(month) == 7 else month) for month in args.months]
+            except ValueError:
+                print(f"❌ Invalid month in {args.months}. Use YYYY-MM or YYYY-MM-DD")
+                sys.exit(1)
+
+        for stage_name in args.rebuild or []:
+            marked = invalidate(db, stage_name, args.countries, months)
+            print(f"🔁 Marked {marked} {stage_name} partitions for rebuild")
+
+        stages = args.stages or stage_names()
+        if args.no_export:
+            stages = [name for name in stages if not name.startswith("export")]
+
+        print(f"\n{'='*80}")
+        print(f"🏭 PIPELINE{' (dry run)' if args.dry_run else ''}: {', '.join(stages)}")
+        print(f"{'='*80}")
+
+        with call_context(entry_point="script:run_pipeline"):
+            report = run_pipeline(db, stages, args.countries, months, dry_run=args.dry_run)
+
+        print(f"\n{'STAGE':<14} {'RESULT'}")
+        print("-" * 60)
+        for name, counts in report.items():
+            print(f"{name:<14} {', '.join(f'{key}={value}' for key, value in counts.items())}")
+
+        print(f"\n{'STAGE':<14} {'DIRTY':>7} {'CLEAN':>7} {'FAILED':>7}")
+        print("-" * 40)
+        for name, counts in pipeline_status(db).items():
+            print(f"{name:<14} {counts['dirty']:>7} {counts['clean']:>7} {counts['failed']:>7}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Rebuild summaries, sentiment, aggregates and static files for changed data')
+    parser.add_argument('--countries', nargs='+', help='Only these countries (default: all)')
+    parser.add_argument('--months', nargs='+', help='Only these months (YYYY-MM)')
+    parser.add_argument('--stages', nargs='+', choices=stage_names(), help='Only run these stages (default: all)')
+    parser.add_argument('--no-export', action='store_true', help='Skip the static site export stages')
+    parser.add_argument('--rebuild', nargs='+', choices=stage_names(),
+                        help='Mark these stages dirty for every selected partition first')
+    parser.add_argument('--dry-run', action='store_true', help='Only show how many partitions each stage would build')
+    parser.add_argument('--list', action='store_true', help='List the stages and their dependencies')
+
+    main(parser.parse_args())
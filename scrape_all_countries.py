@@ -6,7 +6,7 @@ This script scrapes news data for multiple countries and optionally generates su
 import sys
 import os
 from datetime import date
-from typing import List
+from typing import List, Optional
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -14,6 +14,9 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from backend.database import init_db, get_db
 from backend.services.news_scraper import NewsScraper
 from backend.services.summarizer import Summarizer
+from backend.services.llm_ledger import call_context
+from backend.services.job_queue import enqueue, get_job_queue, wait_for_jobs, job_to_dict, BACKFILL, SCHEDULED, SUCCEEDED
+import backend.services.job_handlers  # noqa: F401  (registers the job kinds)
 
 # List of all countries to scrape (195 countries)
 COUNTRIES = [ "Afghanistan",
@@ -329,6 +332,62 @@ def scrape_specific_countries(countries: List[str], target_date: date = None, ge
             print(f"❌ Error: {str(e)}")
 
 
+def queue_countries(countries: List[str], target_date: date = None, generate_summaries: bool = False,
+                    priority: str = BACKFILL, work: bool = False):
+    """
+    Submit a scrape job per country to the shared job queue instead of scraping in-process.
+    The API's workers run them at the given priority, so interactive requests go first.
+    
+    Args:
+        countries: List of country names to scrape
+        target_date: Date to scrape for (defaults to today)
+        generate_summaries: Whether each scrape job queues a summary job
+        priority: backfill or scheduled
+        work: Also run queue workers in this process and wait for the jobs (when the API isn't running)
+    """
+    if target_date is None:
+        target_date = date.today()
+    
+    init_db()
+    jobs = [
+        enqueue("scrape", {"country": country, "target_date": target_date.isoformat(), "summarize": generate_summaries},
+                priority=priority)
+        for country in countries
+    ]
+    print(f"📥 Queued {len(jobs)} scrape jobs for {target_date} at {priority} priority")
+    
+    if not work:
+        print("⏭️  The API's job workers will run them; follow progress at /api/jobs/stats")
+        return
+    
+    # The API recovers jobs orphaned by dead processes
+    get_job_queue().start(recover=False)
+    print("⏳ Waiting for scrape jobs...")
+    finished = wait_for_jobs([job.id for job in jobs])
+    
+    # Summary (or pipeline) jobs queued by the scrapes
+    follow_up_ids = set()
+    for job in finished:
+        result = job_to_dict(job)["result"] or {}
+        if job.status == SUCCEEDED:
+            follow_up_ids.update(result[key] for key in ("summary_job_id", "pipeline_job_id") if result.get(key))
+    if follow_up_ids:
+        print(f"⏳ Waiting for {len(follow_up_ids)} follow-up jobs...")
+        finished += wait_for_jobs(sorted(follow_up_ids))
+    get_job_queue().stop()
+    
+    print("\n" + "=" * 80)
+    print("📊 QUEUE SUMMARY")
+    print("=" * 80)
+    for kind in ("scrape", "summarize", "pipeline"):
+        statuses = {}
+        for job in finished:
+            if job.kind == kind:
+                statuses[job.status] = statuses.get(job.status, 0) + 1
+        if statuses:
+            print(f"{kind}: {', '.join(f'{status}={count}' for status, count in sorted(statuses.items()))}")
+
+
 def get_countries_missing_summaries(target_date: date = None) -> List[str]:
     """
     Find countries that don't have summaries for the given month.
@@ -363,12 +422,14 @@ def get_countries_missing_summaries(target_date: date = None) -> List[str]:
     return missing
 
 
-def scrape_countries_missing_summaries(target_date: date = None):
+def scrape_countries_missing_summaries(target_date: date = None, queue_priority: Optional[str] = None, work: bool = False):
     """
     Scrape and generate summaries only for countries missing summaries for the current month.
     
     Args:
         target_date: Date to target (defaults to today)
+        queue_priority: Submit to the job queue at this priority instead of scraping in-process
+        work: With queue_priority, run the jobs in this process
     """
     if target_date is None:
         target_date = date.today()
@@ -391,7 +452,10 @@ def scrape_countries_missing_summaries(target_date: date = None):
     print(f"\n🚀 Starting scraping for missing countries...")
     print("=" * 80)
     
-    scrape_specific_countries(missing_countries, target_date, generate_summaries=True)
+    if queue_priority:
+        queue_countries(missing_countries, target_date, True, queue_priority, work)
+    else:
+        scrape_specific_countries(missing_countries, target_date, generate_summaries=True)
 
 
 if __name__ == "__main__":
@@ -402,6 +466,12 @@ if __name__ == "__main__":
     parser.add_argument('--date', type=str, help='Target date (YYYY-MM-DD, default: today)')
     parser.add_argument('--generate-summaries', action='store_true', help='Generate summaries after scraping')
     parser.add_argument('--missing-only', action='store_true', help='Only scrape countries missing summaries for current month')
+    parser.add_argument('--queue', action='store_true',
+                        help='Submit scrape jobs to the shared job queue instead of scraping in-process (yields to API requests)')
+    parser.add_argument('--priority', choices=[BACKFILL, SCHEDULED], default=BACKFILL,
+                        help='Priority class of queued jobs (default: backfill)')
+    parser.add_argument('--work', action='store_true',
+                        help='With --queue, run the jobs in this process and wait for them (when the API is not running)')
     
     args = parser.parse_args()
     
@@ -415,9 +485,12 @@ if __name__ == "__main__":
             sys.exit(1)
     
     # Run scraping
-    if args.missing_only:
-        scrape_countries_missing_summaries(target_date)
-    elif args.countries:
-        scrape_specific_countries(args.countries, target_date, args.generate_summaries)
-    else:
-        scrape_all_countries(target_date, args.generate_summaries)
+    with call_context(entry_point="script:scrape_all_countries"):
+        if args.missing_only:
+            scrape_countries_missing_summaries(target_date, args.priority if args.queue else None, args.work)
+        elif args.queue:
+            queue_countries(args.countries or COUNTRIES, target_date, args.generate_summaries, args.priority, args.work)
+        elif args.countries:
+            scrape_specific_countries(args.countries, target_date, args.generate_summaries)
+        else:
+            scrape_all_countries(target_date, args.generate_summaries)